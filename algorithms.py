@@ -0,0 +1,1813 @@
+"""GUI independent algorithm engines used by the views in main.py"""
+import heapq
+import mmap
+import operator
+import os
+import random
+import re
+import secrets
+import struct
+import sys
+import tempfile
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from collections import Counter, OrderedDict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import partial
+from itertools import accumulate, count as itertools_count, islice
+from math import ceil, gcd, isfinite, lgamma, log, prod
+from multiprocessing import shared_memory
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class RSAEngine:
+    """Block based RSA engine, decrypts using the Chinese Remainder Theorem"""
+    def __init__(self, p, q, e=65537):
+        if p == q:
+            raise ValueError("p and q must be different primes")
+        self.p = p
+        self.q = q
+        self.n = p * q
+        self.r = (p - 1) * (q - 1)
+
+        """Falls back to the smallest odd exponent coprime with r for toy moduli"""
+        self.e = e if self.r > e else 3
+        while gcd(self.e, self.r) != 1:
+            self.e += 2
+        self.d = pow(self.e, -1, self.r)
+
+        """CRT values so decryption works on p and q instead of n"""
+        self.dp = self.d % (p - 1)
+        self.dq = self.d % (q - 1)
+        self.qinv = pow(q, -1, p)
+
+        """Plaintext blocks must be smaller than n, cipher blocks hold any value below n"""
+        self.block_size = (self.n.bit_length() - 1) // 8
+        self.cipher_block_size = (self.n.bit_length() + 7) // 8
+        if self.block_size < 1:
+            raise ValueError("Modulus is too small to hold a byte")
+
+    def encrypt_block(self, m):
+        return pow(m, self.e, self.n)
+
+    def decrypt_block(self, c):
+        """Decrypts one block using the CRT values"""
+        m1 = pow(c, self.dp, self.p)
+        m2 = pow(c, self.dq, self.q)
+        h = (self.qinv * (m1 - m2)) % self.p
+        return m2 + h * self.q
+
+    def encrypt_stream(self, chunks):
+        """Encrypts an iterable of byte chunks, yielding ciphertext bytes.
+        The message is padded with 0x80 followed by zeros so the last block can be recovered"""
+        k = self.block_size
+        width = self.cipher_block_size
+        buffer = b""
+        for chunk in chunks:
+            buffer += chunk
+            whole = len(buffer) - len(buffer) % k
+            if whole:
+                yield self._encrypt_blocks(buffer, whole, k, width)
+                buffer = buffer[whole:]
+
+        padded = buffer + b"\x80" + b"\x00" * (k - len(buffer) - 1)
+        yield self._encrypt_blocks(padded, k, k, width)
+
+    def _encrypt_blocks(self, data, end, k, width):
+        e, n = self.e, self.n
+        from_bytes = int.from_bytes
+        return b"".join(
+            pow(from_bytes(data[i:i + k], "big"), e, n).to_bytes(width, "big")
+            for i in range(0, end, k)
+        )
+
+    def decrypt_stream(self, chunks):
+        """Decrypts an iterable of ciphertext chunks, yielding plaintext bytes.
+        The final block is held back until the end so its padding can be removed"""
+        k = self.block_size
+        width = self.cipher_block_size
+        buffer = b""
+        for chunk in chunks:
+            buffer += chunk
+            """Always keep at least one block back in case it is the last one"""
+            whole = len(buffer) - len(buffer) % width
+            if whole == len(buffer):
+                whole -= width
+            if whole > 0:
+                yield self._decrypt_blocks(buffer, whole, k, width)
+                buffer = buffer[whole:]
+
+        if len(buffer) != width:
+            raise ValueError("Ciphertext is not a whole number of blocks")
+        last = self._decrypt_blocks(buffer, width, k, width).rstrip(b"\x00")
+        if not last.endswith(b"\x80"):
+            raise ValueError("Invalid padding, wrong key or corrupted ciphertext")
+        yield last[:-1]
+
+    def _decrypt_blocks(self, data, end, k, width):
+        p, q, dp, dq, qinv = self.p, self.q, self.dp, self.dq, self.qinv
+        from_bytes = int.from_bytes
+        out = []
+        for i in range(0, end, width):
+            c = from_bytes(data[i:i + width], "big")
+            m1 = pow(c, dp, p)
+            m2 = pow(c, dq, q)
+            out.append((m2 + ((qinv * (m1 - m2)) % p) * q).to_bytes(k, "big"))
+        return b"".join(out)
+
+    def encrypt_bytes(self, data):
+        return b"".join(self.encrypt_stream([data]))
+
+    def decrypt_bytes(self, data):
+        return b"".join(self.decrypt_stream([data]))
+
+
+def small_primes(limit):
+    """Sieve of Eratosthenes, returns all primes below limit"""
+    sieve = bytearray([1]) * limit
+    sieve[:2] = b"\x00\x00"
+    for i in range(2, int(limit ** 0.5) + 1):
+        if sieve[i]:
+            sieve[i * i::i] = bytes(len(range(i * i, limit, i)))
+    return [i for i, flag in enumerate(sieve) if flag]
+
+
+SMALL_PRIMES = small_primes(2000)
+
+"""Testing against these bases is deterministic for every n below 3.3 * 10^24"""
+DETERMINISTIC_WITNESSES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37)
+
+
+def is_probable_prime(n, rounds=40):
+    """Miller-Rabin test, exact below 2^64 and wrong with probability at most 4^-rounds above"""
+    if n < 2:
+        return False
+    for p in SMALL_PRIMES:
+        if n % p == 0:
+            return n == p
+    if n < SMALL_PRIMES[-1] ** 2:
+        return True
+
+    d = n - 1
+    s = 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+
+    if n < 1 << 64:
+        witnesses = DETERMINISTIC_WITNESSES
+    else:
+        witnesses = (secrets.randbelow(n - 3) + 2 for _ in range(rounds))
+
+    for a in witnesses:
+        x = pow(a, d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def search_prime_window(start, width, rounds):
+    """Sieves the odd numbers start, start + 2, ... with the small primes and
+    returns the first survivor that passes Miller-Rabin, or None"""
+    sieve = bytearray([1]) * width
+    for p in SMALL_PRIMES[1:]:
+        """Index i where start + 2i is divisible by p"""
+        i = (p - start % p) * ((p + 1) // 2) % p
+        if start + 2 * i == p:
+            i += p
+        sieve[i::p] = bytes(len(range(i, width, p)))
+
+    for i in range(width):
+        if sieve[i] and is_probable_prime(start + 2 * i, rounds):
+            return start + 2 * i
+    return None
+
+
+class PrimeGenerator:
+    """Generates random primes of a given bit length for RSA keys"""
+    window = 4096
+
+    def __init__(self, rounds=40, workers=1):
+        self.rounds = rounds
+        self.workers = workers
+
+    def random_start(self, bits):
+        """Random odd candidate with the top two bits set, so p * q has exactly 2 * bits bits"""
+        return secrets.randbits(bits) | (3 << (bits - 2)) | 1
+
+    def generate(self, bits):
+        if bits < 16:
+            raise ValueError("Use at least 16 bits per prime")
+        if self.workers > 1:
+            return self._generate_parallel(bits)
+
+        while True:
+            prime = search_prime_window(self.random_start(bits), self.window, self.rounds)
+            if prime and prime.bit_length() == bits:
+                return prime
+
+    def _generate_parallel(self, bits):
+        """Sieves a different random window in each process, taking the first prime found"""
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            while True:
+                jobs = [pool.submit(search_prime_window, self.random_start(bits), self.window, self.rounds)
+                        for _ in range(self.workers)]
+                for job in as_completed(jobs):
+                    prime = job.result()
+                    if prime and prime.bit_length() == bits:
+                        for other in jobs:
+                            other.cancel()
+                        return prime
+
+    def generate_pair(self, key_bits):
+        """Two different primes whose product is a key_bits modulus"""
+        p = self.generate(key_bits // 2)
+        q = self.generate(key_bits - key_bits // 2)
+        while q == p:
+            q = self.generate(key_bits - key_bits // 2)
+        return p, q
+
+
+def lift_digit_limit():
+    """Large Fibonacci and factorial results have more digits than Python prints by default.
+    The limit only exists from Python 3.11. The app also runs this in every worker process,
+    which does not inherit the setting under spawn or forkserver"""
+    if hasattr(sys, "set_int_max_str_digits"):
+        sys.set_int_max_str_digits(0)
+
+
+def fibonacci(n, mod=None):
+    """F(n) by fast doubling, O(log n) multiplications.
+    Uses F(2k) = F(k)(2F(k+1) - F(k)) and F(2k+1) = F(k)^2 + F(k+1)^2"""
+    if n < 0:
+        raise ValueError("n must be non-negative")
+    if mod is not None and mod < 1:
+        raise ValueError("mod must be positive")
+
+    a, b = 0, 1
+    for bit in bin(n)[2:]:
+        c = a * (2 * b - a)
+        d = a * a + b * b
+        if mod is not None:
+            c %= mod
+            d %= mod
+        if bit == "1":
+            a, b = d, c + d
+        else:
+            a, b = c, d
+    return a if mod is None else a % mod
+
+
+def fibonacci_sequence(count=None, mod=None):
+    """Lazily yields F(0), F(1), ... (count terms, or forever when count is None)"""
+    a, b = 0, 1
+    produced = 0
+    while count is None or produced < count:
+        yield a if mod is None else a % mod
+        a, b = b, a + b
+        if mod is not None:
+            b %= mod
+        produced += 1
+
+
+def bubble_sort(values, reverse=False):
+    """Teaching bubble sort, always makes n passes"""
+    values = list(values)
+    before = operator.gt if reverse else operator.lt
+    n = len(values)
+    for _ in range(n):
+        for i in range(n - 1):
+            if before(values[i + 1], values[i]):
+                values[i], values[i + 1] = values[i + 1], values[i]
+    return values
+
+
+def early_exit_bubble_sort(values, reverse=False):
+    """Bubble sort that stops once a pass makes no swaps and skips the sorted tail"""
+    values = list(values)
+    before = operator.gt if reverse else operator.lt
+    end = len(values) - 1
+    while end > 0:
+        last_swap = 0
+        for i in range(end):
+            if before(values[i + 1], values[i]):
+                values[i], values[i + 1] = values[i + 1], values[i]
+                last_swap = i
+        end = last_swap
+    return values
+
+
+def selection_sort(values, reverse=False):
+    """Teaching selection sort"""
+    values = list(values)
+    before = operator.gt if reverse else operator.lt
+    n = len(values)
+    for i in range(n):
+        extreme_index = i
+        for j in range(i + 1, n):
+            if before(values[j], values[extreme_index]):
+                extreme_index = j
+        if extreme_index != i:
+            values[i], values[extreme_index] = values[extreme_index], values[i]
+    return values
+
+
+def timsort(values, reverse=False):
+    """Python's built in sort"""
+    return sorted(values, reverse=reverse)
+
+
+def radix_sort(values, reverse=False):
+    """Radix sort for integers. When the value range is no bigger than the input
+    it is a single counting pass, otherwise one LSD pass per byte of the range.
+    Values are offset by the minimum so negative numbers work too"""
+    values = list(values)
+    if len(values) < 2:
+        return values
+    if set(map(type, values)) != {int}:
+        raise TypeError("Radix sort only supports integers")
+
+    low = min(values)
+    span = max(values) - low
+    if span < len(values):
+        counts = Counter(values)
+        result = []
+        for value in range(low, low + span + 1):
+            if value in counts:
+                result += [value] * counts[value]
+    else:
+        keys = [v - low for v in values] if low else values
+        shift = 0
+        while span >> shift:
+            buckets = [[] for _ in range(256)]
+            for k in keys:
+                buckets[(k >> shift) & 0xFF].append(k)
+            keys = [k for bucket in buckets for k in bucket]
+            shift += 8
+        result = [k + low for k in keys] if low else keys
+
+    if reverse:
+        result.reverse()
+    return result
+
+
+def introsort(values, reverse=False):
+    """Quicksort with median of three pivots, switching to heapsort when the
+    recursion gets too deep and insertion sort for small ranges"""
+    values = list(values)
+    if reverse:
+        values = [Reversed(v) for v in values]
+    depth_limit = 2 * max(len(values), 1).bit_length()
+
+    """Explicit stack of (low, high, depth) ranges instead of recursion"""
+    stack = [(0, len(values) - 1, depth_limit)]
+    while stack:
+        low, high, depth = stack.pop()
+        if high - low < 16:
+            _insertion_sort(values, low, high)
+        elif depth == 0:
+            _heap_sort(values, low, high)
+        else:
+            split = _partition(values, low, high)
+            stack.append((low, split, depth - 1))
+            stack.append((split + 1, high, depth - 1))
+
+    if reverse:
+        values = [v.value for v in values]
+    return values
+
+
+class Reversed:
+    """Wraps a value so comparisons are inverted, used to sort descending"""
+    __slots__ = ("value",)
+
+    def __init__(self, value):
+        self.value = value
+
+    def __lt__(self, other):
+        return other.value < self.value
+
+
+def _insertion_sort(values, low, high):
+    for i in range(low + 1, high + 1):
+        item = values[i]
+        j = i - 1
+        while j >= low and item < values[j]:
+            values[j + 1] = values[j]
+            j -= 1
+        values[j + 1] = item
+
+
+def _partition(values, low, high):
+    """Hoare partition around the median of the first, middle and last items"""
+    mid = (low + high) // 2
+    if values[mid] < values[low]:
+        values[low], values[mid] = values[mid], values[low]
+    if values[high] < values[low]:
+        values[low], values[high] = values[high], values[low]
+    if values[high] < values[mid]:
+        values[mid], values[high] = values[high], values[mid]
+    pivot = values[mid]
+
+    i = low - 1
+    j = high + 1
+    while True:
+        i += 1
+        while values[i] < pivot:
+            i += 1
+        j -= 1
+        while pivot < values[j]:
+            j -= 1
+        if i >= j:
+            return j
+        values[i], values[j] = values[j], values[i]
+
+
+def _heap_sort(values, low, high):
+    count = high - low + 1
+
+    def sift_down(start, end):
+        root = start
+        while 2 * root + 1 <= end:
+            child = 2 * root + 1
+            if child + 1 <= end and values[low + child] < values[low + child + 1]:
+                child += 1
+            if values[low + root] < values[low + child]:
+                values[low + root], values[low + child] = values[low + child], values[low + root]
+                root = child
+            else:
+                return
+
+    for start in range(count // 2 - 1, -1, -1):
+        sift_down(start, count - 1)
+    for end in range(count - 1, 0, -1):
+        values[low], values[low + end] = values[low + end], values[low]
+        sift_down(0, end - 1)
+
+
+SORT_ENGINES = {
+    "bubble": bubble_sort,
+    "early-exit bubble": early_exit_bubble_sort,
+    "selection": selection_sort,
+    "timsort": timsort,
+    "radix": radix_sort,
+    "introsort": introsort,
+}
+
+
+def choose_sort_engine(values):
+    """Picks an engine from the input size and the value range of an evenly spaced sample"""
+    n = len(values)
+    if n < 1000:
+        return "timsort"
+    sample = values[::max(n // 1024, 1)]
+    if set(map(type, sample)) != {int}:
+        return "timsort"
+    """Radix sort only beats timsort when it is a single counting pass over a
+    range much smaller than the input, i.e. lots of duplicates"""
+    if max(sample) - min(sample) <= n // 16:
+        return "radix"
+    return "timsort"
+
+
+def sort_values(values, engine="auto", reverse=False):
+    """Sorts with a registered engine, returns (sorted list, engine name used)"""
+    values = as_sequence(values)
+    if engine != "auto":
+        return SORT_ENGINES[engine](values, reverse=reverse), engine
+
+    engine = choose_sort_engine(values)
+    try:
+        return SORT_ENGINES[engine](values, reverse=reverse), engine
+    except TypeError:
+        """The sample missed a non integer value"""
+        return timsort(values, reverse=reverse), "timsort"
+
+
+def merge_sort(values, reverse=False, stats=None, min_run=32):
+    """Bottom up merge sort over natural runs, ping-ponging between two buffers.
+    Runs shorter than min_run are extended with insertion sort. Descending order
+    reverses the input and output so the inner loops only ever test '<' and the
+    sort stays stable. The comparison count is stored in stats if given"""
+    src = list(as_sequence(values))
+    n = len(src)
+    if reverse:
+        src.reverse()
+    comparisons = 0
+
+    """Finds natural runs, flipping strictly descending ones and extending short ones"""
+    bounds = [0]
+    start = 0
+    while start < n:
+        end = start + 1
+        if end < n:
+            comparisons += 1
+            if src[end] < src[start]:
+                while end + 1 < n and src[end + 1] < src[end]:
+                    comparisons += 1
+                    end += 1
+                comparisons += end + 1 < n
+                src[start:end + 1] = src[start:end + 1][::-1]
+            else:
+                while end + 1 < n and not src[end + 1] < src[end]:
+                    comparisons += 1
+                    end += 1
+                comparisons += end + 1 < n
+            end += 1
+
+        if end - start < min_run and end < n:
+            stop = min(start + min_run, n)
+            for i in range(end, stop):
+                item = src[i]
+                j = i - 1
+                while j >= start:
+                    comparisons += 1
+                    if not item < src[j]:
+                        break
+                    src[j + 1] = src[j]
+                    j -= 1
+                src[j + 1] = item
+            end = stop
+        bounds.append(end)
+        start = end
+
+    """Merges neighbouring runs from src into dst until one run is left"""
+    dst = [None] * n
+    while len(bounds) > 2:
+        merged = [0]
+        for r in range(0, len(bounds) - 1, 2):
+            low = bounds[r]
+            if r + 2 >= len(bounds):
+                dst[low:n] = src[low:n]
+                merged.append(n)
+                break
+            mid, high = bounds[r + 1], bounds[r + 2]
+            i, j, k = low, mid, low
+            while i < mid and j < high:
+                comparisons += 1
+                if src[j] < src[i]:
+                    dst[k] = src[j]
+                    j += 1
+                else:
+                    dst[k] = src[i]
+                    i += 1
+                k += 1
+            if i < mid:
+                dst[k:high] = src[i:mid]
+            else:
+                dst[k:high] = src[j:high]
+            merged.append(high)
+        bounds = merged
+        src, dst = dst, src
+
+    if reverse:
+        src.reverse()
+    if stats is not None:
+        stats["comparisons"] = comparisons
+    return src
+
+
+"""Inputs smaller than this are sorted in process, starting workers costs more than it saves"""
+PARALLEL_THRESHOLD = 100_000
+
+
+def _sort_shared_chunk(name, low, high, reverse):
+    """Worker side of parallel_merge_sort, sorts values[low:high] of the shared int64 buffer in place.
+    Every view over shm.buf is released before close, even when the sort fails"""
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        with shm.buf.cast("q") as words, words[low:high] as chunk:
+            chunk[:] = array("q", merge_sort(chunk.tolist(), reverse))
+    finally:
+        shm.close()
+
+
+def parallel_merge_sort(values, reverse=False, workers=None, threshold=PARALLEL_THRESHOLD):
+    """Merge sort with one chunk per worker process and a k-way heap merge in the parent.
+    The values are shared with the workers through a shared memory int64 buffer so only
+    the chunk bounds are pickled. Falls back to merge_sort for small inputs, one worker,
+    or values that are not 64 bit integers"""
+    workers = workers or os.cpu_count() or 1
+    values = as_sequence(values)
+    n = len(values)
+    if n < threshold or workers < 2:
+        return merge_sort(values, reverse)
+    try:
+        packed = array("q", values)
+    except (TypeError, OverflowError):
+        return merge_sort(values, reverse)
+
+    """The buffer may be rounded up to a whole page, so only the first n words are values.
+    close fails while any view over shm.buf is alive, so each one is released on the way out"""
+    shm = shared_memory.SharedMemory(create=True, size=n * packed.itemsize)
+    try:
+        with shm.buf.cast("q") as words, words[:n] as view:
+            view[:] = packed
+            del packed
+
+            step = -(-n // workers)
+            bounds = [(low, min(low + step, n)) for low in range(0, n, step)]
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                jobs = [pool.submit(_sort_shared_chunk, shm.name, low, high, reverse) for low, high in bounds]
+                for job in jobs:
+                    job.result()
+
+            chunks = [view[low:high] for low, high in bounds]
+            try:
+                return list(heapq.merge(*chunks, reverse=reverse))
+            finally:
+                for chunk in chunks:
+                    chunk.release()
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def read_numbers(file, block_size=1 << 20, convert=int, allow_float=False):
+    """Streams integers, or floats with convert=float, from a comma or whitespace separated
+    binary text file in fixed size blocks. With allow_float a block that is not all integers
+    is converted again as floats, and so is the rest of the stream, so a pipe never needs
+    reading twice. nan and inf are refused like parse_numbers does, whichever way the
+    values came to be floats"""
+    def convert_tokens(tokens):
+        nonlocal convert
+        try:
+            values = list(map(convert, tokens))
+        except ValueError:
+            if not allow_float or convert is float:
+                raise
+            convert = float
+            values = list(map(float, tokens))
+        if convert is float and not all(map(isfinite, values)):
+            raise ValueError("nan and inf are not numbers that can be summarised")
+        return values
+
+    tail = b""
+    while True:
+        block = file.read(block_size)
+        if not block:
+            break
+        block = tail + block
+        tokens = block.replace(b",", b" ").split()
+        """A number may continue in the next block"""
+        tail = tokens.pop() if tokens and not block[-1:].isspace() and block[-1:] != b"," else b""
+        yield from convert_tokens(tokens)
+    if tail:
+        yield from convert_tokens([tail])
+
+
+class ParseError(ValueError):
+    """A token that is not a number, position is its character offset in the text"""
+    def __init__(self, token, position):
+        super().__init__(f"'{token[:20]}' at character {position + 1} is not a number")
+        self.token = token
+        self.position = position
+
+
+def parse_numbers(text, allow_float=True):
+    """Parses comma, whitespace or newline separated numbers. The text is split and converted
+    by C level str methods and map with no per token Python code or stripped copies, about
+    1.6x faster than a strip and int comprehension. Integers stay exact, a text holding any
+    float parses to floats. Only when conversion fails is the text scanned again for the error"""
+    tokens = text.replace(",", " ").split()
+    try:
+        return list(map(int, tokens))
+    except ValueError:
+        pass
+    if allow_float:
+        try:
+            values = list(map(float, tokens))
+        except ValueError:
+            values = None
+        """nan and inf parse as floats but cannot be sorted or summarised"""
+        if values is not None and all(map(isfinite, values)):
+            return values
+    for match in re.finditer(r"[^,\s]+", text):
+        token = match.group()
+        try:
+            value = int(token) if not allow_float else float(token)
+        except ValueError:
+            raise ParseError(token, match.start()) from None
+        if not isfinite(value):
+            raise ParseError(token, match.start())
+    raise ParseError(text, 0)
+
+
+def parse_file(path, allow_float=True):
+    """Reads a whole text file of numbers, use read_numbers to stream integer files instead"""
+    with open(path) as file:
+        return parse_numbers(file.read(), allow_float)
+
+
+"""Dataset files: a 16 byte header of magic, version, array typecode ('q' int64 or 'd' float64)
+and value count, then the values as raw little-endian bytes"""
+DATASET_MAGIC = b"AWDS"
+DATASET_HEADER = struct.Struct("<4sBc2xQ")
+
+
+class Dataset:
+    """A dataset file mapped read-only into memory. values is a memoryview straight onto the
+    mapped pages, so opening costs the same at any size and every process that opens the file
+    shares one copy in the page cache. Pickles as its path, so a process job only sends that"""
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as file:
+            header = file.read(DATASET_HEADER.size)
+            if len(header) < DATASET_HEADER.size:
+                raise ValueError(f"{path} is not a dataset file")
+            magic, version, typecode, length = DATASET_HEADER.unpack(header)
+            if magic != DATASET_MAGIC or version != 1 or typecode not in (b"q", b"d"):
+                raise ValueError(f"{path} is not a dataset file")
+            if os.fstat(file.fileno()).st_size < DATASET_HEADER.size + 8 * length:
+                raise ValueError(f"{path} is shorter than its {length} values")
+            self.typecode = typecode.decode()
+            self.length = length
+            self.map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) if length else None
+        if self.map is None:
+            self.values = memoryview(array(self.typecode))
+        elif sys.byteorder == "little":
+            self.values = memoryview(self.map)[DATASET_HEADER.size:DATASET_HEADER.size + 8 * length].cast(self.typecode)
+        else:
+            """Big-endian machines need a byte swapped copy"""
+            values = array(self.typecode, self.map[DATASET_HEADER.size:DATASET_HEADER.size + 8 * length])
+            values.byteswap()
+            self.values = memoryview(values)
+
+    def __reduce__(self):
+        return Dataset, (self.path,)
+
+    def __len__(self):
+        return self.length
+
+    def __getitem__(self, index):
+        return self.values[index]
+
+    def __iter__(self):
+        return iter(self.values)
+
+    def tolist(self):
+        return self.values.tolist()
+
+    def fingerprint(self):
+        """Identifies the file contents for cache keys without reading them"""
+        stat = os.stat(self.path)
+        return f"{os.path.abspath(self.path)}:{stat.st_size}:{stat.st_mtime_ns}".encode()
+
+
+def as_sequence(values):
+    """Engines read datasets through their zero copy memoryview"""
+    return values.values if isinstance(values, Dataset) else values
+
+
+def is_dataset(path):
+    with open(path, "rb") as file:
+        return file.read(len(DATASET_MAGIC)) == DATASET_MAGIC
+
+
+def write_dataset(path, values):
+    """Writes int64 values, or float64 when any value is a float"""
+    typecode = "q" if all(type(v) is int for v in values) else "d"
+    packed = array(typecode, values)
+    if sys.byteorder != "little":
+        packed.byteswap()
+    with open(path, "wb") as out:
+        out.write(DATASET_HEADER.pack(DATASET_MAGIC, 1, typecode.encode(), len(packed)))
+        packed.tofile(out)
+    return len(packed)
+
+
+def convert_to_dataset(text_path, dataset_path, chunk_values=1 << 20):
+    """Streams a comma separated text file into a dataset a chunk at a time, as int64 unless a
+    value is not an integer, in which case the conversion starts again as float64.
+    Written to a temporary file beside dataset_path and moved over it once complete, so a failed
+    conversion never leaves half a dataset behind or replaces a good one"""
+    with tempfile.NamedTemporaryFile("wb", dir=os.path.dirname(os.path.abspath(dataset_path)),
+                                     delete=False, suffix=".tmp") as out:
+        temp_path = out.name
+    try:
+        for typecode, convert in (("q", int), ("d", float)):
+            count = 0
+            try:
+                with open(text_path, "rb") as file, open(temp_path, "wb") as out:
+                    out.write(DATASET_HEADER.pack(DATASET_MAGIC, 1, typecode.encode(), 0))
+                    numbers = read_numbers(file, convert=convert)
+                    while True:
+                        packed = array(typecode, islice(numbers, chunk_values))
+                        if not packed:
+                            break
+                        if sys.byteorder != "little":
+                            packed.byteswap()
+                        packed.tofile(out)
+                        count += len(packed)
+                    out.seek(0)
+                    out.write(DATASET_HEADER.pack(DATASET_MAGIC, 1, typecode.encode(), count))
+                os.replace(temp_path, dataset_path)
+                return count
+            except ValueError:
+                if typecode == "d":
+                    raise
+            except OverflowError:
+                raise ValueError("Datasets only hold 64 bit integers") from None
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+def read_run(path, buffer_values):
+    """Streams a binary int64 run file back in buffer_values sized reads"""
+    with open(path, "rb") as file:
+        while True:
+            block = array("q")
+            try:
+                block.fromfile(file, buffer_values)
+            except EOFError:
+                """fromfile keeps the values it managed to read before the end"""
+                yield from block
+                return
+            yield from block
+
+
+class ExternalSorter:
+    """Out of core merge sort for integer files larger than memory.
+    Sorts memory sized chunks with merge_sort, spills them as binary int64 run files,
+    then k-way merges at most fan_in runs at a time into the output file"""
+    """Rough cost of one value held in a Python list while merge_sort runs"""
+    bytes_per_value = 64
+
+    def __init__(self, memory_limit=64 * 1024 * 1024, fan_in=16, temp_dir=None, progress=None):
+        if fan_in < 2:
+            raise ValueError("fan_in must be at least 2")
+        self.memory_limit = memory_limit
+        self.fan_in = fan_in
+        self.temp_dir = temp_dir
+        """Called with (stage, done, total)"""
+        self.progress = progress or (lambda stage, done, total: None)
+
+    def sort_file(self, input_path, output_path, reverse=False):
+        """Sorts a comma separated text file of integers into output_path, returns the value count"""
+        with open(input_path, "rb") as file, open(output_path, "w") as out:
+            return self.sort_stream(file, out, reverse, os.path.getsize(input_path))
+
+    def sort_stream(self, file, out, reverse=False, size=None):
+        """Sorts integers read from a binary file object into a text file object, so pipes work too.
+        Reading progress is only reported when the input size is known"""
+        with tempfile.TemporaryDirectory(dir=self.temp_dir) as work_dir:
+            runs, count = self._write_runs(file, size, work_dir, reverse)
+
+            """Each run gets an equal share of the memory budget for its read buffer"""
+            buffer_values = max(self.memory_limit // ((self.fan_in + 1) * 8), 1024)
+            generation = 0
+            while len(runs) > self.fan_in:
+                generation += 1
+                merged_runs = []
+                for i in range(0, len(runs), self.fan_in):
+                    group = runs[i:i + self.fan_in]
+                    path = os.path.join(work_dir, f"merge-{generation}-{i}.bin")
+                    with open(path, "wb") as run_out:
+                        self._write_values(self._merge(group, buffer_values, reverse), run_out, buffer_values, binary=True)
+                    for run in group:
+                        os.remove(run)
+                    merged_runs.append(path)
+                    self.progress(f"Merging pass {generation}", i + len(group), len(runs))
+                runs = merged_runs
+
+            self._write_values(self._merge(runs, buffer_values, reverse), out, buffer_values,
+                               binary=False, total=count)
+        return count
+
+    def _write_runs(self, file, size, work_dir, reverse):
+        run_length = max(self.memory_limit // self.bytes_per_value, 1)
+        runs = []
+        count = 0
+        numbers = read_numbers(file)
+        while True:
+            chunk = list(islice(numbers, run_length))
+            if not chunk:
+                break
+            count += len(chunk)
+            path = os.path.join(work_dir, f"run-{len(runs)}.bin")
+            try:
+                packed = array("q", merge_sort(chunk, reverse))
+            except OverflowError:
+                raise ValueError("External sort only supports 64 bit integers") from None
+            with open(path, "wb") as run_out:
+                packed.tofile(run_out)
+            runs.append(path)
+            if size:
+                self.progress("Sorting runs", file.tell(), size)
+        return runs, count
+
+    def _merge(self, runs, buffer_values, reverse):
+        return heapq.merge(*(read_run(run, buffer_values) for run in runs), reverse=reverse)
+
+    def _write_values(self, values, out, buffer_values, binary, total=None):
+        written = 0
+        while True:
+            batch = list(islice(values, buffer_values))
+            if not batch:
+                break
+            if binary:
+                array("q", batch).tofile(out)
+            else:
+                out.write(("," if written else "") + ",".join(map(str, batch)))
+            written += len(batch)
+            if total:
+                self.progress("Writing output", written, total)
+
+
+CARD_SUITS = ("H", "D", "C", "S")
+CARD_VALUES = ("2", "3", "4", "5", "6", "7", "8", "9", "10", "Jack", "Queen", "King", "Ace")
+DECK_SIZE = len(CARD_SUITS) * len(CARD_VALUES)
+
+
+def card_name(card):
+    """Formats a card number 0-51, numbered suit by suit in the order of create_deck"""
+    return f"{CARD_VALUES[card % 13]} {CARD_SUITS[card // 13]}"
+
+
+def format_deck(deck):
+    """Lazily yields the card names of a deck, only needed for display"""
+    return map(card_name, deck)
+
+
+def spawn_seeds(seed, count):
+    """Independent, reproducible seeds for count workers"""
+    if np is not None:
+        return np.random.SeedSequence(seed).spawn(count)
+    root = random.Random(seed)
+    return [root.getrandbits(128) for _ in range(count)]
+
+
+class ShuffleEngine:
+    """Shuffles many decks per call with cards stored as small ints.
+    With NumPy the batch is a (count, 52) uint8 array permuted row by row in one call,
+    otherwise a list of array('B') decks ordered by random sort keys"""
+    def __init__(self, seed=None):
+        if np is not None:
+            self.rng = np.random.default_rng(seed)
+        else:
+            self.rng = random.Random(seed)
+
+    def shuffle_batch(self, count):
+        if np is not None:
+            decks = np.tile(np.arange(DECK_SIZE, dtype=np.uint8), (count, 1))
+            return self.rng.permuted(decks, axis=1)
+
+        """Sorting by 53 bit random keys gives a uniform permutation, ties are vanishingly rare"""
+        rand = self.rng.random
+        cards = range(DECK_SIZE)
+        batch = []
+        for _ in range(count):
+            keys = [rand() for _ in cards]
+            batch.append(array("B", sorted(cards, key=keys.__getitem__)))
+        return batch
+
+    def shuffle(self):
+        return self.shuffle_batch(1)[0]
+
+
+HAND_CATEGORIES = ("High card", "Pair", "Two pair", "Three of a kind", "Straight",
+                   "Flush", "Full house", "Four of a kind", "Straight flush")
+
+
+def classify_hand(cards):
+    """Index into HAND_CATEGORIES for a five card poker hand of card numbers"""
+    ranks = sorted(card % 13 for card in cards)
+    counts = sorted(Counter(ranks).values(), reverse=True)
+    flush = len({card // 13 for card in cards}) == 1
+    straight = len(counts) == 5 and (ranks[4] - ranks[0] == 4 or ranks == [0, 1, 2, 3, 12])
+
+    if straight and flush:
+        return 8
+    if counts[0] == 4:
+        return 7
+    if counts[0] == 3 and counts[1] == 2:
+        return 6
+    if flush:
+        return 5
+    if straight:
+        return 4
+    if counts[0] == 3:
+        return 3
+    if counts[0] == 2 and counts[1] == 2:
+        return 2
+    if counts[0] == 2:
+        return 1
+    return 0
+
+
+def _classify_hands_np(hands):
+    """Vectorised classify_hand over a (count, 5) array of hands"""
+    count = len(hands)
+    ranks = np.sort(hands % 13, axis=1)
+    suits = hands // 13
+    histogram = np.bincount((np.arange(count)[:, None] * 13 + ranks).ravel(),
+                            minlength=count * 13).reshape(count, 13)
+    counts = -np.sort(-histogram, axis=1)
+    flush = (suits == suits[:, :1]).all(axis=1)
+    wheel = (ranks == np.array([0, 1, 2, 3, 12])).all(axis=1)
+    straight = (counts[:, 0] == 1) & ((ranks[:, 4] - ranks[:, 0] == 4) | wheel)
+    return np.select(
+        [straight & flush, counts[:, 0] == 4, (counts[:, 0] == 3) & (counts[:, 1] == 2), flush, straight,
+         counts[:, 0] == 3, (counts[:, 0] == 2) & (counts[:, 1] == 2), counts[:, 0] == 2],
+        [8, 7, 6, 5, 4, 3, 2, 1], 0)
+
+
+def _simulate_batch(seed, count):
+    """Worker side of simulate_shuffles, returns aggregated counts rather than decks.
+    positions[card * 52 + k] counts card landing at position k, hands counts the top five cards"""
+    decks = ShuffleEngine(seed).shuffle_batch(count)
+    if np is not None:
+        index = decks.astype(np.intp) * DECK_SIZE + np.arange(DECK_SIZE)
+        positions = np.bincount(index.ravel(), minlength=DECK_SIZE * DECK_SIZE)
+        hands = np.bincount(_classify_hands_np(decks[:, :5].astype(np.intp)), minlength=len(HAND_CATEGORIES))
+        return positions.tolist(), hands.tolist()
+
+    positions = [0] * (DECK_SIZE * DECK_SIZE)
+    hands = [0] * len(HAND_CATEGORIES)
+    for deck in decks:
+        for k, card in enumerate(deck):
+            positions[card * DECK_SIZE + k] += 1
+        hands[classify_hand(deck[:5])] += 1
+    return positions, hands
+
+
+class SimulationResult:
+    """Streaming totals of a Monte-Carlo shuffle simulation"""
+    def __init__(self):
+        self.shuffles = 0
+        self.positions = [0] * (DECK_SIZE * DECK_SIZE)
+        self.hands = [0] * len(HAND_CATEGORIES)
+        self.cancelled = False
+
+    def add(self, count, positions, hands):
+        self.shuffles += count
+        self.positions = [a + b for a, b in zip(self.positions, positions)]
+        self.hands = [a + b for a, b in zip(self.hands, hands)]
+
+    def position_probability(self, card, position):
+        """Estimated chance of card landing at position (both counted from 0)"""
+        return self.positions[card * DECK_SIZE + position] / max(self.shuffles, 1)
+
+    def hand_frequencies(self):
+        return {name: count / max(self.shuffles, 1) for name, count in zip(HAND_CATEGORIES, self.hands)}
+
+
+def simulate_shuffles(total, seed=None, workers=None, batch_size=10_000, progress=None, cancel=None):
+    """Runs total shuffles split into batches, each with its own spawned seed so the result
+    is reproducible for a given seed whatever the worker count. Batches run across a process
+    pool when workers > 1. progress is called with (done, total) after each batch, and setting
+    the cancel event stops the run early with result.cancelled set"""
+    workers = workers or os.cpu_count() or 1
+    sizes = [min(batch_size, total - done) for done in range(0, total, batch_size)]
+    seeds = spawn_seeds(seed, len(sizes))
+    result = SimulationResult()
+
+    def collect(count, counts):
+        result.add(count, *counts)
+        if progress:
+            progress(result.shuffles, total)
+
+    if workers < 2:
+        for batch_seed, count in zip(seeds, sizes):
+            if cancel is not None and cancel.is_set():
+                result.cancelled = True
+                break
+            collect(count, _simulate_batch(batch_seed, count))
+        return result
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        jobs = {pool.submit(_simulate_batch, batch_seed, count): count for batch_seed, count in zip(seeds, sizes)}
+        for job in as_completed(jobs):
+            if cancel is not None and cancel.is_set():
+                result.cancelled = True
+                for other in jobs:
+                    other.cancel()
+                break
+            collect(jobs[job], job.result())
+    return result
+
+
+def product_range(low, high, leaf=8):
+    """Product of the integers low..high by binary splitting. Built bottom up as a
+    product tree so each multiplication joins two numbers of similar size"""
+    if low > high:
+        return 1
+    level = [prod(range(i, min(i + leaf, high + 1))) for i in range(low, high + 1, leaf)]
+    while len(level) > 1:
+        joined = [level[i] * level[i + 1] for i in range(0, len(level) - 1, 2)]
+        if len(level) % 2:
+            joined.append(level[-1])
+        level = joined
+    return level[0]
+
+
+class FactorialEngine:
+    """Non recursive factorials with an LRU memo of recent results.
+    A request extends the largest cached factorial below it rather than starting from 1"""
+    def __init__(self, cache_size=8):
+        self.cache_size = cache_size
+        self.cache = OrderedDict()
+
+    def factorial(self, n):
+        if n < 0:
+            raise ValueError("n must be non-negative")
+        if n in self.cache:
+            self.cache.move_to_end(n)
+            return self.cache[n]
+
+        start = max((m for m in self.cache if m < n), default=None)
+        if start is None:
+            result = product_range(2, n)
+        else:
+            self.cache.move_to_end(start)
+            result = self.cache[start] * product_range(start + 1, n)
+
+        self.cache[n] = result
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+        return result
+
+    def factorial_mod(self, n, m):
+        """n! mod m without building n!. For prime m past the halfway point Wilson's
+        theorem, (m - 1)! = -1 (mod m), means only (n + 1)..(m - 1) has to be multiplied"""
+        if n < 0 or m < 1:
+            raise ValueError("n must be non-negative and m positive")
+        if n >= m:
+            return 0
+        if n > m // 2 and is_probable_prime(m):
+            rest = 1
+            for i in range(n + 1, m):
+                rest = rest * i % m
+            return -pow(rest, -1, m) % m
+        result = 1 % m
+        for i in range(2, n + 1):
+            result = result * i % m
+        return result
+
+    def digit_count(self, n):
+        """Number of decimal digits in n! from log10(n!) = lgamma(n + 1) / ln(10).
+        Falls back to the exact value when the estimate is too close to a whole number"""
+        if n < 0:
+            raise ValueError("n must be non-negative")
+        log10 = lgamma(n + 1) / log(10)
+        if abs(log10 - round(log10)) < 1e-12 + log10 * 1e-14:
+            return len(str(self.factorial(n)))
+        return int(log10) + 1
+
+
+def recursive_factorial(n):
+    """Teaching version, recurses once per n so Python's recursion limit caps n"""
+    if n == 0 or n == 1:
+        return 1
+    return n * recursive_factorial(n - 1)
+
+
+def get_percentile(order_stats, n, percentile):
+    """Linear interpolation between the two order statistics around percentile * (n - 1).
+    order_stats maps a rank to its value, a sorted list works as well as a dict of ranks"""
+    index = percentile * (n - 1)
+    lower = int(index)
+    upper = lower + 1
+
+    if upper >= n:
+        return order_stats[lower]
+
+    weight = index - lower
+    return order_stats[lower] * (1 - weight) + order_stats[upper] * weight
+
+
+def percentile_ranks(n, percentiles):
+    """The order statistics get_percentile needs for each percentile"""
+    ranks = set()
+    for percentile in percentiles:
+        lower = int(percentile * (n - 1))
+        ranks.add(lower)
+        if lower + 1 < n:
+            ranks.add(lower + 1)
+    return sorted(ranks)
+
+
+def select_ranks(values, ranks):
+    """Multi-target quickselect, returns {rank: kth smallest value} for every rank without
+    sorting. Each partition step only follows the sides that still hold a wanted rank"""
+    found = {}
+    stack = [(values, 0, list(ranks))]
+    while stack:
+        part, offset, wanted = stack.pop()
+        if len(part) <= 32:
+            part = sorted(part)
+            for rank in wanted:
+                found[rank] = part[rank - offset]
+            continue
+
+        pivot = sorted((part[0], part[len(part) // 2], part[-1], random.choice(part), random.choice(part)))[2]
+        lower = [x for x in part if x < pivot]
+        upper = [x for x in part if x > pivot]
+        equal_end = offset + len(part) - len(upper)
+
+        wanted_lower = [rank for rank in wanted if rank < offset + len(lower)]
+        wanted_upper = [rank for rank in wanted if rank >= equal_end]
+        for rank in wanted:
+            if offset + len(lower) <= rank < equal_end:
+                found[rank] = pivot
+        if wanted_lower:
+            stack.append((lower, offset, wanted_lower))
+        if wanted_upper:
+            stack.append((upper, equal_end, wanted_upper))
+    return found
+
+
+def exact_array(values):
+    """values as an int64 or float64 NumPy array when that holds every one of them exactly,
+    otherwise None. Ints outside int64, ints mixed with floats and any other type stay on the
+    pure Python paths, which give back each value with its own type"""
+    if np is None:
+        return None
+    if isinstance(values, memoryview) and values.format in ("q", "d"):
+        return np.asarray(values)
+    types = set(map(type, values))
+    if types == {int}:
+        try:
+            return np.array(values, dtype=np.int64)
+        except OverflowError:
+            return None
+    if types == {float}:
+        return np.array(values, dtype=np.float64)
+    return None
+
+
+def summary_statistics(values, percentiles=(0.25, 0.5, 0.75)):
+    """Smallest, largest, mode and percentiles without sorting the data.
+    Counting gives min, max and the mode in one pass, then one multi-quantile selection
+    finds every order statistic the percentiles need. Uses NumPy when it holds the values
+    exactly, so both paths give the same results.
+    The mode is "No unique mode" when every value appears once"""
+    values = as_sequence(values)
+    n = len(values)
+    if n == 0:
+        raise ValueError("No values to summarise")
+    ranks = percentile_ranks(n, percentiles)
+
+    data = exact_array(values)
+    if data is not None:
+        distinct, counts = np.unique(data, return_counts=True)
+        smallest, largest = distinct[0].item(), distinct[-1].item()
+        modes = distinct[counts == counts.max()].tolist()
+        partitioned = np.partition(data, ranks)
+        order_stats = {rank: partitioned[rank].item() for rank in ranks}
+    else:
+        counts = Counter(values)
+        smallest, largest = min(counts), max(counts)
+        max_count = max(counts.values())
+        modes = sorted(k for k, v in counts.items() if v == max_count)
+        order_stats = select_ranks(values, ranks)
+
+    return {
+        "smallest": smallest,
+        "largest": largest,
+        "mode": modes if len(modes) < n else "No unique mode",
+        "percentiles": {p: get_percentile(order_stats, n, p) for p in percentiles},
+    }
+
+
+class KLLSketch:
+    """Mergeable quantile sketch (Karnin, Lang and Liberty). Level h keeps items of weight 2^h,
+    a full level is sorted and every other item promoted, so memory stays O(k) for any
+    stream length. Rank error is roughly 2 / k of the stream length"""
+    def __init__(self, k=200, seed=None):
+        self.k = k
+        self.count = 0
+        self.levels = [[]]
+        self.size = 0
+        self.max_size = self.capacity(0)
+        self.rng = random.Random(seed)
+
+    def capacity(self, level):
+        """Lower levels get geometrically smaller buffers, the top level gets k"""
+        return int(self.k * (2 / 3) ** (len(self.levels) - level - 1)) + 2
+
+    def update(self, values, chunk_size=4096):
+        """Adds values a chunk at a time, compacting whenever the sketch is over size"""
+        values = iter(values)
+        while True:
+            chunk = list(islice(values, chunk_size))
+            if not chunk:
+                return
+            self.levels[0].extend(chunk)
+            self.size += len(chunk)
+            self.count += len(chunk)
+            if self.size >= self.max_size:
+                self.compress()
+
+    def compress(self):
+        """One bottom up pass, each full level is sorted and a random half of
+        alternate items promoted, so a large chunk cascades up in a single call"""
+        for level in itertools_count():
+            if level == len(self.levels):
+                break
+            if len(self.levels[level]) < self.capacity(level):
+                continue
+            if level + 1 == len(self.levels):
+                self.levels.append([])
+                self.max_size = sum(self.capacity(h) for h in range(len(self.levels)))
+            items = sorted(self.levels[level])
+            """An odd item out stays behind on this level"""
+            keep = items.pop() if len(items) % 2 else None
+            self.levels[level + 1].extend(items[self.rng.randint(0, 1)::2])
+            self.levels[level] = [] if keep is None else [keep]
+        self.size = sum(map(len, self.levels))
+
+    def merge(self, other):
+        """Folds another sketch in, the result covers both streams"""
+        while len(self.levels) < len(other.levels):
+            self.levels.append([])
+        for level, items in enumerate(other.levels):
+            self.levels[level].extend(items)
+        self.count += other.count
+        self.max_size = sum(self.capacity(h) for h in range(len(self.levels)))
+        self.compress()
+
+    def ranked(self):
+        """Retained items in order with their cumulative weights"""
+        weighted = sorted((item, 1 << level) for level, items in enumerate(self.levels) for item in items)
+        total = 0
+        cumulative = []
+        for item, weight in weighted:
+            total += weight
+            cumulative.append(total)
+        return [item for item, _ in weighted], cumulative, total
+
+    def order_stats(self):
+        return SketchOrderStats(self)
+
+
+class SketchOrderStats:
+    """Approximate rank -> value lookup over a KLL sketch, so get_percentile can interpolate
+    exactly as it does over sorted data"""
+    def __init__(self, sketch):
+        self.items, self.cumulative, self.total = sketch.ranked()
+        self.n = sketch.count
+
+    def __getitem__(self, rank):
+        """The retained weights add up to about the stream length, rescale before searching"""
+        target = (rank + 0.5) * self.total / self.n
+        return self.items[min(bisect_right(self.cumulative, target), len(self.items) - 1)]
+
+
+class MisraGries:
+    """Mergeable heavy hitters summary with k counters. Estimated counts are never too high
+    and at most count / (k + 1) too low, so any value above that frequency is kept"""
+    def __init__(self, k=1000):
+        self.k = k
+        self.count = 0
+        self.counters = Counter()
+
+    def update(self, values, chunk_size=100_000):
+        """Counts each chunk with Counter and folds it in as a merge"""
+        values = iter(values)
+        while True:
+            chunk = Counter(islice(values, chunk_size))
+            if not chunk:
+                return
+            self.count += sum(chunk.values())
+            self._fold(chunk)
+
+    def merge(self, other):
+        self.count += other.count
+        self._fold(other.counters)
+
+    def _fold(self, counts):
+        self.counters.update(counts)
+        if len(self.counters) > self.k:
+            """Subtracting the (k + 1)th largest count leaves at most k positive counters"""
+            cut = heapq.nlargest(self.k + 1, self.counters.values())[-1]
+            self.counters = Counter({value: c - cut for value, c in self.counters.items() if c > cut})
+
+    def heavy_hitters(self, top=None):
+        return self.counters.most_common(top)
+
+
+class StreamingStatistics:
+    """Constant memory version of summary_statistics for streams that never fit in memory.
+    Quantiles come from a KLL sketch with rank error around quantile_error, the mode from a
+    Misra-Gries summary that undercounts by at most frequency_error of the stream, min and
+    max are exact. Sketches from separate chunks can be merged"""
+    def __init__(self, quantile_error=0.01, frequency_error=0.001, seed=None):
+        self.quantiles = KLLSketch(max(8, ceil(2 / quantile_error)), seed)
+        self.frequencies = MisraGries(ceil(1 / frequency_error))
+        self.smallest = None
+        self.largest = None
+
+    def update(self, values, chunk_size=100_000):
+        values = iter(values)
+        while True:
+            chunk = list(islice(values, chunk_size))
+            if not chunk:
+                return
+            low, high = min(chunk), max(chunk)
+            self.smallest = low if self.smallest is None else min(self.smallest, low)
+            self.largest = high if self.largest is None else max(self.largest, high)
+            self.quantiles.update(chunk)
+            self.frequencies.update(chunk)
+
+    def merge(self, other):
+        for value in (other.smallest, other.largest):
+            if value is not None:
+                self.smallest = value if self.smallest is None else min(self.smallest, value)
+                self.largest = value if self.largest is None else max(self.largest, value)
+        self.quantiles.merge(other.quantiles)
+        self.frequencies.merge(other.frequencies)
+
+    def retained(self):
+        """Values held in memory, the cost the error bounds trade against"""
+        return self.quantiles.size + len(self.frequencies.counters)
+
+    def summary(self, percentiles=(0.25, 0.5, 0.75)):
+        """Same shape as summary_statistics, the mode lists the most frequent values seen.
+        Every counter can cancel out when no value stands out, which reads as no unique mode,
+        as does every value being a mode like the exact path"""
+        n = self.quantiles.count
+        if n == 0:
+            raise ValueError("No values to summarise")
+        hitters = self.frequencies.heavy_hitters()
+        top = hitters[0][1] if hitters else None
+        modes = sorted(value for value, c in hitters if c == top) if hitters else []
+        order_stats = self.quantiles.order_stats()
+        return {
+            "smallest": self.smallest,
+            "largest": self.largest,
+            "mode": modes if 0 < len(modes) < n else "No unique mode",
+            "percentiles": {p: get_percentile(order_stats, n, p) for p in percentiles},
+        }
+
+
+"""Query operation -> (SearchIndex method, number of arguments)"""
+SEARCH_QUERIES = {
+    "contains": ("contains", 1),
+    "first": ("first_index", 1),
+    "last": ("last_index", 1),
+    "rank": ("rank", 1),
+    "range": ("count_range", 2),
+    "nearest": ("nearest", 1),
+}
+
+
+class SearchIndex:
+    """Index over one list of values for answering many lookups. A hash of value -> first and
+    last position answers membership and index queries, a sorted copy answers rank, range
+    counts and nearest value by binary search. Every query method takes a batch and returns
+    a list, run through NumPy searchsorted when available or map over bisect otherwise, so
+    there is no Python loop per query. append extends the index without rebuilding it"""
+    """Appends up to this many values are inserted one by one, larger ones are merged"""
+    INSERT_LIMIT = 64
+
+    def __init__(self, values=()):
+        self.values = []
+        self.first = {}
+        self.last = {}
+        self.keys = []
+        self.key_array = None
+        self.append(values)
+
+    def __len__(self):
+        return len(self.values)
+
+    @property
+    def nbytes(self):
+        """Memory held, each value and position object counted at 32 bytes. The values are
+        shared by the list, the sorted keys and the hash keys so they are counted once"""
+        containers = (self.values, self.keys, self.first, self.last)
+        return sum(map(sys.getsizeof, containers)) + 32 * (len(self.values) + len(self.first) + len(self.last))
+
+    def append(self, values):
+        """Positions carry on from the current length. A large batch is sorted on its own and
+        merged in by timsort, which finds the two sorted runs and merges them in linear time"""
+        values = list(as_sequence(values))
+        start = len(self.values)
+        positions = range(start, start + len(values))
+        self.values.extend(values)
+        self.last.update(zip(values, positions))
+        first = dict(zip(reversed(values), reversed(positions)))
+        self.first.update({value: position for value, position in first.items() if value not in self.first})
+        if len(values) <= self.INSERT_LIMIT:
+            for value in values:
+                insort(self.keys, value)
+        else:
+            self.keys += sorted(values)
+            self.keys.sort()
+        self.key_array = None
+
+    def _arrays(self, queries):
+        """NumPy copies of the sorted keys and the queries, or None for the bisect path when
+        NumPy is missing, either cannot be held exactly by exact_array or the two differ in
+        type. nearest then hands back the keys as they were given, ints as ints"""
+        if np is None:
+            return None
+        if self.key_array is None:
+            keys = exact_array(self.keys)
+            self.key_array = keys if keys is not None else False
+        queries = exact_array(queries)
+        if self.key_array is False or queries is None or queries.dtype != self.key_array.dtype:
+            return None
+        return self.key_array, queries
+
+    def contains(self, queries):
+        return list(map(self.first.__contains__, queries))
+
+    def first_index(self, queries):
+        """Position of the first occurrence of each query, None when it is absent"""
+        return list(map(self.first.get, queries))
+
+    def last_index(self, queries):
+        return list(map(self.last.get, queries))
+
+    def rank(self, queries):
+        """Number of values smaller than each query"""
+        arrays = self._arrays(queries)
+        if arrays is not None:
+            return np.searchsorted(*arrays, "left").tolist()
+        return list(map(partial(bisect_left, self.keys), queries))
+
+    def count_range(self, lows, highs):
+        """Number of values v with low <= v <= high for each pair"""
+        low_arrays, high_arrays = self._arrays(lows), self._arrays(highs)
+        if low_arrays is not None and high_arrays is not None:
+            counts = np.searchsorted(*high_arrays, "right") - np.searchsorted(*low_arrays, "left")
+            return counts.clip(0).tolist()
+        return [max(right - left, 0) for left, right in zip(map(partial(bisect_left, self.keys), lows),
+                                                             map(partial(bisect_right, self.keys), highs))]
+
+    def nearest(self, queries):
+        """Closest value to each query, the smaller on a tie, None for an empty index"""
+        n = len(self.keys)
+        if n < 2:
+            return [self.keys[0] if n else None] * len(queries)
+        arrays = self._arrays(queries)
+        if arrays is not None:
+            keys, queries = arrays
+            i = np.searchsorted(keys, queries).clip(1, n - 1)
+            below, above = keys[i - 1], keys[i]
+            """Differences in float64 so extreme int64 values cannot overflow"""
+            points = queries.astype(np.float64)
+            return np.where(points - below <= above - points, below, above).tolist()
+        keys = self.keys
+        nearest = []
+        for query, i in zip(queries, map(partial(bisect_left, keys), queries)):
+            below, above = keys[min(max(i, 1), n - 1) - 1], keys[min(max(i, 1), n - 1)]
+            nearest.append(below if query - below <= above - query else above)
+        return nearest
+
+    def answer(self, batches):
+        """Answers the batches made by parse_queries, one method call per operation,
+        and returns the answers in the order the queries were read"""
+        answers = [None] * sum(len(numbers) for numbers, *columns in batches.values())
+        for op, (numbers, *columns) in batches.items():
+            for number, result in zip(numbers, getattr(self, SEARCH_QUERIES[op][0])(*columns)):
+                answers[number] = result
+        return answers
+
+
+def parse_queries(lines):
+    """Reads one query per line, e.g. "rank 10" or "range 5 9", into batches by operation:
+    {op: (query numbers, arguments[, second arguments])}. Blank lines and # comments are skipped"""
+    batches = {}
+    count = 0
+    for line_number, line in enumerate(lines, 1):
+        tokens = line.partition("#")[0].split()
+        if not tokens:
+            continue
+        op, *arguments = tokens
+        if op not in SEARCH_QUERIES:
+            raise ValueError(f"Line {line_number}: unknown query '{op}', expected one of {', '.join(SEARCH_QUERIES)}")
+        method, arity = SEARCH_QUERIES[op]
+        if len(arguments) != arity:
+            raise ValueError(f"Line {line_number}: {op} takes {arity} number{'s' if arity > 1 else ''}")
+        try:
+            arguments = [int(token) if token.lstrip("+-").isdigit() else float(token) for token in arguments]
+        except ValueError:
+            arguments = []
+        if not arguments or not all(map(isfinite, arguments)):
+            raise ValueError(f"Line {line_number}: '{line.strip()}' needs finite numbers")
+        batch = batches.get(op)
+        if batch is None:
+            batch = batches[op] = tuple([] for _ in range(arity + 1))
+        batch[0].append(count)
+        for column, argument in zip(batch[1:], arguments):
+            column.append(argument)
+        count += 1
+    return batches
+
+
+def palindrome_radii(s):
+    """Manacher's algorithm in O(n). odd[i] counts the odd length palindromes centred on s[i],
+    even[i] the even length ones centred between s[i - 1] and s[i]"""
+    n = len(s)
+    odd = array("l", [0]) * n
+    left, right = 0, -1
+    for i in range(n):
+        k = 1 if i > right else min(odd[left + right - i], right - i + 1)
+        while i - k >= 0 and i + k < n and s[i - k] == s[i + k]:
+            k += 1
+        odd[i] = k
+        if i + k - 1 > right:
+            left, right = i - k + 1, i + k - 1
+
+    even = array("l", [0]) * n
+    left, right = 0, -1
+    for i in range(n):
+        k = 0 if i > right else min(even[left + right - i + 1], right - i + 1)
+        while i - k - 1 >= 0 and i + k < n and s[i - k - 1] == s[i + k]:
+            k += 1
+        even[i] = k
+        if i + k - 1 > right:
+            left, right = i - k, i + k - 1
+    return odd, even
+
+
+def count_palindromes(s, radii=None):
+    """Number of palindromic substrings, every occurrence counted"""
+    odd, even = radii or palindrome_radii(s)
+    return sum(odd) + sum(even)
+
+
+def palindrome_spans(s, radii=None):
+    """Lazily yields (start, end) slices of every palindromic substring, centre by centre,
+    so nothing is copied until a caller slices s[start:end]"""
+    odd, even = radii or palindrome_radii(s)
+    for i in range(len(s)):
+        for k in range(1, odd[i] + 1):
+            yield i - k + 1, i + k
+        for k in range(1, even[i] + 1):
+            yield i - k, i + k
+
+
+class PalindromeSpans:
+    """Random access view of the palindrome_spans sequence. A running total of palindromes per
+    centre lets the kth (start, end) be found by binary search, so a viewer can jump anywhere
+    in the list without generating the palindromes before it"""
+    def __init__(self, s, radii=None):
+        self.odd, self.even = radii or palindrome_radii(s)
+        self.ends = array("q", accumulate(map(operator.add, self.odd, self.even)))
+
+    def __len__(self):
+        return self.ends[-1] if self.ends else 0
+
+    @property
+    def nbytes(self):
+        return sys.getsizeof(self.odd) + sys.getsizeof(self.even) + sys.getsizeof(self.ends)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("palindrome index out of range")
+        i = bisect_right(self.ends, index)
+        k = index - (self.ends[i - 1] if i else 0) + 1
+        if k <= self.odd[i]:
+            return i - k + 1, i + k
+        k -= self.odd[i]
+        return i - k, i + k
+
+
+class Eertree:
+    """Palindromic tree of the distinct palindromes in a growing text, extended one character
+    at a time in amortised O(1). Nodes live in parallel array columns rather than objects.
+    Node 0 is the imaginary root of length -1 and node 1 the empty palindrome"""
+    __slots__ = ("text", "length", "link", "first_end", "suffix_counts", "edges", "last",
+                 "longest_node", "_occurrences")
+
+    """Edges are one dict keyed by node * CHARS + code point, cheaper than a dict per node"""
+    CHARS = 0x110000
+
+    def __init__(self, text=""):
+        self.text = array("I")
+        self.length = array("l", [-1, 0])
+        self.link = array("l", [0, 0])
+        self.first_end = array("l", [-1, -1])
+        """Times each node was the longest palindromic suffix, occurrences adds these up"""
+        self.suffix_counts = array("q", [0, 0])
+        self.edges = {}
+        self.last = 1
+        self.longest_node = 1
+        self._occurrences = None
+        self.extend(text)
+
+    def _suffix(self, node, i):
+        """Walks suffix links until node can be wrapped by text[i] on both sides"""
+        text, length, link = self.text, self.length, self.link
+        c = text[i]
+        while True:
+            j = i - length[node] - 1
+            if j >= 0 and text[j] == c:
+                return node
+            node = link[node]
+
+    def add(self, char):
+        c = ord(char)
+        i = len(self.text)
+        self.text.append(c)
+        parent = self._suffix(self.last, i)
+        key = parent * self.CHARS + c
+        node = self.edges.get(key)
+        if node is None:
+            node = len(self.length)
+            self.length.append(self.length[parent] + 2)
+            self.first_end.append(i)
+            self.suffix_counts.append(0)
+            if self.length[node] == 1:
+                self.link.append(1)
+            else:
+                self.link.append(self.edges[self._suffix(self.link[parent], i) * self.CHARS + c])
+            self.edges[key] = node
+            if self.length[node] > self.length[self.longest_node]:
+                self.longest_node = node
+        self.suffix_counts[node] += 1
+        self.last = node
+        self._occurrences = None
+
+    def extend(self, text):
+        for char in text:
+            self.add(char)
+
+    def occurrences(self):
+        """Occurrence count per node. A suffix link always points to an older node,
+        so one pass in reverse creation order pushes every count down its chain"""
+        if self._occurrences is None:
+            counts = array("q", self.suffix_counts)
+            link = self.link
+            for node in range(len(counts) - 1, 1, -1):
+                counts[link[node]] += counts[node]
+            self._occurrences = counts
+        return self._occurrences
+
+    def palindrome(self, node):
+        end = self.first_end[node]
+        return "".join(map(chr, self.text[end - self.length[node] + 1:end + 1]))
+
+    def distinct_count(self):
+        return len(self.length) - 2
+
+    @property
+    def nbytes(self):
+        """Memory held, the edge dict's int keys and values counted at 32 bytes each"""
+        columns = (self.text, self.length, self.link, self.first_end, self.suffix_counts, self._occurrences)
+        return sum(sys.getsizeof(column) for column in columns if column is not None) \
+            + sys.getsizeof(self.edges) + 64 * len(self.edges)
+
+    def total_count(self):
+        """Every occurrence counted, the same number count_palindromes gives"""
+        counts = self.occurrences()
+        return sum(counts) - counts[0] - counts[1]
+
+    def longest(self):
+        return self.palindrome(self.longest_node) if self.distinct_count() else ""
+
+    def frequency(self, palindrome):
+        """Occurrences of palindrome in the text, 0 if it never appears.
+        The path from a root spells out the right half of the palindrome"""
+        if not palindrome or palindrome != palindrome[::-1]:
+            return 0
+        node = 0 if len(palindrome) % 2 else 1
+        for char in palindrome[len(palindrome) // 2:]:
+            node = self.edges.get(node * self.CHARS + ord(char))
+            if node is None:
+                return 0
+        return self.occurrences()[node]
+
+    def most_common(self, top=None):
+        """(palindrome, occurrences) pairs, most frequent first"""
+        counts = self.occurrences()
+        nodes = range(2, len(counts))
+        if top is None:
+            ranked = sorted(nodes, key=counts.__getitem__, reverse=True)
+        else:
+            ranked = heapq.nlargest(top, nodes, key=counts.__getitem__)
+        return [(self.palindrome(node), counts[node]) for node in ranked]
+
+
+"""Every algorithm the app offers by short name, with its menu title and core entry point.
+The views in main.py and the command line in workshop.py are both keyed on these names"""
+ALGORITHMS = {
+    "rsa": ("RSA Encryption", RSAEngine),
+    "fibonacci": ("Fibonacci (DP)", fibonacci),
+    "sort": ("Sorting (Bubble/Selection)", sort_values),
+    "merge-sort": ("Merge Sort (Divide & Conquer)", merge_sort),
+    "shuffle": ("Shuffle Deck", ShuffleEngine),
+    "factorial": ("Factorial", FactorialEngine),
+    "stats": ("Statistics", summary_statistics),
+    "search": ("Search", SearchIndex),
+    "palindromes": ("Palindrome Counter", count_palindromes),
+}
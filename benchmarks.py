@@ -0,0 +1,453 @@
+"""Benchmarks for the algorithm engines, run with: python benchmarks.py <name>"""
+import argparse
+import bisect
+import csv
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from algorithms import (ALGORITHMS, RSAEngine, PrimeGenerator, SORT_ENGINES, sort_values, merge_sort,
+                        parallel_merge_sort, ShuffleEngine, np, fibonacci, FactorialEngine, summary_statistics,
+                        StreamingStatistics, count_palindromes, parse_file, convert_to_dataset, Dataset,
+                        SearchIndex, SEARCH_QUERIES)
+
+
+def per_char_rsa(message, e, d, n):
+    """The original RSAView path, one pow call per character each way"""
+    ciphertext = [pow(ord(char), e, n) for char in message]
+    return "".join(chr(pow(char, d, n)) for char in ciphertext)
+
+
+def bench_rsa():
+    """Bytes per second of the per-character path against the block engine"""
+    p, q = 991, 997
+    engine = RSAEngine(p, q)
+    print(f"Key n={engine.n} ({engine.n.bit_length()} bits), block size {engine.block_size} bytes")
+    print(f"{'size':>8} {'per-char B/s':>15} {'engine B/s':>15} {'speedup':>8}")
+
+    for size in (1_000, 100_000, 1_000_000):
+        message = "".join(random.choice("abcdefghijklmnopqrstuvwxyz ") for _ in range(size))
+        data = message.encode("utf-8")
+
+        start = time.perf_counter()
+        assert per_char_rsa(message, engine.e, engine.d, engine.n) == message
+        per_char = time.perf_counter() - start
+
+        start = time.perf_counter()
+        assert engine.decrypt_bytes(engine.encrypt_bytes(data)) == data
+        blocks = time.perf_counter() - start
+
+        print(f"{size:>8} {size / per_char:>15,.0f} {size / blocks:>15,.0f} {per_char / blocks:>7.1f}x")
+
+
+def bench_keygen():
+    """RSA key pair generation time per modulus size, serial and across all CPUs"""
+    worker_counts = sorted({1, os.cpu_count() or 1})
+    print(f"{'bits':>6} " + " ".join(f"{f'{w} worker(s) s':>15}" for w in worker_counts))
+
+    for bits in (512, 1024, 2048, 4096):
+        timings = []
+        for workers in worker_counts:
+            generator = PrimeGenerator(workers=workers)
+            start = time.perf_counter()
+            p, q = generator.generate_pair(bits)
+            timings.append(time.perf_counter() - start)
+            assert (p * q).bit_length() == bits
+        print(f"{bits:>6} " + " ".join(f"{t:>15.3f}" for t in timings))
+
+
+def bench_sort():
+    """Seconds per engine on random and duplicate heavy integers, quadratic engines only on small inputs"""
+    engines = ["auto"] + list(SORT_ENGINES)
+    print(f"{'n':>8} {'range':>10} " + " ".join(f"{name:>18}" for name in engines))
+
+    for n, value_range in ((2_000, 10**6), (100_000, 10**6), (100_000, 100), (1_000_000, 1000)):
+        values = [random.randint(0, value_range) for _ in range(n)]
+        cells = []
+        for name in engines:
+            if name in ("bubble", "early-exit bubble", "selection") and n > 2_000:
+                cells.append(f"{'-':>18}")
+                continue
+            start = time.perf_counter()
+            result, used = sort_values(values, name)
+            cells.append(f"{time.perf_counter() - start:>18.4f}")
+        print(f"{n:>8} {value_range:>10} " + " ".join(cells))
+
+
+def bench_parallel_sort(sizes=(1_000_000, 10_000_000, 50_000_000), worker_counts=(1, 2, 4, 8)):
+    """Parallel merge sort scaling, seconds and speedup over one worker"""
+    print(f"{'n':>10} " + " ".join(f"{f'{w} worker(s)':>16}" for w in worker_counts))
+
+    for n in sizes:
+        values = [random.randint(-2**62, 2**62) for _ in range(n)]
+        cells = []
+        serial = None
+        for workers in worker_counts:
+            start = time.perf_counter()
+            parallel_merge_sort(values, workers=workers)
+            duration = time.perf_counter() - start
+            serial = serial or duration
+            cells.append(f"{f'{duration:.2f}s {serial / duration:.1f}x':>16}")
+        print(f"{n:>10} " + " ".join(cells))
+
+
+def per_click_shuffle():
+    """The original DeckShuffle path, builds 52 strings then swaps with random.randint"""
+    suits = ['H', 'D', 'C', 'S']
+    values = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'Jack', 'Queen', 'King', 'Ace']
+    deck = [f"{v} {s}" for s in suits for v in values]
+    for i in range(len(deck) - 1, 0, -1):
+        j = random.randint(0, i)
+        deck[i], deck[j] = deck[j], deck[i]
+    return deck
+
+
+def bench_shuffle():
+    """Shuffles per second of the original path against the batch engine"""
+    print(f"NumPy {'available' if np is not None else 'not installed, pure Python batches'}")
+    print(f"{'decks':>10} {'per-click/s':>15} {'batch/s':>15} {'speedup':>8}")
+
+    engine = ShuffleEngine(seed=1)
+    for count in (10_000, 100_000, 1_000_000):
+        start = time.perf_counter()
+        for _ in range(min(count, 100_000)):
+            per_click_shuffle()
+        per_click = min(count, 100_000) / (time.perf_counter() - start)
+
+        start = time.perf_counter()
+        for done in range(0, count, 10_000):
+            engine.shuffle_batch(min(10_000, count - done))
+        batch = count / (time.perf_counter() - start)
+
+        print(f"{count:>10} {per_click:>15,.0f} {batch:>15,.0f} {batch / per_click:>7.1f}x")
+
+
+def bench_sketch(n=1_000_000):
+    """Streaming sketch accuracy against memory, with the exact selection path for reference.
+    Rank error is how far the reported value's rank is from the requested one, as a fraction of n"""
+    values = [int(random.gauss(0, 10_000)) for _ in range(n)]
+    ordered = sorted(values)
+    percentiles = (0.01, 0.25, 0.5, 0.75, 0.99)
+
+    def rank_error(value, percentile):
+        low, high = bisect.bisect_left(ordered, value), bisect.bisect_right(ordered, value)
+        target = percentile * (n - 1)
+        return 0 if low <= target <= high else min(abs(low - target), abs(high - target)) / n
+
+    start = time.perf_counter()
+    summary_statistics(values, percentiles)
+    print(f"exact: {n} values held, {time.perf_counter() - start:.3f}s")
+    print(f"{'error bound':>12} {'values held':>12} {'max rank error':>15} {'seconds':>8}")
+
+    for error in (0.05, 0.01, 0.005, 0.001):
+        start = time.perf_counter()
+        stream = StreamingStatistics(quantile_error=error, frequency_error=error)
+        stream.update(values)
+        summary = stream.summary(percentiles)
+        duration = time.perf_counter() - start
+        worst = max(rank_error(value, p) for p, value in summary["percentiles"].items())
+        print(f"{error:>12} {stream.retained():>12} {worst:>15.5f} {duration:>8.3f}")
+
+
+def dp_palindromes(s):
+    """The original PalindromeCounter.run_logic, an n x n table plus a copy of every palindrome"""
+    n = len(s)
+    memo = [[False] * n for _ in range(n)]
+    count = 0
+    palindromes_found = []
+    for i in range(n):
+        memo[i][i] = True
+        count += 1
+        palindromes_found.append(s[i])
+    for i in range(n - 1):
+        if s[i] == s[i + 1]:
+            memo[i][i + 1] = True
+            count += 1
+            palindromes_found.append(s[i:i + 2])
+    for k in range(3, n + 1):
+        for i in range(n - k + 1):
+            j = i + k - 1
+            if s[i] == s[j] and memo[i + 1][j - 1]:
+                memo[i][j] = True
+                count += 1
+                palindromes_found.append(s[i:j + 1])
+    return count
+
+
+def bench_palindromes(sizes=(1_000, 10_000, 1_000_000), dp_limit=10_000):
+    """Seconds for the n x n DP against Manacher's algorithm on random two letter strings.
+    The DP table needs about 8 * n^2 bytes, so it is skipped above dp_limit"""
+    print(f"{'n':>10} {'DP s':>10} {'Manacher s':>12} {'palindromes':>14}")
+    for n in sizes:
+        s = "".join(random.choice("ab") for _ in range(n))
+        dp_time = "skipped"
+        if n <= dp_limit:
+            start = time.perf_counter()
+            expected = dp_palindromes(s)
+            dp_time = f"{time.perf_counter() - start:.3f}"
+
+        start = time.perf_counter()
+        count = count_palindromes(s)
+        manacher_time = time.perf_counter() - start
+        if n <= dp_limit:
+            assert count == expected
+        print(f"{n:>10} {dp_time:>10} {manacher_time:>12.3f} {count:>14}")
+
+
+def linear_query(values, op, value, high=None):
+    """One query answered by scanning the whole list, what a search without an index costs"""
+    if op == "contains":
+        return value in values
+    if op == "first":
+        return values.index(value) if value in values else None
+    if op == "last":
+        return len(values) - 1 - values[::-1].index(value) if value in values else None
+    if op == "rank":
+        return sum(1 for v in values if v < value)
+    if op == "range":
+        return sum(1 for v in values if value <= v <= high)
+    return min(values, key=lambda v: (abs(v - value), v))
+
+
+def bench_search(sizes=(100_000, 1_000_000), queries=100_000, linear_queries=20):
+    """Queries per second of batched SearchIndex lookups against a linear scan per query,
+    on random integers with random queries. The scan is timed on linear_queries queries"""
+    print(f"{'n':>10} {'build s':>8} {'append 1k s':>12} {'query':>9} {'index q/s':>12} {'scan q/s':>10} {'speedup':>9}")
+    for n in sizes:
+        values = [random.randint(0, 10 * n) for _ in range(n)]
+        start = time.perf_counter()
+        index = SearchIndex(values)
+        build_time = time.perf_counter() - start
+        start = time.perf_counter()
+        index.append([random.randint(0, 10 * n) for _ in range(1_000)])
+        append_time = time.perf_counter() - start
+        values = index.values
+
+        for op, (method, arity) in SEARCH_QUERIES.items():
+            columns = [[random.randint(0, 10 * n) for _ in range(queries)]]
+            if arity == 2:
+                columns.append([low + 100 for low in columns[0]])
+            start = time.perf_counter()
+            answers = getattr(index, method)(*columns)
+            index_rate = queries / (time.perf_counter() - start)
+
+            start = time.perf_counter()
+            for row in zip(*(column[:linear_queries] for column in columns)):
+                expected = linear_query(values, op, *row)
+                assert expected == answers[columns[0].index(row[0])]
+            scan_rate = linear_queries / (time.perf_counter() - start)
+            print(f"{n:>10} {build_time:>8.3f} {append_time:>12.4f} {op:>9} {index_rate:>12,.0f} "
+                  f"{scan_rate:>10,.0f} {index_rate / scan_rate:>8,.0f}x")
+
+
+def bench_dataset(sizes=(1_000_000, 100_000_000), parse_limit=20_000_000):
+    """Load time of a comma separated text file against the memory mapped dataset made from it.
+    Parsing text into a list needs about 40 bytes per value, so it is skipped above parse_limit"""
+    print(f"{'n':>11} {'text MB':>8} {'parse s':>8} {'convert s':>10} {'open s':>8} {'tolist s':>9}")
+    with tempfile.TemporaryDirectory() as work_dir:
+        text_path = os.path.join(work_dir, "values.txt")
+        dataset_path = os.path.join(work_dir, "values.awds")
+        for n in sizes:
+            with open(text_path, "w") as out:
+                for done in range(0, n, 1_000_000):
+                    chunk = [random.randint(-2**62, 2**62) for _ in range(min(1_000_000, n - done))]
+                    out.write(("," if done else "") + ",".join(map(str, chunk)))
+
+            parse_time = "skipped"
+            if n <= parse_limit:
+                start = time.perf_counter()
+                parse_file(text_path)
+                parse_time = f"{time.perf_counter() - start:.3f}"
+
+            start = time.perf_counter()
+            convert_to_dataset(text_path, dataset_path)
+            convert_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            dataset = Dataset(dataset_path)
+            open_time = time.perf_counter() - start
+            assert len(dataset) == n
+
+            start = time.perf_counter()
+            values = dataset.tolist()
+            tolist_time = time.perf_counter() - start
+            del values, dataset
+
+            text_mb = os.path.getsize(text_path) / 1024 ** 2
+            print(f"{n:>11} {text_mb:>8.0f} {parse_time:>8} {convert_time:>10.3f} {open_time:>8.5f} {tolist_time:>9.3f}")
+
+
+DISTRIBUTIONS = ("random", "sorted", "reversed", "duplicates")
+
+
+def suite_numbers(n, distribution):
+    values = [random.randint(0, 16 if distribution == "duplicates" else 10 * n) for _ in range(n)]
+    if distribution == "sorted":
+        values.sort()
+    elif distribution == "reversed":
+        values.sort(reverse=True)
+    return values
+
+
+def suite_text(n, distribution):
+    """Runs of one letter are the palindrome heavy case, two letters the typical one"""
+    text = "".join(random.choice("ab" if distribution == "duplicates" else "abcdefghij") for _ in range(n))
+    if distribution == "sorted":
+        return "".join(sorted(text))
+    if distribution == "reversed":
+        return "".join(sorted(text, reverse=True))
+    return text
+
+
+_suite_rsa = []
+
+
+def suite_case(name, n, distribution):
+    """The call to time for one algorithm in ALGORITHMS, with its input built up front so
+    only the algorithm is measured. Returns None for distributions the algorithm ignores"""
+    if name in ("sort", "merge-sort", "stats"):
+        values = suite_numbers(n, distribution)
+        engine = {"sort": sort_values, "merge-sort": merge_sort, "stats": summary_statistics}[name]
+        return lambda: engine(values)
+    if name == "search":
+        """Index built up front, one batch of each single argument query is timed"""
+        index = SearchIndex(suite_numbers(n, distribution))
+        queries = suite_numbers(n, "random")
+        return lambda: [getattr(index, method)(queries) for method, arity in SEARCH_QUERIES.values() if arity == 1]
+    if name == "palindromes":
+        text = suite_text(n, distribution)
+        return lambda: count_palindromes(text)
+    if distribution != "random":
+        return None
+    if name == "rsa":
+        """One 1024 bit key for the whole run, n bytes encrypted and decrypted"""
+        if not _suite_rsa:
+            _suite_rsa.append(RSAEngine(*PrimeGenerator().generate_pair(1024)))
+        engine = _suite_rsa[0]
+        data = random.randbytes(n)
+        return lambda: engine.decrypt_bytes(engine.encrypt_bytes(data))
+    if name == "fibonacci":
+        return lambda: fibonacci(10 * n)
+    if name == "factorial":
+        """A fresh engine each call so the memo cannot answer the repeats"""
+        return lambda: FactorialEngine().factorial(n)
+    if name == "shuffle":
+        engine = ShuffleEngine(seed=1)
+        return lambda: engine.shuffle_batch(max(n // 100, 1))
+    raise KeyError(f"No benchmark case for {name}")
+
+
+def measure(func, warmup=1, repeats=5):
+    """Median and interquartile range of repeated wall clock times after warm-up runs.
+    Peak memory comes from one more run under tracemalloc, kept apart so tracing
+    does not slow the timed runs"""
+    for _ in range(warmup):
+        func()
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    q1, median, q3 = statistics.quantiles(times, n=4, method="inclusive")
+
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return median, q3 - q1, peak
+
+
+def bench_suite(sizes=(1_000, 100_000), repeats=5, warmup=1, json_path=None, csv_path=None,
+                baseline=None, threshold=0.25):
+    """Every algorithm in ALGORITHMS over each size and input distribution. Results can be
+    saved as JSON or CSV, and a saved JSON run used as a baseline fails the run when any
+    median is more than threshold slower"""
+    random.seed(1)
+    print(f"{'algorithm':>12} {'n':>8} {'distribution':>12} {'median s':>10} {'IQR s':>9} "
+          f"{'peak KB':>9} {'ops/s':>13}")
+    results = []
+    for name in ALGORITHMS:
+        for n in sizes:
+            for distribution in DISTRIBUTIONS:
+                func = suite_case(name, n, distribution)
+                if func is None:
+                    continue
+                median, iqr, peak = measure(func, warmup, max(repeats, 2))
+                results.append({"algorithm": name, "n": n, "distribution": distribution, "median": median,
+                                "iqr": iqr, "peak_bytes": peak, "ops_per_second": n / median})
+                print(f"{name:>12} {n:>8} {distribution:>12} {median:>10.5f} {iqr:>9.5f} "
+                      f"{peak / 1024:>9,.0f} {n / median:>13,.0f}")
+
+    if json_path:
+        with open(json_path, "w") as file:
+            json.dump(results, file, indent=1)
+    if csv_path:
+        with open(csv_path, "w", newline="") as file:
+            writer = csv.DictWriter(file, fieldnames=list(results[0]))
+            writer.writeheader()
+            writer.writerows(results)
+    if baseline:
+        compare_baseline(results, baseline, threshold)
+
+
+"""Medians under a millisecond swing by more than any useful threshold, so they never fail a run"""
+NOISE_FLOOR = 0.001
+
+
+def compare_baseline(results, path, threshold):
+    """Exits with status 1 when a case is slower than its baseline median by more than threshold"""
+    with open(path) as file:
+        expected = {(r["algorithm"], r["n"], r["distribution"]): r["median"] for r in json.load(file)}
+    regressions = []
+    for result in results:
+        before = expected.get((result["algorithm"], result["n"], result["distribution"]))
+        if before and before >= NOISE_FLOOR and result["median"] > before * (1 + threshold):
+            regressions.append(f"{result['algorithm']} n={result['n']} {result['distribution']}: "
+                               f"{before:.5f}s -> {result['median']:.5f}s")
+    if regressions:
+        print(f"{len(regressions)} regression(s) beyond {threshold:.0%}:\n  " + "\n  ".join(regressions))
+        sys.exit(1)
+    print(f"No regressions beyond {threshold:.0%} against {path}")
+
+
+BENCHMARKS = {
+    "rsa": bench_rsa,
+    "keygen": bench_keygen,
+    "sort": bench_sort,
+    "parallel-sort": bench_parallel_sort,
+    "shuffle": bench_shuffle,
+    "sketch": bench_sketch,
+    "palindromes": bench_palindromes,
+    "search": bench_search,
+    "dataset": bench_dataset,
+    "suite": bench_suite,
+}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Algorithm Workshop benchmarks")
+    parser.add_argument("names", nargs="*", help=f"benchmarks to run from {', '.join(BENCHMARKS)}, default all")
+    suite = parser.add_argument_group("suite options")
+    suite.add_argument("--sizes", type=lambda text: [int(n) for n in text.split(",")], default=[1_000, 100_000])
+    suite.add_argument("--repeats", type=int, default=5)
+    suite.add_argument("--warmup", type=int, default=1)
+    suite.add_argument("--json", help="save results as JSON, usable as a later baseline")
+    suite.add_argument("--csv", help="save results as CSV")
+    suite.add_argument("--baseline", help="JSON results to compare against")
+    suite.add_argument("--threshold", type=float, default=0.25, help="slowdown that fails the run, 0.25 is 25%%")
+    args = parser.parse_args()
+    for name in args.names:
+        if name not in BENCHMARKS:
+            parser.error(f"unknown benchmark {name}")
+
+    for name in args.names or BENCHMARKS:
+        print(f"== {name} ==")
+        if name == "suite":
+            bench_suite(args.sizes, args.repeats, args.warmup, args.json, args.csv, args.baseline, args.threshold)
+        else:
+            BENCHMARKS[name]()
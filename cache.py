@@ -0,0 +1,185 @@
+"""Shared memo of algorithm results, keyed on the algorithm, its parameters and a hash of the input.
+Held in memory under a byte budget, slow results can also be kept on disk between sessions"""
+import hashlib
+import os
+import pickle
+import sys
+import tempfile
+import threading
+from array import array
+from collections import OrderedDict
+from itertools import islice
+
+MISSING = object()
+
+
+def hash_input(value, hasher):
+    """Feeds value to hasher. Bytes, text and int64 lists are hashed in C, anything else is pickled.
+    Unlike the history digest every item is read, a cache key must tell any two inputs apart"""
+    if hasattr(value, "fingerprint"):
+        """Datasets name their file and its modification time instead of being read"""
+        hasher.update(b"dataset" + value.fingerprint())
+    elif isinstance(value, (bytes, bytearray, array)):
+        hasher.update(type(value).__name__.encode() + len(value).to_bytes(8, "little"))
+        hasher.update(value)
+    elif isinstance(value, str):
+        hasher.update(b"str" + len(value).to_bytes(8, "little"))
+        hasher.update(value.encode("utf-8", "surrogatepass"))
+    elif isinstance(value, list) and value and type(value[0]) is int:
+        try:
+            packed = array("q", value)
+        except (TypeError, OverflowError):
+            packed = None
+        if packed is not None:
+            hasher.update(b"int list" + len(value).to_bytes(8, "little"))
+            hasher.update(packed)
+            return
+        hasher.update(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    else:
+        hasher.update(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def size_of(value):
+    """Rough bytes held by a result. Long sequences and dicts are sized from their first 100
+    items, objects that know their size report it as nbytes"""
+    nbytes = getattr(value, "nbytes", None)
+    if isinstance(nbytes, int):
+        return nbytes
+    size = sys.getsizeof(value)
+    if isinstance(value, (list, tuple)):
+        head = value[:100]
+        if head:
+            size += sum(size_of(item) for item in head) * len(value) // len(head)
+    elif isinstance(value, dict):
+        head = list(islice(value.items(), 100))
+        if head:
+            size += sum(size_of(key) + size_of(item) for key, item in head) * len(value) // len(head)
+    return size
+
+
+class ResultCache:
+    """LRU of results bounded by max_bytes rather than entry count. Results that took at least
+    disk_seconds to compute are also pickled to disk_dir when it is set, that tier is trimmed
+    oldest first to max_disk_bytes. Cached values are shared, callers must not mutate them"""
+    def __init__(self, max_bytes=64 * 1024 * 1024, disk_dir=None, max_disk_bytes=1024 ** 3, disk_seconds=1.0):
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        self.max_disk_bytes = max_disk_bytes
+        self.disk_seconds = disk_seconds
+        self.entries = OrderedDict()
+        self.bytes = 0
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def use_disk(self, directory, max_disk_bytes=None):
+        os.makedirs(directory, exist_ok=True)
+        self.disk_dir = directory
+        if max_disk_bytes is not None:
+            self.max_disk_bytes = max_disk_bytes
+
+    @staticmethod
+    def key(algorithm, *inputs, **parameters):
+        hasher = hashlib.blake2b(digest_size=20)
+        hasher.update(algorithm.encode() + b"\0" + repr(sorted(parameters.items())).encode())
+        for value in inputs:
+            hash_input(value, hasher)
+        return hasher.hexdigest()
+
+    def get(self, key):
+        """The cached result or MISSING, a disk hit is moved back into memory"""
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+        value = self._read_disk(key)
+        with self.lock:
+            if value is MISSING:
+                self.misses += 1
+                return MISSING
+            self.disk_hits += 1
+            self._store(key, value)
+        return value
+
+    def put(self, key, value, seconds=None):
+        """seconds is how long the result took, slow ones also go to the disk tier"""
+        with self.lock:
+            self._store(key, value)
+        if self.disk_dir is not None and seconds is not None and seconds >= self.disk_seconds:
+            self._write_disk(key, value)
+
+    def _store(self, key, value):
+        size = size_of(value)
+        if size > self.max_bytes:
+            return
+        old = self.entries.pop(key, None)
+        if old is not None:
+            self.bytes -= old[1]
+        self.entries[key] = (value, size)
+        self.bytes += size
+        while self.bytes > self.max_bytes:
+            _, (_, evicted) = self.entries.popitem(last=False)
+            self.bytes -= evicted
+            self.evictions += 1
+
+    def _path(self, key):
+        return os.path.join(self.disk_dir, f"{key}.pickle")
+
+    def _read_disk(self, key):
+        if self.disk_dir is None:
+            return MISSING
+        try:
+            with open(self._path(key), "rb") as file:
+                value = pickle.load(file)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return MISSING
+        os.utime(self._path(key))
+        return value
+
+    def _write_disk(self, key, value):
+        """Written to a temporary file first so a crash never leaves half a pickle behind"""
+        try:
+            with tempfile.NamedTemporaryFile("wb", dir=self.disk_dir, delete=False, suffix=".tmp") as file:
+                pickle.dump(value, file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(file.name, self._path(key))
+            self._trim_disk()
+        except (OSError, pickle.PicklingError) as error:
+            print(f"Error: result not cached on disk: {error}")
+
+    def _trim_disk(self):
+        files = []
+        for entry in os.scandir(self.disk_dir):
+            if entry.name.endswith(".pickle"):
+                stat = entry.stat()
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.max_disk_bytes:
+                break
+            os.remove(path)
+            total -= size
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.bytes = 0
+
+    def stats(self):
+        with self.lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                "entries": len(self.entries),
+                "bytes": self.bytes,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+            }
+
+
+RESULTS = ResultCache()
@@ -0,0 +1,170 @@
+"""Run history kept as structured records, recent ones in memory and all of them in SQLite.
+Written by a background thread in batches so logging a run never waits on the disk"""
+import hashlib
+import json
+import queue
+import sqlite3
+import threading
+import time
+from array import array
+from collections import deque
+from itertools import islice
+
+SCHEMA = (
+    """CREATE TABLE IF NOT EXISTS history (
+        id INTEGER PRIMARY KEY,
+        time REAL NOT NULL,
+        algorithm TEXT NOT NULL,
+        details TEXT,
+        parameters TEXT,
+        input_size INTEGER,
+        duration REAL,
+        digest TEXT,
+        preview TEXT
+    )""",
+    "CREATE INDEX IF NOT EXISTS history_algorithm_time ON history (algorithm, time)",
+    "CREATE INDEX IF NOT EXISTS history_time ON history (time)",
+)
+COLUMNS = ("time", "algorithm", "details", "parameters", "input_size", "duration", "digest", "preview")
+
+
+def preview(value, limit=80):
+    """Short text for a result of any size, only the first items of a sequence are formatted"""
+    if value is None:
+        return None
+    if isinstance(value, (bytes, bytearray)):
+        text = value[:limit // 2].hex()
+        return text + f"... ({len(value)} bytes)" if len(value) > limit // 2 else text
+    if isinstance(value, str):
+        return value[:limit] + f"... ({len(value)} chars)" if len(value) > limit else value
+    if isinstance(value, (list, tuple, array, range)):
+        head = list(islice(value, 10))
+        text = ", ".join(map(str, head))[:limit]
+        return text + f", ... ({len(value)} items)" if len(value) > len(head) else text
+    text = str(value) if not isinstance(value, int) or value.bit_length() < 4 * limit else f"{value.bit_length()} bit int"
+    return text[:limit]
+
+
+"""Longest run of items a digest reads, longer results are sampled at an even stride"""
+DIGEST_ITEMS = 1 << 16
+
+
+def digest(value):
+    """BLAKE2 fingerprint of a result so runs can be compared without storing it. Large results
+    are hashed from an evenly strided sample plus their length so the cost stays bounded"""
+    if value is None:
+        return None
+    if isinstance(value, (str, bytes, bytearray, list, tuple, array)):
+        length = len(value)
+        value = value[::-(-length // DIGEST_ITEMS)] if length > DIGEST_ITEMS else value
+    if isinstance(value, str):
+        data = value.encode("utf-8", "surrogatepass") + f"/{length}".encode()
+    elif isinstance(value, (bytes, bytearray, array)):
+        data = bytes(value) + f"/{length}".encode()
+    elif isinstance(value, (list, tuple)):
+        try:
+            data = array("q", value).tobytes() + f"/{length}".encode()
+        except (TypeError, OverflowError):
+            data = preview(value).encode()
+    elif isinstance(value, int):
+        data = value.to_bytes((value.bit_length() + 8) // 8, "little", signed=True)
+    else:
+        data = preview(value).encode()
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+class HistoryStore:
+    """Ring buffer of the last memory_size records plus an optional SQLite file.
+    add only appends to the buffer and a queue, a writer thread commits the queue
+    batch_size records at a time or every flush_interval seconds"""
+    def __init__(self, path=None, memory_size=100, batch_size=64, flush_interval=1.0):
+        self.path = path
+        self.records = deque(maxlen=memory_size)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.pending = queue.Queue()
+        self.writer = None
+        if path is not None:
+            with sqlite3.connect(path) as connection:
+                for statement in SCHEMA:
+                    connection.execute(statement)
+            self.writer = threading.Thread(target=self._write, name="history-writer", daemon=True)
+            self.writer.start()
+
+    def add(self, algorithm, details="", parameters=None, input_size=None, duration=None, result=None):
+        """parameters is a dict of small values, result is summarised and hashed, never stored"""
+        record = {
+            "time": time.time(),
+            "algorithm": algorithm,
+            "details": details[:200] if details else details,
+            "parameters": json.dumps({key: value if isinstance(value, (bool, float)) or value is None
+                                      or isinstance(value, int) and value.bit_length() < 64
+                                      else preview(value) for key, value in parameters.items()}) if parameters else None,
+            "input_size": input_size,
+            "duration": duration,
+            "digest": digest(result),
+            "preview": preview(result),
+        }
+        self.records.append(record)
+        if self.writer is not None:
+            self.pending.put(record)
+        return record
+
+    def recent(self, count=None):
+        """Newest last, from memory"""
+        records = list(self.records)
+        return records if count is None else records[-count:]
+
+    def query(self, algorithm=None, since=None, until=None, limit=100):
+        """Newest first from SQLite, by algorithm and time range (unix seconds).
+        Waits for pending writes so a record added just before is included"""
+        if self.path is None:
+            return [r for r in reversed(self.records) if (algorithm is None or r["algorithm"] == algorithm)
+                    and (since is None or r["time"] >= since) and (until is None or r["time"] < until)][:limit]
+        self.flush()
+        clauses, values = [], []
+        for clause, value in (("algorithm = ?", algorithm), ("time >= ?", since), ("time < ?", until)):
+            if value is not None:
+                clauses.append(clause)
+                values.append(value)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        with sqlite3.connect(self.path) as connection:
+            rows = connection.execute(f"SELECT {', '.join(COLUMNS)} FROM history{where} "
+                                      f"ORDER BY time DESC LIMIT ?", (*values, limit)).fetchall()
+        return [dict(zip(COLUMNS, row)) for row in rows]
+
+    def flush(self):
+        if self.writer is not None:
+            self.pending.join()
+
+    def close(self):
+        """Writes whatever is pending and stops the writer"""
+        if self.writer is not None:
+            self.pending.put(None)
+            self.writer.join()
+            self.writer = None
+
+    def _write(self):
+        connection = sqlite3.connect(self.path)
+        insert = f"INSERT INTO history ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})"
+        running = True
+        while running:
+            """Collects until the batch is full or flush_interval has passed since its first record"""
+            batch = [self.pending.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while batch[-1] is not None and len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    batch.append(self.pending.get(timeout=remaining) if remaining > 0 else self.pending.get_nowait())
+                except queue.Empty:
+                    break
+            running = batch[-1] is not None
+            records = [record for record in batch if record is not None]
+            try:
+                with connection:
+                    connection.executemany(insert, [tuple(r[c] for c in COLUMNS) for r in records])
+            except sqlite3.Error as error:
+                print(f"Error: history batch of {len(records)} not saved: {error}")
+            for _ in batch:
+                self.pending.task_done()
+        connection.close()
@@ -1,9 +1,27 @@
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog
 import time
 import random
 from abc import ABC, abstractmethod
 from datetime import datetime
+from itertools import islice
+from math import log10
+import os
+import sys
+import threading
+import queue
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+from algorithms import (RSAEngine, PrimeGenerator, is_probable_prime, fibonacci, lift_digit_limit,
+                        SORT_ENGINES, sort_values, merge_sort, parallel_merge_sort, PARALLEL_THRESHOLD,
+                        ExternalSorter, ShuffleEngine, format_deck, card_name, simulate_shuffles, DECK_SIZE,
+                        FactorialEngine, recursive_factorial, summary_statistics, StreamingStatistics,
+                        read_numbers, parse_numbers, parse_file, is_dataset, Dataset, palindrome_radii, count_palindromes, PalindromeSpans, Eertree,
+                        SearchIndex, SEARCH_QUERIES, parse_queries, ALGORITHMS)
+from metrics import METRICS, TimeTracker, measure, measured_call
+from history import HistoryStore
+from cache import RESULTS, MISSING, size_of
 
 
 class MainWindow:
@@ -13,70 +31,164 @@ class MainWindow:
         self.root.title("Algorithm Workshop")
         self.root.geometry("600x500")
 
+        """Shared by every view so long running algorithms never block the mainloop"""
+        self.scheduler = JobScheduler(self.root)
+        JobStatusBar(self.root, self.scheduler).pack(side="bottom", fill="x")
+        self.root.protocol("WM_DELETE_WINDOW", self.close)
+
         self.container = tk.Frame(self.root)
         self.container.pack(fill="both", expand=True)
+        self.views = ViewCache(self.container)
 
         self.show_main_menu()
 
-    """Clears the window"""
-    def clear_window(self):
-        for widget in self.container.winfo_children():
-            widget.destroy()
+    def close(self):
+        self.scheduler.shutdown()
+        AlgorithmHistory.close()
+        self.root.destroy()
 
     def show_main_menu(self):
+        """The menu is built once and pinned, going back only raises it and refreshes the history"""
+        self.views.show("menu", self.build_main_menu, pinned=True)
+
+    def build_main_menu(self, frame):
         """Creates the main menu, this code is similar across all classes"""
-        self.clear_window()
-
-        tk.Label(self.container, text="Algorithm Toolset", font=("Arial", 18, "bold")).pack(pady=10)
-
-        self.algorithm_choice = ttk.Combobox(self.container, values=[
-            "RSA Encryption",
-            "Fibonacci (DP)",
-            "Sorting (Bubble/Selection)",
-            "Merge Sort (Divide & Conquer)",
-            "Shuffle Deck",
-            "Factorial",
-            "Search",
-            "Palindrome Counter"
+        tk.Label(frame, text="Algorithm Toolset", font=("Arial", 18, "bold")).pack(pady=10)
+
+        self.algorithm_choice = ttk.Combobox(frame, values=[
+            title for title, engine in ALGORITHMS.values()
         ], width=40)
         self.algorithm_choice.pack(pady=10)
 
-        tk.Frame(self.container, height=2, bd=1, relief="sunken").pack(fill="x", pady=20)
-        tk.Label(self.container, text="Global History (Last 5 Runs)", font=("Arial", 10, "bold")).pack()
+        tk.Frame(frame, height=2, bd=1, relief="sunken").pack(fill="x", pady=20)
+        tk.Label(frame, text="Global History (Last 5 Runs)", font=("Arial", 10, "bold")).pack()
+        self.history_label = tk.Label(frame, text="", font=("Courier", 9), anchor="w", justify="left")
+        self.history_label.pack(fill="x")
+
+        self.run_btn = tk.Button(frame, text="Select", command=self.handle_execution, bg="green", fg="white")
+        self.run_btn.pack(pady=20)
+        tk.Button(frame, text="Metrics Dashboard", command=self.show_metrics).pack()
+        return self
 
+    def shown(self):
         """Calls the history function to list previous algorithms"""
         history_list = AlgorithmHistory.get_history()
 
         if not history_list:
-            tk.Label(self.container, text="No algorithms run yet.", fg="gray").pack()
+            self.history_label.config(text="No algorithms run yet.", fg="gray")
         else:
-            for entry in reversed(history_list):
-                tk.Label(self.container, text=entry, font=("Courier", 9), anchor="w").pack(fill="x")
+            self.history_label.config(text="\n".join(reversed(history_list)), fg="black")
 
-        self.run_btn = tk.Button(self.container, text="Select", command=self.handle_execution, bg="green", fg="white")
-        self.run_btn.pack(pady=20)
+    def show_metrics(self):
+        self.views.show("metrics", lambda frame: MetricsDashboard(frame, self.show_main_menu, self.scheduler))
 
     """Calls design pattern to direct user traffic"""
     def handle_execution(self):
         choice = self.algorithm_choice.get()
+        name = AlgorithmSelector.name_of(choice)
 
-        view = AlgorithmSelector.create_view(
-            choice,
-            self.container,
-            self.show_main_menu
-        )
+        view = name and self.views.show(name, lambda frame: AlgorithmSelector.create_view(
+            name,
+            frame,
+            self.show_main_menu,
+            self.scheduler
+        ))
 
         if not view:
             print(f"Error: Logic for {choice} not found.")
 
 
+class ViewCache:
+    """Views are built the first time they are shown, each in its own frame stacked in one grid
+    cell of container. Switching raises the cached frame instead of rebuilding it, so inputs and
+    results survive a trip back to the menu. Past max_views, or max_bytes of results held by the
+    views, the least recently shown one is destroyed. Pinned views such as the menu are kept"""
+    """Every switch, including the redraw and any eviction, is recorded as a "view <name>"
+    metric, its "over target" counter on the dashboard counts those slower than this"""
+    SWITCH_TARGET = 0.05
+
+    def __init__(self, container, max_views=6, max_bytes=256 * 1024 * 1024):
+        self.container = container
+        self.container.grid_rowconfigure(0, weight=1)
+        self.container.grid_columnconfigure(0, weight=1)
+        self.max_views = max_views
+        self.max_bytes = max_bytes
+        """name -> (frame, view), least recently shown first"""
+        self.views = OrderedDict()
+        self.pinned = set()
+        self.current = None
+        self.evictions = 0
+
+    def show(self, name, build, pinned=False):
+        """build(frame) creates the view on a miss, returning None if there is none.
+        Views may define shown() and hidden(), called as they are raised and covered"""
+        result, sample = measure(self._switch, (name, build, pinned))
+        if sample["error"] is not None:
+            raise sample["error"]
+        if result is None:
+            return None
+        sample["counters"]["over target"] = int(sample["wall"] > self.SWITCH_TARGET)
+        METRICS.record(f"view {name}", sample)
+        return result
+
+    def _switch(self, name, build, pinned):
+        entry = self.views.get(name)
+        if entry is None:
+            frame = tk.Frame(self.container)
+            view = build(frame)
+            if view is None:
+                frame.destroy()
+                return None
+            frame.grid(row=0, column=0, sticky="nsew")
+            entry = self.views[name] = (frame, view)
+            if pinned:
+                self.pinned.add(name)
+        self.views.move_to_end(name)
+
+        previous = self.views.get(self.current)
+        if previous is not None and self.current != name and hasattr(previous[1], "hidden"):
+            previous[1].hidden()
+        self.current = name
+        frame, view = entry
+        frame.tkraise()
+        if hasattr(view, "shown"):
+            view.shown()
+        self.trim()
+        self.container.update_idletasks()
+        return view
+
+    @staticmethod
+    def footprint(view):
+        """Bytes of results a view holds. Nothing is measured here, views and their
+        ResultViewer and NumberInput widgets update nbytes when their results change"""
+        widgets = (value.nbytes for value in vars(view).values() if isinstance(value, (ResultViewer, NumberInput)))
+        return getattr(view, "nbytes", 0) + sum(widgets)
+
+    def trim(self):
+        """Evicts least recently shown first, never the current or a pinned view"""
+        sizes = {name: self.footprint(view) for name, (frame, view) in self.views.items()}
+        while len(self.views) > self.max_views or sum(sizes.values()) > self.max_bytes:
+            name = next((name for name in self.views if name not in self.pinned and name != self.current), None)
+            if name is None:
+                break
+            self.evict(name)
+            del sizes[name]
+
+    def evict(self, name):
+        """Running jobs of the view finish normally, their callbacks skip the destroyed widgets"""
+        frame, view = self.views.pop(name)
+        if hasattr(view, "hidden"):
+            view.hidden()
+        frame.destroy()
+        self.evictions += 1
+
+
 class RSAView:
     """RSA Encryption for Requirement 1"""
-    def __init__(self, parent, back_callback):
+    def __init__(self, parent, back_callback, scheduler):
         """Creates RSA Encryption GUI"""
         self.parent = parent
-        for widget in self.parent.winfo_children():
-            widget.destroy()
+        self.scheduler = scheduler
 
         tk.Label(self.parent, text="RSA Encryption Module", font=("Arial", 18, "bold")).pack(pady=10)
 
@@ -88,24 +200,24 @@ class RSAView:
         self.user_key = tk.Entry(self.parent, width=50)
         self.user_key.pack(pady=5)
 
+        tk.Label(self.parent, text="Random key size:").pack(pady=5)
+        self.key_size = ttk.Combobox(self.parent, values=["Toy (17-1000)", "512", "1024", "2048", "4096"])
+        self.key_size.current(0)
+        self.key_size.pack(pady=5)
 
         tk.Button(self.parent, text="Encrypt", command=self.get_Keys).pack(pady=5)
 
         self.cipherText_label = tk.Label(self.parent,text="Encrypted text: ")
         self.cipherText_label.pack(pady=5)
+        self.cipher_viewer = ResultViewer(self.parent, scheduler, rows=3)
         self.plainText_label = tk.Label(self.parent,text="Decrypted text: ")
         self.plainText_label.pack(pady=5)
 
         tk.Button(self.parent, text="Back to Menu", command=back_callback).pack(pady=20)
 
     def is_prime(self, n):
-        """Checks if n is prime"""
-        if n < 2:
-            return False
-        for i in range(2, int(n ** 0.5) + 1):
-            if n % i == 0:
-                return False
-        return True
+        """Checks if n is prime using Miller-Rabin"""
+        return is_probable_prime(n)
 
     def generate_keys(self, start, end):
         """Generates random keys when the user enters none"""
@@ -121,56 +233,75 @@ class RSAView:
         user_key_text = self.user_key.get()
 
         """Checks if user key is random or selected (and valid)"""
-        if user_key_text == "":
-            primes = self.generate_keys(10, 1000)
-            self.p, self.q = primes[0], primes[1]
+        if user_key_text == "" and self.key_size.get().isdigit():
+            """Large keys take seconds to find, so they are generated in a worker process"""
+            bits = int(self.key_size.get())
+            self.scheduler.run_in_process(f"RSA {bits} bit keys", PrimeGenerator().generate_pair, bits,
+                                          on_done=self.use_keys, metric="rsa")
+            return
+        elif user_key_text == "":
+            """Smallest primes are 17 and 19 so the modulus can hold a whole byte"""
+            primes = self.generate_keys(17, 1000)
         else:
             try:
-                keys = list(map(int, user_key_text.split(',')))
-                self.p, self.q = keys[0], keys[1]
-                if not self.is_prime(self.p) or not self.is_prime(self.q):
+                primes = list(map(int, user_key_text.split(',')))
+                """Primes that already built an engine skip the primality tests"""
+                engine = RESULTS.get(RESULTS.key("rsa", primes[0], primes[1]))
+                if engine is not MISSING:
+                    self.use_engine(engine)
+                    return
+                if not self.is_prime(primes[0]) or not self.is_prime(primes[1]):
                     messagebox.showerror("Error", "Please enter two prime numbers")
                     return
             except:
                 messagebox.showerror("Error", "Format must be: prime, prime")
                 return
+        self.use_keys(primes)
 
-        """Calculates values for RSA Encryption"""
-        self.n = self.p * self.q
-        self.r = (self.p - 1) * (self.q - 1)
+    def use_keys(self, primes):
+        self.p, self.q = primes[0], primes[1]
 
-        self.e = 65537
-        """Ensures e and r are nor co-primes"""
-        if self.r <= self.e: self.e = 3
+        """Calculates values for RSA Encryption, the engine raises ValueError
+        when the primes are equal or the modulus cannot hold a byte"""
         try:
-            self.d = pow(self.e, -1, self.r)
-            self.process_rsa()
-        except ValueError:
-            messagebox.showerror("Error", "e and r are not coprime. Try different primes.")
+            engine = RSAEngine(self.p, self.q)
+        except ValueError as error:
+            messagebox.showerror("Error", f"{error}. Try different primes.")
+            return
+        """Kept in memory only, fresh random keys are never read back from the cache"""
+        RESULTS.put(RESULTS.key("rsa", self.p, self.q), engine)
+        self.use_engine(engine)
+
+    def use_engine(self, engine):
+        self.engine = engine
+        self.p, self.q = engine.p, engine.q
+        self.n, self.e, self.d = self.engine.n, self.engine.e, self.engine.d
+        self.process_rsa()
 
     def process_rsa(self):
         message = self.user_input.get()
         if not message: return
 
-        """Runs the RSA Encryption Algorithm"""
-        self.ciphertext = [pow(ord(char), self.e, self.n) for char in message]
-        self.cipherText_label.config(text=f"Encrypted text: {self.ciphertext}")
+        """Runs the RSA Encryption Algorithm on blocks of UTF-8 bytes"""
+        self.ciphertext = self.engine.encrypt_bytes(message.encode("utf-8"))
+        self.cipherText_label.config(text=f"Encrypted text ({len(self.ciphertext)} bytes, hex):")
+        self.cipher_viewer.show(TextRows(self.ciphertext.hex(), 2 * self.engine.cipher_block_size))
 
         """Runs the RSA Decryption Algorithm"""
-        decrypted_chars = [chr(pow(char, self.d, self.n)) for char in self.ciphertext]
-        self.message = "".join(decrypted_chars)
+        self.message = self.engine.decrypt_bytes(self.ciphertext).decode("utf-8")
         self.plainText_label.config(text=f"Decrypted text: {self.message}")
 
         """Adds to the history"""
-        AlgorithmHistory.add_entry("RSA", f"Encrypted: '{self.message} to {self.ciphertext}'")
+        AlgorithmHistory.add_entry("rsa", f"Encrypted a message with a {self.engine.n.bit_length()} bit key",
+                                   parameters={"bits": self.engine.n.bit_length()},
+                                   input_size=len(message.encode("utf-8")), result=self.ciphertext)
 
 
 class FibonacciAlgorithm:
     """Fibonacci Algorithm for Requirement 2"""
-    def __init__(self, parent, back_callback):
+    def __init__(self, parent, back_callback, scheduler):
         self.parent = parent
-        for widget in self.parent.winfo_children():
-            widget.destroy()
+        self.scheduler = scheduler
 
         tk.Label(self.parent, text="Fibonacci", font=("Arial", 18, "bold")).pack(pady=10)
 
@@ -178,52 +309,78 @@ class FibonacciAlgorithm:
         self.user_input = tk.Entry(self.parent)
         self.user_input.pack(pady=5)
 
-        tk.Button(self.parent, text="Calculate", command=self.solve).pack(pady=5)
+        tk.Label(self.parent, text="Modulus (optional)").pack(pady=5)
+        self.user_mod = tk.Entry(self.parent)
+        self.user_mod.pack(pady=5)
 
-        self.result_label = tk.Label(self.parent, text="Result: ", font=("Arial", 12))
-        self.result_label.pack(pady=20)
+        tk.Button(self.parent, text="Calculate", command=self.solve).pack(pady=5)
+        tk.Button(self.parent, text="Show Sequence", command=self.show_sequence).pack(pady=5)
 
+        self.result_label = tk.Label(self.parent, text="Result: ", font=("Arial", 12), wraplength=550)
+        self.result_label.pack(pady=10)
+        self.viewer = ResultViewer(self.parent, scheduler)
 
-        tk.Button(self.parent, text="Back to Menu", command=back_callback).pack(pady=20)
+        tk.Button(self.parent, text="Back to Menu", command=back_callback).pack(pady=10)
 
+    def read_input(self):
+        """Reads n and the optional modulus, returns None if they are invalid"""
+        try:
+            n = int(self.user_input.get().strip())
+            mod = int(self.user_mod.get().strip()) if self.user_mod.get().strip() else None
+        except ValueError:
+            self.result_label.config(text="Error: Invalid Input")
+            return None
+        if n < 0 or (mod is not None and mod < 1):
+            self.result_label.config(text="Error: Invalid Input")
+            return None
+        return n, mod
 
     def solve(self):
-        """Checks the value is entered correctly"""
-        if self.user_input.get != '': n = int(self.user_input.get().strip())
-        if n < 0:
-            return "Invalid Input"
-        if n == 0:
-            return 0
-        if n == 1:
-            return 1
-
-        """Creates the table to solve the Fibonacci Algorithm using dynamic programming"""
-        fib_table = [0] * (n + 1)
-        fib_table[0] = 0
-        fib_table[1] = 1
-
-        """Fills in the table and returns the result"""
-        for i in range(2, n + 1):
-            fib_table[i] = fib_table[i - 1] + fib_table[i - 2]
-        result = fib_table[n]
+        """Calculates F(n) (mod m) by fast doubling"""
+        values = self.read_input()
+        if values is None: return
+        n, mod = values
+
+        self.result_label.config(text="Calculating...")
+        self.scheduler.run_in_process(f"Fibonacci F({n})", FibonacciAlgorithm.calculate, n, mod,
+                                      on_done=lambda digits: self.show_result(n, digits), metric="fibonacci",
+                                      cache_key=RESULTS.key("fibonacci", n, mod=mod, digits=True))
+
+    @staticmethod
+    def calculate(n, mod):
+        """Runs in a worker process, converting F(n) to text takes longer than finding it
+        for large n so it is done there rather than on the Tk thread"""
+        return str(fibonacci(n, mod))
 
+    def show_result(self, n, digits):
         """Adds to history log"""
-        AlgorithmHistory.add_entry("Fibonacci", f"Calculated sequence up to {self.user_input.get()}")
-        self.result_label.config(text=f"Result: {result}")
+        AlgorithmHistory.add_entry("fibonacci", f"Calculated F({n})", parameters={"n": n},
+                                   duration=self.scheduler.elapsed(), result=digits)
+        self.result_label.config(text=f"Result: F({n}) has {len(digits)} digits")
+        self.viewer.show(TextRows(digits, 60), title="Digits")
+
+    def show_sequence(self):
+        """Only the terms on screen are generated"""
+        values = self.read_input()
+        if values is None: return
+        n, mod = values
+
+        self.result_label.config(text=f"Sequence F(0) to F({n})")
+        self.viewer.show(FibonacciRows(n + 1, mod), FibonacciRows.describe, title="Terms")
+
+        AlgorithmHistory.add_entry("fibonacci", f"Listed sequence up to {n}", parameters={"n": n})
 
 
 class SortingAlgorithm:
     """Sorting algorithms for Requirement 3"""
-    def __init__(self, parent, back_callback):
+    def __init__(self, parent, back_callback, scheduler):
         self.parent = parent
-        for widget in self.parent.winfo_children():
-            widget.destroy()
+        self.scheduler = scheduler
 
         tk.Label(self.parent, text="Sorting Algorithms", font=("Arial", 18, "bold")).pack(pady=10)
 
         tk.Label(self.parent, text="Enter Comma seperated list").pack(pady=5)
-        self.user_input = tk.Entry(self.parent, width=50)
-        self.user_input.pack(pady=5)
+        self.user_input = NumberInput(self.parent, scheduler)
 
 
         tk.Button(self.parent, text="Bubble", command=self.BubbleAlgorithm).pack(padx=5, pady=5)
@@ -232,109 +389,95 @@ class SortingAlgorithm:
         self.sortOrder = ttk.Combobox(self.parent, values=["Ascending", "Descending"])
         self.sortOrder.pack(pady=5)
 
+        """Any registered engine, auto picks one from the input size and value range"""
+        self.engine_choice = ttk.Combobox(self.parent, values=["auto"] + list(SORT_ENGINES))
+        self.engine_choice.current(0)
+        self.engine_choice.pack(pady=5)
+        tk.Button(self.parent, text="Sort", command=lambda: self.run_engine(self.engine_choice.get())).pack(pady=5)
+
         self.result_label = tk.Label(self.parent, text="Result: ", font=("Arial", 12))
-        self.result_label.pack(pady=20)
+        self.result_label.pack(pady=5)
+        self.viewer = ResultViewer(self.parent, scheduler)
 
-        tk.Button(self.parent, text="Back to Menu", command=back_callback).pack(pady=20)
+        tk.Button(self.parent, text="Back to Menu", command=back_callback).pack(pady=10)
 
     def BubbleAlgorithm(self):
         """Bubble algorithm for half for Requirement 3"""
-        order = self.sortOrder.get()[0]
-
-        """Sets default ofter to Ascending"""
-        if order == "": order = "A"
-        self.input = [int(x.strip()) for x in self.user_input.get().split(',') if x.strip()]
-
-        if order ==  "A":
-            """Bubble sort for ascending order"""
-            for j in range(len(self.input)):
-                for i in range(len(self.input) - 1):
-                    if self.input[i] > self.input[i + 1]:
-                        temporaryNumber = int(self.input[i + 1])
-                        self.input[i + 1] = self.input[i]
-                        self.input[i] = temporaryNumber
-        elif order == "D":
-            """Bubble sort for descending order"""
-            for j in range(len(self.input)):
-                for i in range(len(self.input) - 1):
-                    if self.input[i] < self.input[i + 1]:
-                        temporaryNumber = int(self.input[i + 1])
-                        self.input[i + 1] = self.input[i]
-                        self.input[i] = temporaryNumber
-
-        self.result_label.config(text=f"Result: {self.input}")
-        """Adds to history log"""
-        AlgorithmHistory.add_entry(f"Sorted", f"{self.input} with Bubble Algorithm")
+        self.run_engine("bubble")
 
     def SelectionAlgorithm(self):
         """Selection algorithm for half of Requirement 3"""
-        order = self.sortOrder.get()[0]
-
-        """Sets default order to Ascending"""
-        if order == "": order = "A"
-        self.input = [int(x.strip()) for x in self.user_input.get().split(',') if x.strip()]
-        n = len(self.input)
-
-        for i in range(n):
-            extreme_index = i
-            for j in range(i + 1, n):
-                if order == "A":
-                    """Selection sort for ascending order"""
-                    if self.input[j] < self.input[extreme_index]:
-                        extreme_index = j
-                else:
-                    """Selection sort for descending order"""
-                    if self.input[j] > self.input[extreme_index]:
-                        extreme_index = j
-            if extreme_index != i:
-                self.input[i], self.input[extreme_index] = self.input[extreme_index], self.input[i]
-
-        self.result_label.config(text=f"Result: {self.input}")
+        self.run_engine("selection")
 
+    def run_engine(self, engine):
+        """Sorts the input with a registered engine, descending order is handled by the engine"""
+        reverse = self.sortOrder.get().startswith("D")
+        try:
+            values = self.user_input.values()
+        except ValueError as error:
+            self.result_label.config(text=f"Error: {error}")
+            return
+        if engine != "auto" and engine not in SORT_ENGINES:
+            self.result_label.config(text="Error: Unknown engine")
+            return
+
+        self.result_label.config(text="Sorting...")
+        self.scheduler.run_in_process(f"Sort {len(values)} values ({engine})", sort_values, values, engine, reverse,
+                                      on_done=self.show_sorted, metric="sort",
+                                      cache_key=RESULTS.key("sort", values, engine=engine, reverse=reverse))
+
+    def show_sorted(self, result):
+        self.input, used = result
+        self.result_label.config(text=f"Result: {len(self.input)} values sorted with {used}")
+        self.viewer.show(self.input)
         """Adds to history log"""
-        AlgorithmHistory.add_entry(f"Sorted", f"{self.input} with Selection Algorithm")
+        AlgorithmHistory.add_entry("sort", f"Sorted {len(self.input)} values with {used} engine",
+                                   parameters={"engine": used}, input_size=len(self.input),
+                                   duration=self.scheduler.elapsed(), result=self.input)
 
 
 class MergeSort:
     """Merge sort algorithms for Requirement 4"""
-    def __init__(self, parent, back_callback):
+    def __init__(self, parent, back_callback, scheduler):
         self.parent = parent
-        for widget in self.parent.winfo_children():
-            widget.destroy()
+        self.scheduler = scheduler
 
         tk.Label(self.parent, text="Divide and Conquer", font=("Arial", 18, "bold")).pack(pady=10)
 
         tk.Label(self.parent, text="Enter Comma seperated list").pack(pady=5)
-        self.user_input = tk.Entry(self.parent, width=50)
-        self.user_input.pack(pady=5)
+        self.user_input = NumberInput(self.parent, scheduler)
 
         self.sortOrder = ttk.Combobox(self.parent, values=["Ascending", "Descending"])
         self.sortOrder.pack(pady=5)
         array = []
         order  = ""
 
+        self.parallel = tk.BooleanVar(value=False)
+        tk.Checkbutton(self.parent, text=f"Parallel (multi-process, {PARALLEL_THRESHOLD}+ values)",
+                       variable=self.parallel).pack(pady=5)
+
         tk.Button(self.parent, text="Sort", command=lambda: self.sort(array, order)).pack(padx=10)
+        tk.Button(self.parent, text="Sort File...", command=self.sort_file).pack(pady=5)
 
         self.result_label = tk.Label(self.parent, text="Result: ", font=("Arial", 12))
-        self.result_label.pack(pady=20)
+        self.result_label.pack(pady=5)
+        self.viewer = ResultViewer(self.parent, scheduler, rows=5)
 
         self.timeKeeper = tk.Label(self.parent, text="Time taken: ", font=("Arial", 12))
+        self.timeKeeper.pack()
 
         tk.Button(self.parent, text="Back to Menu", command=back_callback).pack(pady=20)
+        self.use_parallel = False
 
-        self.decorated_sort = TimeTracker(self.sort_logic)
-
-    def sort_logic(self, array, order):
-        n = len(array)
-        """Checks is array is length 1"""
-
-        if n <= 1: return array
-
-        """Splits array into two halves"""
-        mid = n // 2
-        left = self.sort_logic(array[:mid], order)
-        right = self.sort_logic(array[mid:], order)
-        return self.merge(left, right, order)
+    @staticmethod
+    def calculate(array, reverse, parallel):
+        """Runs in a worker process and returns the sorted values with merge_sort's counters.
+        Parallel mode starts its own workers from there and falls back to the serial sort
+        below PARALLEL_THRESHOLD values"""
+        counters = {}
+        if parallel:
+            return parallel_merge_sort(array, reverse), counters
+        return merge_sort(array, reverse, counters), counters
 
     def sort(self, array, order):
         """Code to stop recursive bug from crashing program
@@ -342,56 +485,85 @@ class MergeSort:
         if not array:
             try:
                 order = self.sortOrder.get()[0] if self.sortOrder.get() else "A"
-                array = [int(x.strip()) for x in self.user_input.get().split(',') if x.strip()]
-            except (ValueError, IndexError):
-                self.result_label.config(text="Error: Invalid Input")
+                array = self.user_input.values()
+            except ValueError as error:
+                self.result_label.config(text=f"Error: {error}")
                 return
 
-        final_merge = self.decorated_sort(array, order)
-
-        self.result_label.config(text=f"Result: {final_merge}")
+        """Runs in a worker process so the sort never competes with the window for the GIL.
+        Cancelling drops the result but the worker sorts to the end, merge sort has no point
+        where it checks for a cancel"""
+        self.use_parallel = self.parallel.get()
+        self.result_label.config(text="Sorting...")
+        return self.scheduler.run_in_process(f"Merge sort {len(array)} values", MergeSort.calculate,
+                                             array, order == "D", self.use_parallel,
+                                             on_done=self.show_sorted, metric="merge-sort",
+                                             cache_key=RESULTS.key("merge-sort", array, order=order,
+                                                                   parallel=self.use_parallel))
+
+    def show_sorted(self, outcome):
+        final_merge, counters = outcome
+        self.result_label.config(text=f"Result: {len(final_merge)} values sorted")
+        self.viewer.show(final_merge)
+
+        """A cached result has no run time of its own"""
+        elapsed = self.scheduler.elapsed()
+        if elapsed is not None:
+            METRICS.add_counters("merge-sort", counters)
+            self.timeKeeper.config(text=f"Time taken: {elapsed:.6f}s" + "".join(
+                f", {name}: {value}" for name, value in counters.items()))
 
         """Adds to history log"""
-        AlgorithmHistory.add_entry(f"Sorted", f"{final_merge} with Merge Algorithm")
-
-        return final_merge
-
-    def merge(self, left, right, order):
-        """Merges two sorted arrays"""
-        sorted_array = []
-        i = 0
-        j = 0
-        while i < len(left) and j < len(right):
-            if order == "A":
-                condition = left[i] <= right[j]
-            else:
-                condition = left[i] >= right[j]
-
-            if condition:
-                sorted_array.append(left[i])
-                i += 1
-            else:
-                sorted_array.append(right[j])
-                j += 1
-
-        sorted_array.extend(left[i:])
-        sorted_array.extend(right[j:])
-
-        return sorted_array
+        AlgorithmHistory.add_entry("merge-sort", f"Sorted {len(final_merge)} values with Merge Algorithm",
+                                   parameters={"parallel": self.use_parallel}, input_size=len(final_merge),
+                                   duration=self.scheduler.elapsed(), result=final_merge)
+
+    def sort_file(self):
+        """External merge sort of a comma separated integer file as a background job,
+        its progress callback is also where a cancel request stops the sort"""
+        input_path = filedialog.askopenfilename(title="File to sort")
+        if not input_path: return
+        output_path = filedialog.asksaveasfilename(title="Save sorted file as")
+        if not output_path: return
+        reverse = self.sortOrder.get().startswith("D")
+
+        def work(job):
+            def report(stage, done, total):
+                job.raise_if_cancelled()
+                job.progress(done, total, stage)
+            return ExternalSorter(progress=report).sort_file(input_path, output_path, reverse)
+
+        def finished(count):
+            self.result_label.config(text=f"Sorted {count} values into {output_path}")
+            AlgorithmHistory.add_entry("merge-sort", f"Sorted {count} values into {output_path} with External Merge",
+                                       parameters={"input": input_path, "output": output_path, "reverse": reverse},
+                                       input_size=count, duration=self.scheduler.elapsed())
+
+        self.scheduler.run_in_thread(f"External sort {os.path.basename(input_path)}", work, on_done=finished,
+                                     metric="external-sort",
+                                     on_progress=lambda job: self.result_label.config(text=f"{job.status}..."),
+                                     on_error=lambda error: self.result_label.config(text=f"Error: {error}"))
 
 
 class DeckShuffle:
     """Deck shuffle algorithms for Requirement 5"""
-    def __init__(self, parent, back_callback):
+    def __init__(self, parent, back_callback, scheduler):
         self.parent = parent
-        for widget in self.parent.winfo_children():
-            widget.destroy()
+        self.scheduler = scheduler
 
         tk.Label(self.parent, text="Randomized Deck Shuffle", font=("Arial", 18, "bold")).pack(pady=10)
 
         tk.Button(self.parent, text="Shuffle New Deck", command=self.display_shuffle, bg="blue", fg="white").pack(
             pady=10)
 
+        simulation_row = tk.Frame(self.parent)
+        simulation_row.pack(pady=5)
+        tk.Label(simulation_row, text="Simulated shuffles:").pack(side="left")
+        self.simulation_count = tk.Entry(simulation_row, width=12)
+        self.simulation_count.insert(0, "100000")
+        self.simulation_count.pack(side="left", padx=5)
+        tk.Button(simulation_row, text="Run Simulation", command=self.run_simulation).pack(side="left", padx=5)
+
         # https://www.geeksforgeeks.org/python/python-tkinter-text-widget/
         """Code to create large text box to list results, used above link"""
         self.result_area = tk.Text(self.parent, height=12, width=50)
@@ -399,40 +571,66 @@ class DeckShuffle:
 
         tk.Button(self.parent, text="Back to Menu", command=back_callback).pack(pady=10)
 
-    def create_deck(self):
-        """Creates all possible cards in deck"""
-        suits = ['H', 'D', 'C', 'S']
-        values = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'Jack', 'Queen', 'King', 'Ace']
-        return [f"{v} {s}" for s in suits for v in values]
-
-    def shuffle(self, deck):
-        # https://www.geeksforgeeks.org/dsa/shuffle-a-given-array-using-fisher-yates-shuffle-algorithm/
-        """Shuffles deck using algorithm from above link"""
-        n = len(deck)
-        for i in range(n - 1, 0, -1):
-            j = random.randint(0, i)
-            deck[i], deck[j] = deck[j], deck[i]
-        return deck
+        self.engine = ShuffleEngine()
 
     def display_shuffle(self):
-        """Displays shuffled deck"""
-        deck = self.create_deck()
-        shuffled_deck = self.shuffle(deck)
+        """Displays shuffled deck, cards are small ints until they are formatted for display"""
+        shuffled_deck = list(format_deck(self.engine.shuffle()))
 
         self.result_area.delete('1.0', tk.END)
-        for i, card in enumerate(shuffled_deck, 1):
-            self.result_area.insert(tk.END, f"{i}. {card}\n")
+        self.result_area.insert(tk.END, "".join(f"{i}. {card}\n" for i, card in enumerate(shuffled_deck, 1)))
 
         """Adds to history log"""
-        AlgorithmHistory.add_entry(f"Shuffled a deck of cards", f"{shuffled_deck}")
+        AlgorithmHistory.add_entry("shuffle", "Shuffled a deck of cards", result=shuffled_deck)
+
+    def run_simulation(self):
+        """Monte-Carlo estimate of hand and position frequencies across a process pool.
+        Workers only send back counts"""
+        try:
+            total = int(self.simulation_count.get().strip())
+        except ValueError:
+            total = 0
+        if total < 1:
+            self.result_area.delete('1.0', tk.END)
+            self.result_area.insert(tk.END, "Error: Enter a positive number of shuffles")
+            return
+
+        """Progress and cancelling go through the shared job status bar"""
+        self.scheduler.run_in_thread(
+            f"Simulate {total} shuffles",
+            lambda job: simulate_shuffles(total, progress=job.progress, cancel=job.cancel_event),
+            on_done=self.show_simulation, metric="shuffle-simulation")
+
+    def show_simulation(self, result):
+        """Shows hand frequencies and how far position chances stray from 1/52"""
+        lines = [f"{result.shuffles} shuffles{' (cancelled)' if result.cancelled else ''}", "Top five cards as a hand:"]
+        for name, frequency in result.hand_frequencies().items():
+            lines.append(f"  {name:<16} {frequency:.5%}")
+
+        chances = [(result.position_probability(card, k), card, k) for card in range(DECK_SIZE) for k in range(DECK_SIZE)]
+        low, high = min(chances), max(chances)
+        lines.append(f"Card at position (uniform is {1 / DECK_SIZE:.4%}):")
+        lines.append(f"  lowest  {low[0]:.4%} for {card_name(low[1])} at {low[2] + 1}")
+        lines.append(f"  highest {high[0]:.4%} for {card_name(high[1])} at {high[2] + 1}")
+
+        self.result_area.delete('1.0', tk.END)
+        self.result_area.insert(tk.END, "\n".join(lines))
+
+        """Adds one summary to the history log rather than any decks"""
+        AlgorithmHistory.add_entry("shuffle", f"Simulated {result.shuffles} shuffles", input_size=result.shuffles,
+                                   duration=self.scheduler.elapsed())
 
 
 class FactorialRecursion:
     """Factorial recursion algorithms for Requirement 6"""
-    def __init__(self, parent, back_callback):
+    """Shared between visits so the memo of recent factorials is kept"""
+    engine = FactorialEngine()
+    """Results with more digits than this are summarised instead of printed"""
+    DISPLAY_DIGITS = 5000
+
+    def __init__(self, parent, back_callback, scheduler):
         self.parent = parent
-        for widget in self.parent.winfo_children():
-            widget.destroy()
+        self.scheduler = scheduler
 
         tk.Label(self.parent, text="Recursive Factorial", font=("Arial", 18, "bold")).pack(pady=10)
 
@@ -440,114 +638,314 @@ class FactorialRecursion:
         self.user_input = tk.Entry(self.parent)
         self.user_input.pack(pady=5)
 
+        self.mode = ttk.Combobox(self.parent, values=["Exact", "Recursive (teaching, n <= 992)", "Digit count", "Modulo m"])
+        self.mode.current(0)
+        self.mode.pack(pady=5)
+
+        tk.Label(self.parent, text="m (Modulo mode only):").pack(pady=5)
+        self.user_mod = tk.Entry(self.parent)
+        self.user_mod.pack(pady=5)
+
         tk.Button(self.parent, text="Calculate", command=self.run_factorial, bg="purple", fg="white").pack(pady=10)
 
-        self.result_label = tk.Label(self.parent, text="Result: ", font=("Arial", 12))
+        self.result_label = tk.Label(self.parent, text="Result: ", font=("Arial", 12), wraplength=550)
         self.result_label.pack(pady=20)
 
         tk.Button(self.parent, text="Back to Menu", command=back_callback).pack(pady=10)
 
-    def calculate_factorial(self, n):
-        """Calculates factorial of n Recursively for Requirement"""
-        if n == 0 or n == 1:
-            return 1
-        else:
-            return n * self.calculate_factorial(n - 1)
-
     def run_factorial(self):
         val = self.user_input.get().strip()
-        """Validates that input is both positive and not too large"""
+        mode = self.mode.get()
+        """Validates that input is positive, only the recursive mode is limited in size"""
         try:
             n = int(val)
-            if n < 0:
-                self.result_label.config(text="Error: Enter a positive number")
-            elif n > 992:
-                self.result_label.config(text="Error: Number too large for recursion")
-            else:
-                result = self.calculate_factorial(n)
-                self.result_label.config(text=f"Result: {result}")
-
-                """Adds to history log"""
-                AlgorithmHistory.add_entry(f"Calculated factorial of {val} as: ", result)
+            m = int(self.user_mod.get().strip()) if mode == "Modulo m" else None
         except ValueError:
             self.result_label.config(text="Error: Invalid input")
+            return
+        if n < 0:
+            self.result_label.config(text="Error: Enter a positive number")
+            return
+        if mode.startswith("Recursive") and n > 992:
+            self.result_label.config(text="Error: Number too large for recursion")
+            return
+
+        def finished(text):
+            self.result_label.config(text=f"Result: {text}")
+
+            """Adds to history log"""
+            AlgorithmHistory.add_entry("factorial", f"Calculated factorial of {n}", parameters={"n": n, "mode": mode, "m": m},
+                                       duration=self.scheduler.elapsed(), result=text)
+
+        self.result_label.config(text="Calculating...")
+        self.scheduler.run_in_process(f"Factorial {n}! ({mode})", FactorialRecursion.calculate, n, mode, m,
+                                      on_done=finished, metric="factorial",
+                                      cache_key=RESULTS.key("factorial", n, mode=mode, m=m),
+                                      on_error=lambda error: self.result_label.config(text=f"Error: {error}"))
+
+    @staticmethod
+    def calculate(n, mode, m):
+        """Runs in a worker process, each worker keeps its own memo of recent factorials"""
+        engine = FactorialRecursion.engine
+        if mode.startswith("Recursive"):
+            """The worker's own frames sit under the recursion, so n = 992 overflows the default
+            limit of 1000 that the mainloop was sized against. Leave room for n calls above them"""
+            sys.setrecursionlimit(max(sys.getrecursionlimit(), n + 100))
+            return FactorialRecursion.describe(n, recursive_factorial(n))
+        if mode == "Digit count":
+            return f"{n}! has {engine.digit_count(n)} digits"
+        if mode == "Modulo m":
+            return f"{n}! mod {m} = {engine.factorial_mod(n, m)}"
+        return FactorialRecursion.describe(n, engine.factorial(n))
+
+    @staticmethod
+    def describe(n, result):
+        """Prints the result, or a summary when converting it to text would take too long"""
+        digits = FactorialRecursion.engine.digit_count(n)
+        if digits <= FactorialRecursion.DISPLAY_DIGITS:
+            return str(result)
+        """Trailing zeros come from the factors of 5"""
+        zeros = 0
+        power = 5
+        while power <= n:
+            zeros += n // power
+            power *= 5
+        return f"{digits} digits, ending in {zeros} zeros"
 
 
 class SearchStatistics:
     """Search statistics algorithms for Requirement 7"""
-    def __init__(self, parent, back_callback):
+    def __init__(self, parent, back_callback, scheduler):
         self.parent = parent
-        for widget in self.parent.winfo_children():
-            widget.destroy()
+        self.scheduler = scheduler
 
         tk.Label(self.parent, text="Array Statistics", font=("Arial", 18, "bold")).pack(pady=10)
 
         tk.Label(self.parent, text="Enter numbers separated by commas:").pack()
-        self.user_input = tk.Entry(self.parent, width=50)
-        self.user_input.pack(pady=5)
+        self.user_input = NumberInput(self.parent, scheduler)
 
         tk.Button(self.parent, text="Calculate Stats", command=self.process_stats).pack(pady=10)
 
+        stream_row = tk.Frame(self.parent)
+        stream_row.pack(pady=5)
+        tk.Label(stream_row, text="Streaming error bound:").pack(side="left")
+        self.error_bound = ttk.Combobox(stream_row, values=["0.05", "0.01", "0.001"], width=8)
+        self.error_bound.current(1)
+        self.error_bound.pack(side="left", padx=5)
+        tk.Button(stream_row, text="Stream File...", command=self.stream_file).pack(side="left")
+
         self.result_box = tk.Label(self.parent, text="", justify="left", font=("Courier", 10))
         self.result_box.pack(pady=10)
 
         tk.Button(self.parent, text="Back", command=back_callback).pack()
 
-    def calculate_mode(self, arr):
-        """Calculates mode of array"""
-        counts = {}
-        for num in arr:
-            counts[num] = counts.get(num, 0) + 1
-
-        max_count = max(counts.values())
-        modes = [k for k, v in counts.items() if v == max_count]
-        return modes if len(modes) < len(arr) else "No unique mode"
-
-    def get_percentile(self, sorted_arr, percentile):
-        """Function to calculate a given percentile"""
-        n = len(sorted_arr)
-        index = percentile * (n - 1)
-        lower = int(index)
-        upper = lower + 1
+    def process_stats(self):
+        """Collects all the data and displays to the user, percentiles are found by selection not sorting"""
+        try:
+            data = self.user_input.values()
+        except ValueError as error:
+            self.result_box.config(text=f"Error: {error}")
+            return
 
-        if upper >= n:
-            return sorted_arr[lower]
+        if not data: return
 
-        weight = index - lower
-        return sorted_arr[lower] * (1 - weight) + sorted_arr[upper] * weight
+        self.result_box.config(text="Calculating...")
+        self.scheduler.run_in_process(f"Statistics of {len(data)} values", summary_statistics, data, (0.25, 0.5, 0.75),
+                                      on_done=lambda stats: self.show_stats(len(data), stats), metric="stats",
+                                      cache_key=RESULTS.key("stats", data, percentiles=(0.25, 0.5, 0.75)))
 
-    def process_stats(self):
-        """Collects all the data and displays to the user"""
-        raw_data = self.user_input.get()
-        data = sorted([int(x.strip()) for x in raw_data.split(',') if x.strip()])
+    def show_stats(self, count, stats):
+        smallest = stats["smallest"]
+        largest = stats["largest"]
+        mode = stats["mode"]
+        q1, median, q3 = stats["percentiles"].values()
 
-        if not data: return
+        res = self.format_stats(smallest, largest, mode, median, q1, q3)
+        self.result_box.config(text=res)
 
-        smallest = data[0]
-        largest = data[-1]
-        mode = self.calculate_mode(data)
-        median = self.get_percentile(data, 0.5)
-        q1 = self.get_percentile(data, 0.25)
-        q3 = self.get_percentile(data, 0.75)
+        """Adds to history log"""
+        AlgorithmHistory.add_entry("stats", f"Summarised {count} values", input_size=count,
+                                   duration=self.scheduler.elapsed(), result=res)
 
-        res = (f"Smallest: {smallest}\n"
+    def format_stats(self, smallest, largest, mode, median, q1, q3):
+        return (f"Smallest: {smallest}\n"
                 f"Largest:  {largest}\n"
                 f"Mode:     {mode}\n"
                 f"Median:   {median:.2f}\n"
                 f"1st Q (Q1): {q1:.2f}\n"
                 f"3rd Q (Q3): {q3:.2f}")
-        self.result_box.config(text=res)
+
+    def stream_file(self):
+        """Approximate statistics over a file of any size in constant memory, read as a
+        background job that sends the running summary back after every chunk"""
+        path = filedialog.askopenfilename(title="File to stream")
+        if not path: return
+        try:
+            error = float(self.error_bound.get())
+        except ValueError:
+            error = 0.01
+
+        def work(job):
+            stream = StreamingStatistics(quantile_error=error, frequency_error=error / 10)
+            with open(path, "rb") as file:
+                size = max(os.path.getsize(path), 1)
+                numbers = read_numbers(file, allow_float=True)
+                while not job.cancelled:
+                    chunk = list(islice(numbers, 200_000))
+                    if not chunk:
+                        break
+                    stream.update(chunk)
+                    job.progress(file.tell(), size, f"{stream.quantiles.count} values read", stream.summary())
+            return stream
+
+        def finished(stream):
+            if stream.quantiles.count:
+                self.show_stream_summary(stream.summary(), f"{stream.quantiles.count} values, "
+                                                           f"{stream.retained()} kept in memory")
+            AlgorithmHistory.add_entry("stats", f"Streamed {stream.quantiles.count} values from {path}",
+                                       parameters={"path": path, "error": error}, input_size=stream.quantiles.count,
+                                       duration=self.scheduler.elapsed())
+
+        self.scheduler.run_in_thread(f"Stream {os.path.basename(path)}", work, on_done=finished, metric="stats-stream",
+                                     on_progress=lambda job: self.show_stream_summary(job.detail, job.status),
+                                     on_error=lambda error: self.result_box.config(text=f"Error: {error}"))
+
+    def show_stream_summary(self, stats, status):
+        q1, median, q3 = stats["percentiles"].values()
+        res = self.format_stats(stats["smallest"], stats["largest"], stats["mode"], median, q1, q3)
+        self.result_box.config(text=f"{res}\n(approximate, {status})")
+
+
+class SearchView:
+    """Search for Requirement 7, answers batches of lookups against one indexed list"""
+    def __init__(self, parent, back_callback, scheduler):
+        self.parent = parent
+        self.scheduler = scheduler
+
+        tk.Label(self.parent, text="Search", font=("Arial", 18, "bold")).pack(pady=10)
+
+        tk.Label(self.parent, text="Values to search, separated by commas:").pack()
+        self.user_input = NumberInput(self.parent, scheduler)
+
+        index_row = tk.Frame(self.parent)
+        index_row.pack(pady=5)
+        tk.Button(index_row, text="Build Index", command=self.build_index).pack(side="left", padx=5)
+        tk.Button(index_row, text="Append Values", command=self.append_values).pack(side="left", padx=5)
+        self.index_label = tk.Label(self.parent, text="No index built", fg="gray")
+        self.index_label.pack()
+
+        tk.Label(self.parent, text=f"Queries, one per line ({', '.join(SEARCH_QUERIES)}), e.g. rank 10 or range 5 9:").pack(pady=5)
+        self.query_box = tk.Text(self.parent, height=4, width=50)
+        self.query_box.pack()
+
+        query_row = tk.Frame(self.parent)
+        query_row.pack(pady=5)
+        tk.Button(query_row, text="Run Queries", command=self.run_typed_queries).pack(side="left", padx=5)
+        tk.Button(query_row, text="Load Queries...", command=self.load_queries).pack(side="left", padx=5)
+
+        self.result_label = tk.Label(self.parent, text="", font=("Arial", 12))
+        self.result_label.pack()
+        self.viewer = ResultViewer(self.parent, scheduler, rows=6)
+
+        tk.Button(self.parent, text="Back", command=back_callback).pack()
+
+        self.index = None
+        """Jobs run on several threads, appends must not interleave with a batch of queries"""
+        self.lock = threading.Lock()
+
+    def read_values(self):
+        try:
+            values = self.user_input.values()
+        except ValueError as error:
+            self.index_label.config(text=f"Error: {error}", fg="red")
+            return None
+        if not values:
+            self.index_label.config(text="Error: Enter values to search", fg="red")
+            return None
+        return values
+
+    def build_index(self):
+        """The hash and sorted indexes are built once, every query after that is a lookup"""
+        values = self.read_values()
+        if values is None: return
+
+        def build(job):
+            return SearchIndex(values)
+
+        self.index_label.config(text="Indexing...", fg="black")
+        self.scheduler.run_in_thread(f"Index {len(values)} values", build, on_done=self.use_index, metric="search",
+                                     on_error=lambda error: self.index_label.config(text=f"Error: {error}", fg="red"))
+
+    def use_index(self, index):
+        self.index = index
+        self.nbytes = index.nbytes
+        self.index_label.config(text=f"Index of {len(index)} values, {len(index.first)} distinct", fg="black")
+
+    def append_values(self):
+        """Extends the current index in place, earlier positions keep their numbers"""
+        if self.index is None:
+            self.build_index()
+            return
+        values = self.read_values()
+        if values is None: return
+        index = self.index
+
+        def append(job):
+            with self.lock:
+                index.append(values)
+            return index
+
+        self.scheduler.run_in_thread(f"Append {len(values)} values", append, on_done=self.use_index, metric="search")
+
+    def run_typed_queries(self):
+        text = self.query_box.get("1.0", tk.END)
+        self.run_queries("typed queries", text.splitlines)
+
+    def load_queries(self):
+        """The file is read by the job, so a large one does not stall the window"""
+        path = filedialog.askopenfilename(title="Query file")
+        if not path: return
+
+        def read_lines():
+            with open(path) as file:
+                return file.read().splitlines()
+
+        self.run_queries(os.path.basename(path), read_lines)
+
+    def run_queries(self, source, read_lines):
+        """Queries are grouped by operation and each group answered in one batch"""
+        if self.index is None:
+            self.result_label.config(text="Error: Build an index first")
+            return
+        index = self.index
+
+        def answer(job):
+            """Raw lines go to parse_queries so its errors name the line of the file"""
+            lines = read_lines()
+            batches = parse_queries(lines)
+            queries = [query for query in (line.partition("#")[0].strip() for line in lines) if query]
+            with self.lock:
+                return queries, index.answer(batches)
+
+        self.result_label.config(text="Searching...")
+        self.scheduler.run_in_thread(f"Search {source}", answer, on_done=lambda result: self.show_answers(index, *result),
+                                     metric="search", on_error=lambda error: self.result_label.config(text=f"Error: {error}"))
+
+    def show_answers(self, index, queries, answers):
+        self.result_label.config(text=f"{len(answers)} queries answered")
+        self.viewer.show(list(zip(queries, answers)), lambda row: f"{row[0]} -> {row[1]}", title="Answers")
 
         """Adds to history log"""
-        AlgorithmHistory.add_entry(f"Searched {raw_data} and found \n {res}", "")
+        AlgorithmHistory.add_entry("search", f"Answered {len(answers)} queries on {len(index)} values",
+                                   parameters={"queries": len(answers)}, input_size=len(index),
+                                   duration=self.scheduler.elapsed(), result=answers)
 
 
 class PalindromeCounter:
     """Palindrome Counter algorithms for Requirement 8"""
-    def __init__(self, parent, back_callback):
+    def __init__(self, parent, back_callback, scheduler):
         self.parent = parent
-        for widget in self.parent.winfo_children():
-            widget.destroy()
+        self.scheduler = scheduler
 
         tk.Label(self.parent, text="Palindrome Substring Counter", font=("Arial", 18, "bold")).pack(pady=10)
 
@@ -557,53 +955,70 @@ class PalindromeCounter:
 
         tk.Button(self.parent, text="Count Palindromes", command=self.run_logic, bg="teal", fg="white").pack(pady=10)
 
+        distinct_row = tk.Frame(self.parent)
+        distinct_row.pack(pady=5)
+        tk.Button(distinct_row, text="Distinct Palindromes", command=self.run_distinct).pack(side="left", padx=5)
+        tk.Button(distinct_row, text="Append to Text", command=self.append_distinct).pack(side="left", padx=5)
+
         self.result_label = tk.Label(self.parent, text="Total Palindromes: ", font=("Arial", 12))
         self.result_label.pack(pady=10)
 
-        self.found_area = tk.Text(self.parent, height=8, width=40)
-        self.found_area.pack(pady=10)
+        self.viewer = ResultViewer(self.parent, scheduler)
 
         tk.Button(self.parent, text="Back to Menu", command=back_callback).pack(pady=10)
 
+        self.tree = Eertree()
+        self.tree_job = None
+
     def run_logic(self):
         s = self.user_input.get().strip()
         if not s: return ""
 
-        """Creates variables needed"""
-        n = len(s)
-        memo = [[False] * n for _ in range(n)]
-        count = 0
-        palindromes_found = []
-
-        for i in range(n):
-            """Checks all 1 length palindromes,
-            All individual characters are palindromes by default"""
-            memo[i][i] = True
-            count += 1
-            palindromes_found.append(s[i])
-
-        for i in range(n - 1):
-            """Checks all 2 length palindromes,"""
-            if s[i] == s[i + 1]:
-                memo[i][i + 1] = True
-                count += 1
-                palindromes_found.append(s[i:i + 2])
-
-        for k in range(3, n + 1):
-            """Checks all 3 or more length palindromes,"""
-            for i in range(n - k + 1):
-                j = i + k - 1
-                if s[i] == s[j] and memo[i + 1][j - 1]:
-                    memo[i][j] = True
-                    count += 1
-                    palindromes_found.append(s[i:j + 1])
+        """Manacher's algorithm gives every palindrome's radius in O(n) time and memory,
+        the palindromes themselves are only sliced out for the rows on screen"""
+        self.result_label.config(text="Counting...")
+        self.scheduler.run_in_process(f"Palindromes in {len(s)} characters", palindrome_radii, s,
+                                      on_done=lambda radii: self.show_count(s, radii), metric="palindromes",
+                                      cache_key=RESULTS.key("palindromes", s))
 
+    def show_count(self, s, radii):
+        count = count_palindromes(s, radii)
         self.result_label.config(text=f"Total Palindromes: {count}")
-        self.found_area.delete('1.0', tk.END)
-        self.found_area.insert(tk.END, ", ".join(palindromes_found))
+        self.viewer.show(PalindromeSpans(s, radii), lambda span: s[span[0]:span[1]], title="Palindromes")
+
+        """Adds to history log"""
+        AlgorithmHistory.add_entry("palindromes", f"Found {count} palindromes", input_size=len(s),
+                                   duration=self.scheduler.elapsed(), result=count)
+
+    def run_distinct(self):
+        """Builds a fresh eertree of the distinct palindromes in the input"""
+        if self.tree_job is not None and not self.tree_job.finished:
+            return
+        self.tree = Eertree()
+        self.append_distinct()
+
+    def append_distinct(self):
+        """Extends the current eertree with the input, so earlier text is not processed again"""
+        s = self.user_input.get().strip()
+        if not s: return
+        """The tree lives in this view, so it is extended on a thread and one job at a time"""
+        if self.tree_job is not None and not self.tree_job.finished:
+            return
+        tree = self.tree
+        self.result_label.config(text="Indexing...")
+        self.tree_job = self.scheduler.run_in_thread(f"Eertree +{len(s)} characters", lambda job: tree.extend(s),
+                                                     on_done=lambda result: self.show_distinct(s), metric="eertree")
+
+    def show_distinct(self, s):
+        self.nbytes = self.tree.nbytes
+        self.result_label.config(text=f"Distinct Palindromes: {self.tree.distinct_count()} "
+                                      f"(text length {len(self.tree.text)})")
+        self.viewer.show(self.tree.most_common(), lambda entry: f"{entry[0]} x{entry[1]}",
+                         title=f"Longest: {self.tree.longest()[:40]}\nMost frequent first")
 
         """Adds to history log"""
-        AlgorithmHistory.add_entry(f"Looked at", f"{s} and found {count} palindromes")
+        AlgorithmHistory.add_entry("palindromes", f"Found {self.tree.distinct_count()} distinct palindromes",
+                                   input_size=len(s), duration=self.scheduler.elapsed(), result=self.tree.distinct_count())
 
 
 class Command(ABC):
@@ -616,70 +1031,632 @@ class AlgorithmHistory:
     """Behavioural Design Pattern (AlgorithmHistory) for Requirement 9"""
     """Acts as a central registry for algorithm execution logs
         This class uses Class Methods and Class Variables so that history
-        is shared globally"""
-    _history = []
+        is shared globally. Entries are structured records held in a HistoryStore,
+        which also saves them to SQLite once open_database has been called"""
+    _store = HistoryStore()
 
     @classmethod
-    def add_entry(cls, algorithm_name, details):
-        """Creates a timestamped log entry and adds it to the global history"""
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        entry = f"[{timestamp}] {algorithm_name}: {details}"
-        cls._history.append(entry)
-        """Keep only the last 5 entries"""
-        if len(cls._history) > 5:
-            cls._history.pop(0)
+    def open_database(cls, path):
+        cls._store.close()
+        cls._store = HistoryStore(path)
 
     @classmethod
-    def get_history(cls):
-        """Returns the list of stored log entries for the UI to display"""
-        return cls._history
+    def add_entry(cls, algorithm_name, details="", parameters=None, input_size=None, duration=None, result=None):
+        """Creates a timestamped record, algorithm_name is a key of ALGORITHMS.
+        The result is only kept as a short preview and a digest"""
+        cls._store.add(algorithm_name, details, parameters, input_size, duration, result)
+
+    @classmethod
+    def get_history(cls, count=5):
+        """Returns the last count entries formatted for the UI to display"""
+        return [cls.format_entry(record) for record in cls._store.recent(count)]
+
+    @staticmethod
+    def format_entry(record):
+        timestamp = datetime.fromtimestamp(record["time"]).strftime("%H:%M:%S")
+        entry = f"[{timestamp}] {record['algorithm']}: {record['details']}"
+        if record["duration"] is not None:
+            entry += f" ({record['duration']:.3f}s)"
+        return entry
+
+    @classmethod
+    def query(cls, algorithm=None, since=None, until=None, limit=100):
+        """Saved records newest first, by algorithm and unix time range"""
+        return cls._store.query(algorithm, since, until, limit)
+
+    @classmethod
+    def close(cls):
+        cls._store.close()
+
+
+class MetricsDashboard:
+    """Live table of everything TimeTracker has recorded, refreshed every REFRESH_MS"""
+    REFRESH_MS = 1000
+
+    def __init__(self, parent, back_callback, scheduler):
+        self.parent = parent
+        self.scheduler = scheduler
+
+        tk.Label(self.parent, text="Metrics Dashboard", font=("Arial", 18, "bold")).pack(pady=10)
+
+        """Switches go straight to the registry, so they apply to the next tracked call"""
+        options = tk.Frame(self.parent)
+        options.pack(pady=5)
+        for label, attribute in (("Tracking", "enabled"), ("Trace memory", "trace_memory"), ("Profile", "profile")):
+            variable = tk.BooleanVar(value=getattr(METRICS, attribute))
+            tk.Checkbutton(options, text=label, variable=variable,
+                           command=lambda v=variable, a=attribute: setattr(METRICS, a, v.get())).pack(side="left")
+        tk.Button(options, text="Reset", command=self.reset).pack(side="left", padx=10)
+
+        columns = ("calls", "errors", "p50", "p95", "p99", "cpu", "peak", "blocks", "counters")
+        headings = ("Calls", "Errors", "p50 ms", "p95 ms", "p99 ms", "CPU p50 ms", "Peak p95 KiB", "Net blocks p50",
+                    "Counters")
+        self.table = ttk.Treeview(self.parent, columns=columns, height=8)
+        self.table.heading("#0", text="Algorithm")
+        self.table.column("#0", width=110)
+        for column, heading in zip(columns, headings):
+            self.table.heading(column, text=heading)
+            self.table.column(column, width=60, anchor="e")
+        self.table.pack(fill="x", padx=10, pady=5)
+        self.table.bind("<<TreeviewSelect>>", lambda event: self.show_profile())
+
+        self.cache_label = tk.Label(self.parent, text="", font=("Courier", 9))
+        self.cache_label.pack()
+
+        self.profile_box = tk.Text(self.parent, height=8, font=("Courier", 8))
+        self.profile_box.pack(fill="both", expand=True, padx=10)
+
+        tk.Button(self.parent, text="Back to Menu", command=back_callback).pack(pady=10)
+
+        self.rows = {}
+        self.refresh_id = None
+
+    def shown(self):
+        self.hidden()
+        self.refresh()
+
+    def hidden(self):
+        """Refreshing stops while another view covers the dashboard"""
+        if self.refresh_id is not None:
+            self.parent.after_cancel(self.refresh_id)
+            self.refresh_id = None
+
+    def refresh(self):
+        """Stops rescheduling itself once the view has been closed"""
+        if not self.table.winfo_exists():
+            return
+        self.draw()
+        self.refresh_id = self.parent.after(self.REFRESH_MS, self.refresh)
+
+    def draw(self):
+        self.rows = {row["name"]: row for row in METRICS.snapshot()}
+        selected = self.table.selection()
+        self.table.delete(*self.table.get_children())
+        for name, row in sorted(self.rows.items()):
+            wall = [f"{seconds * 1000:.2f}" for seconds in row["wall"]]
+            peak = f"{row['peak'][1] / 1024:.1f}" if row["peak"][1] else "-"
+            counters = ", ".join(f"{key}={value}" for key, value in row["counters"].items())
+            self.table.insert("", "end", iid=name, text=name, values=(
+                row["calls"], row["errors"], *wall, f"{row['cpu'][0] * 1000:.2f}", peak, row["blocks"][0], counters))
+        self.table.selection_set([name for name in selected if name in self.rows])
+
+        cache = RESULTS.stats()
+        self.cache_label.config(text=f"Result cache: {cache['entries']} entries, {cache['bytes'] / 1024 ** 2:.1f} MiB, "
+                                     f"{cache['hits']} hits, {cache['disk_hits']} disk hits, {cache['misses']} misses, "
+                                     f"{cache['evictions']} evicted ({cache['hit_rate']:.0%} hit rate)")
+
+    def show_profile(self):
+        selected = self.table.selection()
+        row = self.rows.get(selected[0]) if selected else None
+        self.profile_box.delete("1.0", tk.END)
+        if row is not None:
+            self.profile_box.insert(tk.END, row["profile"] or "No profile recorded, tick Profile and run it again")
+
+    def reset(self):
+        METRICS.reset()
+        self.draw()
 
 
 class AlgorithmSelector:
     # https://www.geeksforgeeks.org/python/factory-method-python-design-patterns/
     """Creational Design Pattern (AlgorithmSelector) for Requirement 10, used code from above link"""
+    """Links each algorithm in the core ALGORITHMS registry to the class that needs to be used"""
+    views = {
+        "rsa": RSAView,
+        "fibonacci": FibonacciAlgorithm,
+        "sort": SortingAlgorithm,
+        "merge-sort": MergeSort,
+        "shuffle": DeckShuffle,
+        "factorial": FactorialRecursion,
+        "stats": SearchStatistics,
+        "search": SearchView,
+        "palindromes": PalindromeCounter
+    }
+
+    @staticmethod
+    def name_of(choice):
+        """choice is a registry name or its menu title"""
+        return next((name for name, (title, engine) in ALGORITHMS.items() if choice in (name, title)), None)
+
     @staticmethod
-    def create_view(choice, parent, back_callback):
-        """Links choices to class that needs to be used"""
-        views = {
-            "RSA Encryption": RSAView,
-            "Fibonacci (DP)": FibonacciAlgorithm,
-            "Sorting (Bubble/Selection)": SortingAlgorithm,
-            "Merge Sort (Divide & Conquer)": MergeSort,
-            "Shuffle Deck": DeckShuffle,
-            "Factorial": FactorialRecursion,
-            "Search": SearchStatistics,
-            "Palindrome Counter": PalindromeCounter
-        }
-
-        view_class = views.get(choice)
+    def create_view(choice, parent, back_callback, scheduler):
+        name = AlgorithmSelector.name_of(choice)
+        view_class = AlgorithmSelector.views.get(name)
 
         """If choice is selected, direct to that choice"""
         if view_class:
-            return view_class(parent, back_callback)
+            return view_class(parent, back_callback, scheduler)
         return None
 
 
-class TimeTracker:
-    """Structural Design Pattern (TimeTracker) for Requirement 11"""
-    def __init__(self, func):
-        self.func = func
+class JobCancelled(Exception):
+    """Raised inside a job that noticed it was cancelled"""
+
+
+class Job:
+    """One background run of an algorithm, handed to thread jobs so they can report progress
+    and check for cancellation"""
+    _ids = 0
+
+    def __init__(self, scheduler, name, on_done, on_progress, on_error):
+        Job._ids += 1
+        self.id = Job._ids
+        self.scheduler = scheduler
+        self.name = name
+        self.on_done = on_done
+        self.on_progress = on_progress
+        self.on_error = on_error
+        self.cancel_event = threading.Event()
+        self.future = None
+        self.in_process = False
+        self.metric = None
+        self.cache_key = None
+        self.started = time.perf_counter()
+        self.elapsed = None
+        self.finished = False
+        self.done = 0
+        self.total = 0
+        self.status = ""
+        self.detail = None
+
+    @property
+    def cancelled(self):
+        return self.cancel_event.is_set()
+
+    def cancel(self):
+        """Pending jobs never start, running thread jobs see the event and may return a
+        partial result, running process jobs finish but their result is dropped"""
+        self.cancel_event.set()
+        if self.future is not None:
+            self.future.cancel()
+
+    def raise_if_cancelled(self):
+        if self.cancelled:
+            raise JobCancelled()
+
+    def progress(self, done, total, status="", detail=None):
+        """Safe to call from any thread, the update is applied on the Tk thread"""
+        self.scheduler.updates.put(("progress", self, (done, total, status, detail)))
+
+
+class JobScheduler:
+    """Runs algorithms off the Tk thread. Light and I/O bound jobs go to a thread pool,
+    CPU bound ones to a process pool. Workers only put results on a queue, which the
+    mainloop drains every POLL_MS so every callback runs on the Tk thread"""
+    POLL_MS = 50
+
+    def __init__(self, root, threads=4, processes=None):
+        self.root = root
+        self.thread_pool = ThreadPoolExecutor(max_workers=threads)
+        self.processes = processes
+        self.process_pool = None
+        self.updates = queue.Queue()
+        self.jobs = []
+        self.listeners = []
+        self.finishing = None
+        self.root.after(self.POLL_MS, self.poll)
+
+    def run_in_thread(self, name, task, on_done=None, on_progress=None, on_error=None, metric=None, cache_key=None):
+        """task is called with the Job so it can report progress and check job.cancelled.
+        Runs are recorded in METRICS under metric when it is given. With a cache_key from
+        RESULTS.key a cached result goes straight to on_done and no job is started"""
+        if self._from_cache(cache_key, on_done):
+            return None
+        job = self._add(name, on_done, on_progress, on_error)
+        job.cache_key = cache_key
+        if metric:
+            task = TimeTracker(task, metric)
+        job.future = self.thread_pool.submit(task, job)
+        job.future.add_done_callback(lambda future: self.updates.put(("done", job, future)))
+        return job
+
+    def run_in_process(self, name, func, *args, on_done=None, on_error=None, metric=None, cache_key=None):
+        """func and args are pickled to a worker process, so they must be module level.
+        With a metric the worker measures the call and sends the sample back with the result"""
+        if self._from_cache(cache_key, on_done):
+            return None
+        if self.process_pool is None:
+            """Started on first use so the app opens without spawning workers"""
+            self.process_pool = ProcessPoolExecutor(max_workers=self.processes, initializer=lift_digit_limit)
+        job = self._add(name, on_done, None, on_error)
+        job.cache_key = cache_key
+        job.in_process = True
+        if metric and METRICS.enabled:
+            job.metric = metric
+            job.future = self.process_pool.submit(measured_call, func, *args, trace_memory=METRICS.trace_memory,
+                                                  profile=METRICS.profile)
+        else:
+            job.future = self.process_pool.submit(func, *args)
+        job.future.add_done_callback(lambda future: self.updates.put(("done", job, future)))
+        return job
 
-    def __call__(self, *args, **kwargs):
-        # https://www.geeksforgeeks.org/python/time-perf_counter-function-in-python/
-        """Tracks time taken for algorithm to run, uses code from above link"""
-        start_time = time.perf_counter()
+    def _from_cache(self, cache_key, on_done):
+        """on_done still runs from the mainloop, as it would for a job"""
+        if cache_key is None:
+            return False
+        result = RESULTS.get(cache_key)
+        if result is MISSING:
+            return False
+        if on_done:
+            self.call_in_ui(on_done, result)
+        return True
 
-        result = self.func(*args, **kwargs)
+    def call_in_ui(self, func, *args):
+        """Queues a call to run on the Tk thread, for code already running in a job"""
+        self.updates.put(("call", func, args))
 
-        end_time = time.perf_counter()
-        duration = end_time - start_time
+    def _add(self, name, on_done, on_progress, on_error):
+        job = Job(self, name, on_done, on_progress, on_error)
+        self.jobs.append(job)
+        self._changed()
+        return job
 
-        messagebox.showinfo(title="Time Tracker", message=f"Time taken: {duration:.8f} seconds")
-        return result
+    def poll(self):
+        """Always rescheduled, one failed update must not stop every later job's callbacks"""
+        try:
+            while not self.updates.empty():
+                kind, target, payload = self.updates.get()
+                if kind == "call":
+                    self._safely(None, target, *payload)
+                elif kind == "progress":
+                    target.done, target.total, target.status, target.detail = payload
+                    if target.on_progress and not target.cancelled:
+                        self._safely(target, target.on_progress, target)
+                else:
+                    self._finish(target, payload)
+                self._changed()
+        finally:
+            self.root.after(self.POLL_MS, self.poll)
+
+    def _finish(self, job, future):
+        job.finished = True
+        job.elapsed = time.perf_counter() - job.started
+        if job in self.jobs:
+            self.jobs.remove(job)
+        if future.cancelled() or (job.cancelled and job.in_process):
+            return
+        error = future.exception()
+        if isinstance(error, JobCancelled):
+            return
+        if error is not None:
+            self._report(job, error)
+        else:
+            result = future.result()
+            if job.metric:
+                result, sample = result
+                METRICS.record(job.metric, sample)
+            if job.cache_key is not None:
+                RESULTS.put(job.cache_key, result, job.elapsed)
+            """Lets on_done read the job's run time through elapsed"""
+            self.finishing = job
+            try:
+                if job.on_done:
+                    self._safely(job, job.on_done, result)
+            finally:
+                self.finishing = None
+
+    def elapsed(self):
+        """Seconds the job whose on_done is running took, None outside a job callback"""
+        return self.finishing.elapsed if self.finishing is not None else None
+
+    def _safely(self, job, callback, *args):
+        """The view that started a job may have been closed before it finished. Any other
+        error in a callback is shown as the job's error rather than escaping into the mainloop"""
+        try:
+            callback(*args)
+        except tk.TclError:
+            pass
+        except Exception as error:
+            self._report(job, error, callback)
+
+    def _report(self, job, error, failed=None):
+        """Shows an error through the job's on_error, or a message box when there is no job,
+        it has no on_error or on_error is the callback that failed"""
+        if job is not None and job.on_error and job.on_error is not failed:
+            self._safely(job, job.on_error, error)
+            return
+        name = job.name if job is not None else "Background task"
+        messagebox.showerror("Error", f"{name} failed: {error}")
+
+    def _changed(self):
+        for listener in self.listeners:
+            listener()
+
+    def shutdown(self):
+        for job in list(self.jobs):
+            job.cancel()
+        self.thread_pool.shutdown(wait=False, cancel_futures=True)
+        if self.process_pool is not None:
+            self.process_pool.shutdown(wait=False, cancel_futures=True)
+
+
+class TextRows:
+    """A long string as a sequence of fixed width rows, sliced only when a row is read"""
+    def __init__(self, text, width):
+        self.text = text
+        self.width = width
+
+    def __len__(self):
+        return -(-len(self.text) // self.width)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        return self.text[index * self.width:(index + 1) * self.width]
+
+
+class FibonacciRows:
+    """F(0) to F(count - 1) (mod m) as a sequence. A slice is seeded with F(start) and
+    F(start + 1) by fast doubling and only its own terms are generated, nothing is kept
+    between reads, so jumping to the end costs the same as the first page"""
+    def __init__(self, count, mod=None):
+        self.count = count
+        self.mod = mod
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self.count)
+            if step != 1:
+                return [self[i] for i in range(start, stop, step)]
+            a, b = fibonacci(start, self.mod), fibonacci(start + 1, self.mod)
+            terms = []
+            for _ in range(start, stop):
+                terms.append(a)
+                a, b = b, a + b if self.mod is None else (a + b) % self.mod
+            return terms
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError("Fibonacci row out of range")
+        return fibonacci(index, self.mod)
+
+    @staticmethod
+    def describe(term):
+        """Terms too long for a row show their leading digits and length, found from the top
+        64 bits, converting a million digit number to text takes about a second"""
+        bits = term.bit_length()
+        if bits <= 3 * ResultViewer.ROW_CHARS:
+            return str(term)
+        shift = bits - 64
+        exponent = log10(term >> shift) + shift * log10(2)
+        return f"{int(10 ** (exponent % 1 + 7))}... ({int(exponent) + 1} digits)"
+
+
+class ResultViewer(tk.Frame):
+    """Scrollable list of a result of any length. Only the rows on screen are sliced out and
+    formatted, so showing a million values costs the same as showing ten. items needs len and
+    slicing, e.g. a list, a memoryview, PalindromeSpans, TextRows or FibonacciRows. The full result
+    can be streamed to a file as a background job"""
+    """Longest text shown for one row, the export always writes rows in full"""
+    ROW_CHARS = 200
+
+    def __init__(self, parent, scheduler, rows=8, width=60):
+        super().__init__(parent)
+        self.scheduler = scheduler
+        self.rows = rows
+        self.items = []
+        self.nbytes = 0
+        self.formatter = str
+        self.first = 0
+
+        self.summary = tk.Label(self, text="", anchor="w", justify="left", font=("Courier", 9))
+        self.summary.pack(fill="x")
+        body = tk.Frame(self)
+        body.pack(fill="x")
+        self.text = tk.Text(body, height=rows, width=width, wrap="none", font=("Courier", 9))
+        self.scrollbar = tk.Scrollbar(body, command=self.scroll)
+        self.scrollbar.pack(side="right", fill="y")
+        self.text.pack(side="left", fill="x", expand=True)
+        self.text.config(state="disabled")
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.text.bind(sequence, self.wheel)
+        tk.Button(self, text="Export...", command=self.export).pack(anchor="e")
+        self.pack(pady=5, fill="x", padx=10)
+
+    def show(self, items, formatter=str, title="Result"):
+        """Summary line with the length and a head and tail preview, then the first rows"""
+        self.items = items
+        self.nbytes = size_of(items)
+        self.formatter = formatter
+        self.first = 0
+        n = len(items)
+        short = lambda item: formatter(item)[:20]
+        preview = [short(item) for item in items[:3]]
+        if n > 3:
+            preview += ["..."] * (n > 6) + [short(item) for item in items[max(n - 3, 3):]]
+        preview = ", ".join(preview)
+        self.summary.config(text=f"{title}: {n} items\n{preview}")
+        self.render()
+
+    def render(self):
+        n = len(self.items)
+        rows = self.items[self.first:self.first + self.rows]
+        lines = [f"{self.first + i + 1:>9}  {self.formatter(item)[:self.ROW_CHARS]}" for i, item in enumerate(rows)]
+        self.text.config(state="normal")
+        self.text.delete("1.0", tk.END)
+        self.text.insert(tk.END, "\n".join(lines))
+        self.text.config(state="disabled")
+        if n:
+            self.scrollbar.set(self.first / n, min(self.first + self.rows, n) / n)
+        else:
+            self.scrollbar.set(0, 1)
+
+    def scroll(self, action, amount, unit=None):
+        n = len(self.items)
+        if action == "moveto":
+            first = int(float(amount) * n)
+        else:
+            first = self.first + int(amount) * (self.rows if unit == "pages" else 1)
+        self.first = max(0, min(first, n - self.rows))
+        self.render()
+
+    def wheel(self, event):
+        if event.num == 4 or event.delta > 0:
+            self.scroll("scroll", -3, "units")
+        else:
+            self.scroll("scroll", 3, "units")
+        return "break"
+
+    def export(self):
+        """One row per line, written a chunk at a time so the full text is never built"""
+        items, formatter = self.items, self.formatter
+        if not len(items): return
+        path = filedialog.asksaveasfilename(title="Export result as")
+        if not path: return
+
+        def write(job):
+            n = len(items)
+            with open(path, "w") as out:
+                for start in range(0, n, 10_000):
+                    job.raise_if_cancelled()
+                    out.write("\n".join(map(formatter, items[start:start + 10_000])) + "\n")
+                    job.progress(min(start + 10_000, n), n, "Exporting")
+            return n
+
+        self.scheduler.run_in_thread(f"Export {os.path.basename(path)}", write,
+                                     on_done=lambda n: self.summary.config(text=f"{n} items exported to {path}"))
+
+
+class NumberInput(tk.Frame):
+    """Entry for a list of numbers shared by the views that sort or summarise one, with an
+    Import button for text files. Parsing is done in bulk by parse_numbers and the result kept
+    until the text changes, so pressing a button again does not parse the input again"""
+    def __init__(self, parent, scheduler, width=50, allow_float=True):
+        super().__init__(parent)
+        self.scheduler = scheduler
+        self.allow_float = allow_float
+        self.text = tk.StringVar()
+        self.entry = tk.Entry(self, width=width, textvariable=self.text)
+        self.entry.pack(side="left")
+        tk.Button(self, text="Import...", command=self.import_file).pack(side="left", padx=5)
+        self.pack(pady=5)
+
+        self.parsed_text = None
+        self.parsed = None
+        self.nbytes = 0
+        """Values from an imported file, dropped once the user edits the summary in the entry"""
+        self.imported = None
+        self.imported_label = None
+        self.text.trace_add("write", lambda *args: self.forget_import())
+
+    def values(self):
+        """The parsed numbers, raises ParseError naming the bad token and its position.
+        The returned list is shared, callers must not change it"""
+        if self.imported is not None:
+            return self.imported
+        text = self.text.get()
+        if text != self.parsed_text:
+            self.parsed = parse_numbers(text, self.allow_float)
+            self.parsed_text = text
+            self.nbytes = size_of(self.parsed)
+        return self.parsed
+
+    def forget_import(self):
+        if self.imported is not None and self.text.get() != self.imported_label:
+            self.imported = None
+            self.nbytes = size_of(self.parsed)
+
+    def import_file(self):
+        """Large files would make the entry itself slow, so it only shows a summary of them.
+        Dataset files are mapped rather than parsed, and process jobs only pickle their path"""
+        path = filedialog.askopenfilename(title="Numbers file")
+        if not path: return
+
+        def loaded(values):
+            self.imported = values
+            self.nbytes = size_of(values)
+            self.imported_label = f"<{len(values)} values from {os.path.basename(path)}>"
+            self.text.set(self.imported_label)
+
+        def load(job):
+            return Dataset(path) if is_dataset(path) else parse_file(path, self.allow_float)
+
+        self.scheduler.run_in_thread(f"Import {os.path.basename(path)}", load,
+                                     on_done=loaded,
+                                     on_error=lambda error: self.text.set(f"<{error}>"))
+
+
+class JobStatusBar(tk.Frame):
+    """Bar along the bottom of the window listing running jobs from every view,
+    with the selected job's progress and a button to cancel it"""
+    def __init__(self, parent, scheduler):
+        super().__init__(parent, bd=1, relief="sunken")
+        self.scheduler = scheduler
+
+        self.summary = tk.Label(self, text="No jobs running", anchor="w", width=18)
+        self.summary.pack(side="left", padx=5)
+        self.job_choice = ttk.Combobox(self, state="readonly", width=30)
+        self.job_choice.pack(side="left", padx=5)
+        self.progress = ttk.Progressbar(self, length=150)
+        self.progress.pack(side="left", padx=5)
+        tk.Button(self, text="Cancel", command=self.cancel_selected).pack(side="left", padx=5)
+
+        scheduler.listeners.append(self.refresh)
+
+    def selected_job(self):
+        jobs = self.scheduler.jobs
+        index = self.job_choice.current()
+        if not jobs:
+            return None
+        return jobs[index] if 0 <= index < len(jobs) else jobs[-1]
+
+    def refresh(self):
+        jobs = self.scheduler.jobs
+        selected = self.selected_job()
+        self.summary.config(text=f"{len(jobs)} job(s) running" if jobs else "No jobs running")
+        self.job_choice.config(values=[job.name for job in jobs])
+        if selected is None:
+            self.job_choice.set("")
+            self.progress.stop()
+            self.progress.config(mode="determinate", value=0)
+            return
+
+        self.job_choice.current(jobs.index(selected))
+        if selected.total:
+            self.progress.stop()
+            self.progress.config(mode="determinate", maximum=selected.total, value=selected.done)
+        elif str(self.progress.cget("mode")) != "indeterminate":
+            """Process jobs and jobs that have not reported yet have no known progress"""
+            self.progress.config(mode="indeterminate")
+            self.progress.start(20)
+
+    def cancel_selected(self):
+        job = self.selected_job()
+        if job is not None:
+            job.cancel()
 
 
 if __name__ == "__main__":
+    lift_digit_limit()
+    AlgorithmHistory.open_database(os.environ.get(
+        "ALGORITHM_HISTORY_DB", os.path.join(os.path.expanduser("~"), ".algorithm_workshop_history.sqlite3")))
+    RESULTS.use_disk(os.environ.get(
+        "ALGORITHM_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".algorithm_workshop_cache")))
     root = tk.Tk()
     app = MainWindow(root)
     root.mainloop()
\ No newline at end of file
@@ -0,0 +1,256 @@
+"""Instrumentation for the algorithms, kept free of tkinter so it works in jobs and on the command line.
+TimeTracker records each run into a MetricsRegistry, which the dashboard view in main.py reads"""
+import io
+import sys
+import threading
+import time
+import tracemalloc
+from collections import deque
+from functools import partial
+
+
+class Histogram:
+    """The most recent samples of one measurement, percentiles are worked out when asked for
+    so recording a sample stays an append"""
+    def __init__(self, size=1024):
+        self.samples = deque(maxlen=size)
+
+    def add(self, value):
+        self.samples.append(value)
+
+    def percentiles(self, points=(0.5, 0.95, 0.99)):
+        if not self.samples:
+            return [0.0 for _ in points]
+        ordered = sorted(self.samples)
+        last = len(ordered) - 1
+        return [ordered[round(point * last)] for point in points]
+
+
+class Metric:
+    """Everything recorded for one algorithm"""
+    def __init__(self, name):
+        self.name = name
+        self.calls = 0
+        self.errors = 0
+        self.wall = Histogram()
+        self.cpu = Histogram()
+        self.blocks = Histogram()
+        self.peak = Histogram()
+        self.counters = {}
+        self.profile = ""
+
+
+class MetricsRegistry:
+    """In-process store of Metrics by name. enabled, trace_memory and profile are read on every
+    tracked call, turning tracking off leaves one attribute check per call"""
+    def __init__(self):
+        self.enabled = True
+        """tracemalloc and cProfile slow the algorithm down a lot, so both are opt in"""
+        self.trace_memory = False
+        self.profile = False
+        self.lock = threading.Lock()
+        self.metrics = {}
+
+    def record(self, name, sample, calls=1):
+        """sample is the dict returned by measure"""
+        with self.lock:
+            metric = self.metrics.get(name)
+            if metric is None:
+                metric = self.metrics[name] = Metric(name)
+            metric.calls += calls
+            if sample["error"]:
+                metric.errors += 1
+            metric.wall.add(sample["wall"])
+            metric.cpu.add(sample["cpu"])
+            metric.blocks.add(sample["blocks"])
+            if sample["peak"] is not None:
+                metric.peak.add(sample["peak"])
+            for counter, value in sample["counters"].items():
+                metric.counters[counter] = metric.counters.get(counter, 0) + value
+            if sample["profile"]:
+                metric.profile = sample["profile"]
+
+    def add_counters(self, name, counters):
+        """Counters a process job sends back with its result, added to the metric its
+        sample was recorded under"""
+        if not self.enabled:
+            return
+        with self.lock:
+            metric = self.metrics.get(name)
+            if metric is None:
+                metric = self.metrics[name] = Metric(name)
+            for counter, value in counters.items():
+                metric.counters[counter] = metric.counters.get(counter, 0) + value
+
+    def snapshot(self):
+        """One row per metric with p50/p95/p99 of each histogram, safe to call from any thread"""
+        with self.lock:
+            return [{
+                "name": metric.name,
+                "calls": metric.calls,
+                "errors": metric.errors,
+                "wall": metric.wall.percentiles(),
+                "cpu": metric.cpu.percentiles(),
+                "blocks": metric.blocks.percentiles(),
+                "peak": metric.peak.percentiles(),
+                "counters": dict(metric.counters),
+                "profile": metric.profile,
+            } for metric in self.metrics.values()]
+
+    def reset(self):
+        with self.lock:
+            self.metrics.clear()
+
+
+METRICS = MetricsRegistry()
+
+
+class MemoryTrace:
+    """tracemalloc is process wide, so measured calls running at the same time share one trace.
+    The first user starts it and resets the peak, the last one stops it unless something else
+    had it running already. Peaks of overlapping calls therefore cover each other's allocations"""
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.users = 0
+        self.owned = False
+
+    def acquire(self):
+        with self.lock:
+            if self.users == 0:
+                self.owned = not tracemalloc.is_tracing()
+                if self.owned:
+                    tracemalloc.start()
+                tracemalloc.reset_peak()
+            self.users += 1
+
+    def release(self):
+        """Returns the peak traced memory in bytes"""
+        with self.lock:
+            peak = tracemalloc.get_traced_memory()[1]
+            self.users -= 1
+            if self.users == 0 and self.owned:
+                tracemalloc.stop()
+            return peak
+
+
+MEMORY_TRACE = MemoryTrace()
+
+
+def measure(func, args=(), kwargs=None, counters=None, trace_memory=False, profile=False, profile_lines=15):
+    """Runs func once and returns (result, sample). Module level so process jobs can run it in
+    the worker and send the sample back. CPU time is the calling thread's, so other jobs running
+    at the same time are not counted. blocks is the net change in the interpreter's live memory
+    blocks across the call, from every thread, not the number allocated. Peak memory is only
+    known when trace_memory is set. A raised error is kept in the sample and raised again by
+    the caller"""
+    kwargs = kwargs or {}
+    counters = {} if counters is None else counters
+    if trace_memory:
+        MEMORY_TRACE.acquire()
+    profiler = None
+    if profile:
+        """Imported here, cProfile and pstats take longer to import than the rest of the app's modules"""
+        import cProfile
+        profiler = cProfile.Profile()
+
+    result = error = None
+    blocks = sys.getallocatedblocks()
+    cpu_start = time.thread_time()
+    wall_start = time.perf_counter()
+    try:
+        if profiler is not None:
+            result = profiler.runcall(func, *args, **kwargs)
+        else:
+            result = func(*args, **kwargs)
+    except Exception as exc:
+        error = exc
+    wall = time.perf_counter() - wall_start
+    cpu = time.thread_time() - cpu_start
+    blocks = sys.getallocatedblocks() - blocks
+
+    peak = MEMORY_TRACE.release() if trace_memory else None
+    report = ""
+    if profiler is not None:
+        import pstats
+        text = io.StringIO()
+        pstats.Stats(profiler, stream=text).sort_stats("cumulative").print_stats(profile_lines)
+        report = text.getvalue()
+
+    return result, {"wall": wall, "cpu": cpu, "blocks": blocks, "peak": peak, "counters": dict(counters),
+                    "profile": report, "error": error}
+
+
+def measured_call(func, *args, trace_memory=False, profile=False):
+    """Picklable wrapper for process jobs, the error travels back inside the sample"""
+    result, sample = measure(func, args, trace_memory=trace_memory, profile=profile)
+    if sample["error"] is not None:
+        raise sample["error"]
+    return result, sample
+
+
+class TimeTracker:
+    """Structural Design Pattern (TimeTracker) for Requirement 11.
+    Decorator that records wall and CPU time, net memory blocks, call counts and optionally peak
+    memory and a cProfile report of every call into a MetricsRegistry. Recursive calls are
+    counted but only the outermost call is timed. Calls on different threads keep their own
+    depth, nested call count and counters"""
+    def __init__(self, func, name=None, registry=METRICS):
+        self.func = func
+        self.name = name or getattr(func, "__name__", "algorithm")
+        self.registry = registry
+        """Called with a one line summary after each outermost call, from the calling thread"""
+        self.notify = None
+        self.state = threading.local()
+
+    @property
+    def counters(self):
+        """Counters the wrapped function can fill in, e.g. comparisons. Each outermost call
+        starts a new dict for its own thread"""
+        state = self.state
+        if not hasattr(state, "counters"):
+            state.counters = {}
+        return state.counters
+
+    @classmethod
+    def named(cls, name, registry=METRICS):
+        """@TimeTracker.named("sort") for a metric name other than the function's"""
+        return lambda func: cls(func, name, registry)
+
+    def __get__(self, instance, owner):
+        """Lets the tracker decorate methods"""
+        return self if instance is None else partial(self, instance)
+
+    def __call__(self, *args, **kwargs):
+        registry = self.registry
+        if not registry.enabled:
+            return self.func(*args, **kwargs)
+        state = self.state
+        if getattr(state, "depth", 0):
+            state.nested_calls += 1
+            return self.func(*args, **kwargs)
+
+        state.counters = {}
+        state.nested_calls = 0
+        state.depth = 1
+        try:
+            """cProfile cannot run inside another profiler, e.g. one started by a debugger"""
+            result, sample = measure(self.func, args, kwargs, state.counters, registry.trace_memory,
+                                     registry.profile and sys.getprofile() is None)
+        finally:
+            state.depth = 0
+        registry.record(self.name, sample, 1 + state.nested_calls)
+        if sample["error"] is not None:
+            raise sample["error"]
+
+        if self.notify is not None:
+            self.notify(self.describe(sample))
+        return result
+
+    @staticmethod
+    def describe(sample):
+        message = f"Time taken: {sample['wall']:.6f}s wall, {sample['cpu']:.6f}s CPU"
+        if sample["peak"] is not None:
+            message += f", peak {sample['peak'] / 1024:.1f} KiB"
+        for name, value in sample["counters"].items():
+            message += f", {name}: {value}"
+        return message
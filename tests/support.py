@@ -0,0 +1,8 @@
+"""Helpers shared by the test modules"""
+import algorithms
+
+
+def backends():
+    """Values of algorithms.np to run a test under with mock.patch.object: None for the pure
+    Python path, then the NumPy module when it is installed so both paths are checked"""
+    return (None, algorithms.np) if algorithms.np is not None else (None,)
@@ -0,0 +1,46 @@
+"""Tests for the benchmark suite's cases and its baseline check, not for any timings"""
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+
+from algorithms import ALGORITHMS
+from benchmarks import DISTRIBUTIONS, suite_case, compare_baseline
+
+
+class SuiteTest(unittest.TestCase):
+    def test_every_algorithm_has_a_case(self):
+        for name in ALGORITHMS:
+            for distribution in DISTRIBUTIONS:
+                with self.subTest(algorithm=name, distribution=distribution):
+                    func = suite_case(name, 200, distribution)
+                    if distribution == "random":
+                        self.assertIsNotNone(func)
+                    if func is not None:
+                        func()
+
+    def test_baseline(self):
+        baseline = [{"algorithm": "sort", "n": 1000, "distribution": "random", "median": 0.010},
+                    {"algorithm": "fibonacci", "n": 1000, "distribution": "random", "median": 0.0001}]
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "baseline.json")
+            with open(path, "w") as file:
+                json.dump(baseline, file)
+
+            """Within the threshold, or under the noise floor, passes"""
+            results = [dict(baseline[0], median=0.012), dict(baseline[1], median=0.0009)]
+            with contextlib.redirect_stdout(io.StringIO()) as output:
+                compare_baseline(results, path, 0.25)
+            self.assertIn("No regressions", output.getvalue())
+
+            results[0]["median"] = 0.013
+            with contextlib.redirect_stdout(io.StringIO()) as output, self.assertRaises(SystemExit) as exit:
+                compare_baseline(results, path, 0.25)
+            self.assertEqual(exit.exception.code, 1)
+            self.assertIn("sort n=1000 random", output.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+"""Tests for the result cache's byte budget, eviction and disk tier"""
+import os
+import tempfile
+import unittest
+
+from cache import ResultCache, MISSING, size_of
+
+
+class ResultCacheTest(unittest.TestCase):
+    def test_keys(self):
+        key = ResultCache.key
+        self.assertEqual(key("sort", [3, 1, 2], reverse=True), key("sort", [3, 1, 2], reverse=True))
+        self.assertNotEqual(key("sort", [3, 1, 2], reverse=True), key("sort", [3, 1, 2], reverse=False))
+        self.assertNotEqual(key("sort", [3, 1, 2]), key("merge-sort", [3, 1, 2]))
+        self.assertNotEqual(key("sort", [1, 2]), key("sort", [1, 2, 0]))
+        self.assertNotEqual(key("sort", [1, 2 ** 70]), key("sort", [1, 2 ** 71]))
+        self.assertNotEqual(key("rsa", b"ab"), key("rsa", "ab"))
+
+    def test_byte_budget(self):
+        """The least recently used entries go first once the total passes max_bytes"""
+        value = list(range(1000))
+        size = size_of(value)
+        cache = ResultCache(max_bytes=3 * size)
+        for key in "abc":
+            cache.put(key, list(value))
+        self.assertEqual(cache.get("a"), value)
+        cache.put("d", list(value))
+        self.assertIs(cache.get("b"), MISSING)
+        for key in "acd":
+            self.assertEqual(cache.get(key), value)
+        stats = cache.stats()
+        self.assertEqual((stats["entries"], stats["bytes"], stats["evictions"]), (3, 3 * size, 1))
+        self.assertEqual((stats["hits"], stats["misses"]), (4, 1))
+
+        """A result larger than the whole budget is never stored"""
+        cache.put("huge", list(range(10_000)))
+        self.assertIs(cache.get("huge"), MISSING)
+        self.assertEqual(cache.stats()["entries"], 3)
+        cache.clear()
+        self.assertEqual(cache.stats()["bytes"], 0)
+
+    def test_disk_tier(self):
+        with tempfile.TemporaryDirectory() as directory:
+            cache = ResultCache(disk_dir=directory, disk_seconds=1.0)
+            cache.put("fast", [1], seconds=0.1)
+            cache.put("slow", [2], seconds=2.0)
+            self.assertEqual(sorted(os.listdir(directory)), ["slow.pickle"])
+
+            """A new session finds the slow result on disk"""
+            fresh = ResultCache(disk_dir=directory)
+            self.assertIs(fresh.get("fast"), MISSING)
+            self.assertEqual(fresh.get("slow"), [2])
+            self.assertEqual(fresh.stats()["disk_hits"], 1)
+            self.assertEqual(fresh.get("slow"), [2])
+            self.assertEqual(fresh.stats()["hits"], 1)
+
+    def test_disk_budget(self):
+        with tempfile.TemporaryDirectory() as directory:
+            cache = ResultCache(disk_seconds=0)
+            cache.use_disk(directory, max_disk_bytes=2500)
+            for i in range(5):
+                cache.put(str(i), bytes(1000), seconds=1)
+                os.utime(os.path.join(directory, f"{i}.pickle"), (i, i))
+            self.assertEqual(sorted(os.listdir(directory)), ["3.pickle", "4.pickle"])
+
+    def test_size_of(self):
+        self.assertGreater(size_of(list(range(10 ** 5))), 10 ** 5 * 28)
+        self.assertGreater(size_of({i: str(i) for i in range(1000)}), 1000 * 28)
+
+        class Sized:
+            nbytes = 12345
+
+        self.assertEqual(size_of(Sized()), 12345)
+
+
+if __name__ == "__main__":
+    unittest.main()
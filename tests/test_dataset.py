@@ -0,0 +1,105 @@
+"""Tests for the memory mapped dataset format"""
+import os
+import pickle
+import tempfile
+import unittest
+
+from algorithms import (Dataset, write_dataset, convert_to_dataset, is_dataset, sort_values, merge_sort,
+                        summary_statistics)
+import workshop
+
+
+class DatasetTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def path(self, name, text=None):
+        path = os.path.join(self.directory, name)
+        if text is not None:
+            with open(path, "w") as file:
+                file.write(text)
+        return path
+
+    def test_round_trip(self):
+        for values, typecode in (([3, -1, 2 ** 62], "q"), ([1, 2.5], "d"), ([], "q")):
+            with self.subTest(values=values):
+                path = self.path("values.awds")
+                self.assertEqual(write_dataset(path, values), len(values))
+                self.assertTrue(is_dataset(path))
+                dataset = Dataset(path)
+                self.assertEqual((dataset.typecode, len(dataset)), (typecode, len(values)))
+                self.assertEqual(dataset.tolist(), values)
+                self.assertEqual(list(dataset), values)
+                self.assertEqual(pickle.loads(pickle.dumps(dataset)).tolist(), values)
+                del dataset
+
+    def test_convert(self):
+        text = self.path("values.txt", "5,3,\n-2 9")
+        dataset_path = self.path("values.awds")
+        self.assertEqual(convert_to_dataset(text, dataset_path, chunk_values=3), 4)
+        dataset = Dataset(dataset_path)
+        self.assertEqual((dataset.typecode, dataset.tolist()), ("q", [5, 3, -2, 9]))
+        self.assertEqual(dataset[2], -2)
+        self.assertEqual(sort_values(dataset)[0], [-2, 3, 5, 9])
+        self.assertEqual(merge_sort(dataset), [-2, 3, 5, 9])
+        self.assertEqual(summary_statistics(dataset)["largest"], 9)
+        del dataset
+
+        """A float anywhere makes the whole dataset float64"""
+        self.assertEqual(convert_to_dataset(self.path("floats.txt", "1,2,0.5"), dataset_path, chunk_values=2), 3)
+        self.assertEqual(Dataset(dataset_path).tolist(), [1.0, 2.0, 0.5])
+
+    def test_rejects(self):
+        text = self.path("values.txt", "1,2,3,4,5,6,7,8,9")
+        self.assertFalse(is_dataset(text))
+        with self.assertRaises(ValueError):
+            Dataset(text)
+        with self.assertRaises(ValueError):
+            convert_to_dataset(self.path("big.txt", f"1,{2 ** 64}"), self.path("big.awds"))
+        with self.assertRaises(ValueError):
+            convert_to_dataset(self.path("bad.txt", "1,x"), self.path("bad.awds"))
+        for name, content in (("short.awds", b"AWDS"), ("truncated.awds", b"")):
+            with self.subTest(name=name):
+                path = self.path(name)
+                if content:
+                    with open(path, "wb") as file:
+                        file.write(content)
+                else:
+                    write_dataset(path, [1, 2, 3])
+                    os.truncate(path, os.path.getsize(path) - 8)
+                with self.assertRaises(ValueError):
+                    Dataset(path)
+
+    def test_failed_convert_keeps_the_old_dataset(self):
+        """Nothing but the dataset is left in the directory either way"""
+        dataset_path = self.path("values.awds")
+        write_dataset(dataset_path, [1, 2])
+        with self.assertRaises(ValueError):
+            convert_to_dataset(self.path("bad.txt", "3,x"), dataset_path)
+        self.assertEqual(Dataset(dataset_path).tolist(), [1, 2])
+        self.assertEqual(sorted(os.listdir(self.directory)), ["bad.txt", "values.awds"])
+
+    def test_command_line_input(self):
+        """sort, stats and search read a dataset --input as they read text"""
+        dataset_path = self.path("values.awds")
+        write_dataset(dataset_path, [5, 3, 3, -2, 9])
+        output = self.path("output")
+        workshop.main(["sort", "--input", dataset_path, "--output", output])
+        with open(output) as file:
+            self.assertEqual(file.read(), "-2,3,3,5,9\n")
+        workshop.main(["stats", "--input", dataset_path, "--output", output, "--percentiles", "0.5"])
+        with open(output) as file:
+            self.assertEqual(file.read(), "smallest: -2\nlargest: 9\nmode: [3]\np50: 3.0\n")
+        workshop.main(["stats", "--stream", "--input", dataset_path, "--output", output])
+        with open(output) as file:
+            self.assertIn("largest: 9", file.read())
+        workshop.main(["search", "--input", dataset_path, "--output", output,
+                       "--queries", self.path("queries.txt", "first 3\nrank 4\n")])
+        with open(output) as file:
+            self.assertEqual(file.read(), "1\n3\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,42 @@
+"""Tests for the factorial engine against math.factorial"""
+import math
+import unittest
+
+from algorithms import FactorialEngine, product_range, recursive_factorial
+
+
+class FactorialTest(unittest.TestCase):
+    def test_matches_math_factorial(self):
+        engine = FactorialEngine()
+        for n in list(range(30)) + [100, 1000, 5000, 999, 5003]:
+            with self.subTest(n=n):
+                self.assertEqual(engine.factorial(n), math.factorial(n))
+        self.assertEqual(recursive_factorial(50), math.factorial(50))
+        self.assertEqual(product_range(10, 20), math.factorial(20) // math.factorial(9))
+        self.assertEqual(product_range(5, 4), 1)
+
+    def test_memo_is_bounded(self):
+        engine = FactorialEngine(cache_size=3)
+        for n in range(10, 100, 10):
+            engine.factorial(n)
+        self.assertEqual(list(engine.cache), [70, 80, 90])
+
+    def test_mod_and_digits(self):
+        engine = FactorialEngine()
+        """1_000_003 is prime, n past the halfway point uses Wilson's theorem"""
+        for n in (0, 1, 10, 200, 1000):
+            for m in (1, 7, 1_000_000_007):
+                self.assertEqual(engine.factorial_mod(n, m), math.factorial(n) % m)
+            self.assertEqual(engine.digit_count(n), len(str(math.factorial(n))))
+        self.assertEqual(engine.factorial_mod(1_000_001, 1_000_003), 1)
+        self.assertEqual(engine.factorial_mod(1_000_002, 1_000_003), 1_000_002)
+
+    def test_negative(self):
+        engine = FactorialEngine()
+        for call in (engine.factorial, engine.digit_count, lambda n: engine.factorial_mod(n, 7)):
+            with self.assertRaises(ValueError):
+                call(-1)
+
+
+if __name__ == "__main__":
+    unittest.main()
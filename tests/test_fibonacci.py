@@ -0,0 +1,40 @@
+"""Tests for fast doubling Fibonacci against plain iteration"""
+import unittest
+
+from algorithms import fibonacci, fibonacci_sequence
+
+
+def iterated(count):
+    a, b = 0, 1
+    terms = []
+    for _ in range(count):
+        terms.append(a)
+        a, b = b, a + b
+    return terms
+
+
+class FibonacciTest(unittest.TestCase):
+    def test_matches_iteration(self):
+        expected = iterated(300)
+        self.assertEqual([fibonacci(n) for n in range(300)], expected)
+        self.assertEqual(list(fibonacci_sequence(300)), expected)
+        self.assertEqual(fibonacci(5000), iterated(5001)[-1])
+
+    def test_modulus(self):
+        expected = iterated(300)
+        for mod in (1, 2, 97, 10 ** 9 + 7):
+            with self.subTest(mod=mod):
+                self.assertEqual([fibonacci(n, mod) for n in range(300)], [value % mod for value in expected])
+                self.assertEqual(list(fibonacci_sequence(300, mod)), [value % mod for value in expected])
+        """Pisano period of 10 is 60"""
+        self.assertEqual(fibonacci(60 * 10 ** 16 + 7, 10), fibonacci(7, 10))
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            fibonacci(-1)
+        with self.assertRaises(ValueError):
+            fibonacci(5, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
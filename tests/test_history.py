@@ -0,0 +1,54 @@
+"""Tests for the run history ring buffer and its SQLite store"""
+import os
+import tempfile
+import time
+import unittest
+
+from history import HistoryStore, preview, digest
+
+
+class HistoryStoreTest(unittest.TestCase):
+    def test_memory_only(self):
+        store = HistoryStore(memory_size=3)
+        for i in range(5):
+            store.add("sort" if i % 2 else "fibonacci", f"run {i}", result=list(range(i)))
+        self.assertEqual([r["details"] for r in store.recent()], ["run 2", "run 3", "run 4"])
+        self.assertEqual([r["details"] for r in store.recent(1)], ["run 4"])
+        self.assertEqual([r["details"] for r in store.query("sort")], ["run 3"])
+
+    def test_sqlite(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "history.db")
+            store = HistoryStore(path, memory_size=2, batch_size=4, flush_interval=0.05)
+            start = time.time()
+            for i in range(10):
+                store.add("sort", f"run {i}", parameters={"reverse": i % 2 == 1, "big": 2 ** 100},
+                          input_size=i, duration=0.5, result=list(range(i)))
+            store.add("factorial", "run 10", result=2 ** 1000)
+            rows = store.query("sort", limit=3)
+            self.assertEqual([row["input_size"] for row in rows], [9, 8, 7])
+            self.assertIn('"reverse": true', rows[0]["parameters"])
+            self.assertEqual(rows[0]["digest"], digest(list(range(9))))
+            self.assertEqual(len(store.query(since=start)), 11)
+            self.assertEqual(store.query(until=start), [])
+            store.close()
+
+            """A new store reads the same file, only the ring buffer starts empty"""
+            reopened = HistoryStore(path)
+            self.assertEqual(reopened.recent(), [])
+            self.assertEqual(reopened.query(limit=1)[0]["preview"], "1001 bit int")
+            reopened.close()
+
+    def test_preview_and_digest(self):
+        self.assertEqual(preview(list(range(3))), "0, 1, 2")
+        self.assertTrue(preview(list(range(1000))).endswith("(1000 items)"))
+        self.assertTrue(preview("x" * 200).endswith("(200 chars)"))
+        self.assertIsNone(preview(None))
+        self.assertEqual(digest(list(range(10))), digest(list(range(10))))
+        self.assertNotEqual(digest(list(range(10))), digest(list(range(11))))
+        self.assertNotEqual(digest("abc"), digest("abd"))
+        self.assertEqual(len(digest(list(range(10 ** 6)))), 32)
+
+
+if __name__ == "__main__":
+    unittest.main()
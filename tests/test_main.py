@@ -0,0 +1,150 @@
+"""Tests for the parts of main.py that run without a display"""
+import math
+import threading
+import time
+import unittest
+from unittest import mock
+
+from algorithms import fibonacci
+from main import JobScheduler, JobCancelled, TextRows, FibonacciRows, FactorialRecursion, MergeSort
+
+
+class FakeRoot:
+    """Stands in for Tk, after only records the callback so the tests drive poll themselves"""
+    def __init__(self):
+        self.scheduled = []
+
+    def after(self, ms, callback):
+        self.scheduled.append(callback)
+
+
+class JobSchedulerTest(unittest.TestCase):
+    def setUp(self):
+        self.scheduler = JobScheduler(FakeRoot())
+        self.addCleanup(self.scheduler.shutdown)
+
+    def finish(self, job, timeout=30):
+        """Polls as the mainloop would until the job's callbacks have run"""
+        deadline = time.monotonic() + timeout
+        while not job.finished:
+            self.assertLess(time.monotonic(), deadline, "job did not finish")
+            self.scheduler.poll()
+            time.sleep(0.01)
+
+    def test_thread_job(self):
+        results, progress = [], []
+        release = threading.Event()
+
+        def task(job):
+            job.progress(1, 2, "Halfway")
+            release.wait(10)
+            return 42
+
+        job = self.scheduler.run_in_thread("answer", task, on_done=results.append,
+                                           on_progress=lambda job: progress.append((job.done, job.total, job.status)))
+        self.assertEqual(self.scheduler.jobs, [job])
+        release.set()
+        self.finish(job)
+        self.assertEqual(results, [42])
+        self.assertEqual(progress, [(1, 2, "Halfway")])
+        self.assertEqual(self.scheduler.jobs, [])
+
+    def test_errors_and_cancel(self):
+        errors, results = [], []
+        job = self.scheduler.run_in_thread("fails", lambda job: 1 // 0, on_done=results.append, on_error=errors.append)
+        self.finish(job)
+        self.assertIsInstance(errors[0], ZeroDivisionError)
+
+        started = threading.Event()
+
+        def task(job):
+            started.set()
+            while True:
+                job.raise_if_cancelled()
+                time.sleep(0.01)
+
+        job = self.scheduler.run_in_thread("cancelled", task, on_done=results.append, on_error=errors.append)
+        started.wait(10)
+        job.cancel()
+        self.finish(job)
+        self.assertEqual(results, [])
+        self.assertEqual(len(errors), 1)
+        self.assertRaises(JobCancelled, job.raise_if_cancelled)
+
+    def test_failing_callbacks(self):
+        """An error in on_done goes to on_error, one in on_error or a plain call to a message box,
+        and the poll is rescheduled either way"""
+        errors = []
+
+        def fail(result):
+            raise RuntimeError(f"cannot show {result}")
+
+        with mock.patch("main.messagebox") as messagebox:
+            job = self.scheduler.run_in_thread("shown", lambda job: 1, on_done=fail, on_error=errors.append)
+            self.finish(job)
+            job = self.scheduler.run_in_thread("unshown", lambda job: 2, on_done=fail, on_error=fail)
+            self.finish(job)
+            self.scheduler.call_in_ui(fail, 3)
+            self.scheduler.poll()
+        self.assertEqual([str(error) for error in errors], ["cannot show 1"])
+        self.assertEqual([call.args[1] for call in messagebox.showerror.call_args_list],
+                         ["unshown failed: cannot show 2", "Background task failed: cannot show 3"])
+
+        scheduled = len(self.scheduler.root.scheduled)
+        self.scheduler.updates.put(("progress", None, None))
+        with self.assertRaises(TypeError):
+            self.scheduler.poll()
+        self.assertEqual(len(self.scheduler.root.scheduled), scheduled + 1)
+
+    def test_process_job(self):
+        results = []
+        job = self.scheduler.run_in_process("F(1000)", fibonacci, 1000, on_done=results.append)
+        self.finish(job)
+        self.assertEqual(results, [fibonacci(1000)])
+
+    def test_recursive_factorial_in_worker(self):
+        """The view allows the recursive mode up to n = 992"""
+        results = []
+        job = self.scheduler.run_in_process("992!", FactorialRecursion.calculate, 992, "Recursive (teaching, n <= 992)",
+                                            None, on_done=results.append, on_error=results.append)
+        self.finish(job)
+        self.assertEqual(results, [str(math.factorial(992))])
+
+    def test_merge_sort_in_worker(self):
+        """The worker sends merge_sort's counters back with the sorted values"""
+        values = list(range(1000))
+        results = []
+        job = self.scheduler.run_in_process("Merge sort", MergeSort.calculate, values, True, False,
+                                            on_done=results.append, on_error=results.append)
+        self.finish(job)
+        self.assertEqual(results, [(values[::-1], {"comparisons": 999})])
+        self.assertEqual(MergeSort.calculate(values[::-1], False, True), (values, {}))
+
+
+class RowsTest(unittest.TestCase):
+    def test_fibonacci_rows(self):
+        terms = [fibonacci(n) for n in range(500)]
+        rows = FibonacciRows(500)
+        self.assertEqual(len(rows), 500)
+        self.assertEqual(rows[:], terms)
+        self.assertEqual(rows[123:140], terms[123:140])
+        self.assertEqual(rows[::7], terms[::7])
+        self.assertEqual(rows[-1], terms[-1])
+        self.assertEqual(FibonacciRows(300, 97)[250:300], [term % 97 for term in terms[250:300]])
+        with self.assertRaises(IndexError):
+            rows[500]
+
+    def test_describe(self):
+        self.assertEqual(FibonacciRows.describe(fibonacci(100)), str(fibonacci(100)))
+        text = str(fibonacci(20_000))
+        self.assertEqual(FibonacciRows.describe(fibonacci(20_000)), f"{text[:8]}... ({len(text)} digits)")
+
+    def test_text_rows(self):
+        rows = TextRows("abcdefghij", 4)
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(rows[:], ["abcd", "efgh", "ij"])
+        self.assertEqual(rows[-1], "ij")
+
+
+if __name__ == "__main__":
+    unittest.main()
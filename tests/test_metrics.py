@@ -0,0 +1,140 @@
+"""Tests for the TimeTracker decorator and the metrics registry it records into"""
+import threading
+import time
+import tracemalloc
+import unittest
+
+from metrics import MemoryTrace, MetricsRegistry, TimeTracker, measure, measured_call
+
+
+class TimeTrackerTest(unittest.TestCase):
+    def setUp(self):
+        self.registry = MetricsRegistry()
+
+    def row(self, name):
+        return next(row for row in self.registry.snapshot() if row["name"] == name)
+
+    def test_records_calls(self):
+        @TimeTracker.named("sum", self.registry)
+        def total(values):
+            return sum(values)
+
+        for n in range(10):
+            self.assertEqual(total(range(n)), n * (n - 1) // 2)
+        row = self.row("sum")
+        self.assertEqual((row["calls"], row["errors"]), (10, 0))
+        self.assertEqual(len(row["wall"]), 3)
+        self.assertLessEqual(row["wall"][0], row["wall"][1])
+
+    def test_nested_calls_and_counters(self):
+        """Recursive calls are counted, only the outermost is timed and notifies"""
+        messages = []
+
+        def fib(n):
+            tracked.counters["calls"] = tracked.counters.get("calls", 0) + 1
+            return n if n < 2 else tracked(n - 1) + tracked(n - 2)
+
+        tracked = TimeTracker(fib, registry=self.registry)
+        tracked.notify = messages.append
+        self.assertEqual(tracked(10), 55)
+        row = self.row("fib")
+        self.assertEqual(row["calls"], 177)
+        self.assertEqual(row["counters"], {"calls": 177})
+        self.assertEqual(len(messages), 1)
+        self.assertIn("calls: 177", messages[0])
+
+    def test_threads_keep_their_own_counters(self):
+        """Both calls are in progress at once, each sees only its own counts"""
+        barrier = threading.Barrier(2)
+
+        def count(n):
+            for _ in range(n):
+                tracked.counters["steps"] = tracked.counters.get("steps", 0) + 1
+            barrier.wait(5)
+            return dict(tracked.counters)
+
+        tracked = TimeTracker(count, registry=self.registry)
+        results = {}
+        threads = [threading.Thread(target=lambda n=n: results.update({n: tracked(n)})) for n in (3, 5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results, {3: {"steps": 3}, 5: {"steps": 5}})
+        self.assertEqual(self.row("count")["counters"], {"steps": 8})
+        self.assertEqual(self.row("count")["calls"], 2)
+
+    def test_thread_cpu_time(self):
+        """A busy thread does not show up in the CPU time of a sleeping call"""
+        stop = threading.Event()
+
+        def spin():
+            while not stop.is_set():
+                pass
+
+        spinner = threading.Thread(target=spin)
+        spinner.start()
+        try:
+            sample = measure(time.sleep, (0.1,))[1]
+        finally:
+            stop.set()
+            spinner.join()
+        self.assertLess(sample["cpu"], 0.05)
+
+    def test_memory_trace_is_shared(self):
+        """The trace stops with its last user, and is left running if it was started elsewhere"""
+        trace = MemoryTrace()
+        trace.acquire()
+        trace.acquire()
+        trace.release()
+        self.assertTrue(tracemalloc.is_tracing())
+        trace.release()
+        self.assertFalse(tracemalloc.is_tracing())
+
+        tracemalloc.start()
+        self.addCleanup(tracemalloc.stop)
+        trace.acquire()
+        self.assertGreater(trace.release(), 0)
+        self.assertTrue(tracemalloc.is_tracing())
+
+    def test_add_counters(self):
+        """Counters a process job sends back add to those of earlier calls"""
+        for _ in range(2):
+            self.registry.add_counters("sort", {"comparisons": 5})
+        self.assertEqual(self.row("sort")["counters"], {"comparisons": 10})
+
+    def test_errors(self):
+        tracked = TimeTracker(lambda: 1 // 0, "divide", self.registry)
+        with self.assertRaises(ZeroDivisionError):
+            tracked()
+        self.assertEqual(self.row("divide")["errors"], 1)
+
+    def test_options(self):
+        self.registry.trace_memory = True
+        self.registry.profile = True
+        tracked = TimeTracker(lambda n: [0] * n, "list", self.registry)
+        tracked(100_000)
+        row = self.row("list")
+        self.assertGreaterEqual(row["peak"][0], 800_000)
+        self.assertIn("function calls", row["profile"])
+
+        self.registry.enabled = False
+        tracked(10)
+        self.registry.add_counters("list", {"items": 10})
+        self.assertEqual(self.row("list")["calls"], 1)
+        self.assertEqual(self.row("list")["counters"], {})
+        self.registry.reset()
+        self.assertEqual(self.registry.snapshot(), [])
+
+    def test_measure(self):
+        result, sample = measure(sorted, ([3, 1, 2],))
+        self.assertEqual(result, [1, 2, 3])
+        self.assertIsNone(sample["error"])
+        self.assertIsNone(sample["peak"])
+        self.assertGreaterEqual(sample["wall"], 0)
+        with self.assertRaises(ZeroDivisionError):
+            measured_call(divmod, 1, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+"""Tests for Manacher's palindrome counts and the eertree against brute force"""
+import random
+import unittest
+from collections import Counter
+
+from algorithms import count_palindromes, palindrome_spans, Eertree, PalindromeSpans
+
+
+def brute_palindromes(s):
+    return [(i, j) for i in range(len(s)) for j in range(i + 1, len(s) + 1) if s[i:j] == s[i:j][::-1]]
+
+
+def random_texts(seed, alphabet="ab", count=50, longest=40):
+    rng = random.Random(seed)
+    return ["".join(rng.choice(alphabet) for _ in range(rng.randint(1, longest))) for _ in range(count)]
+
+
+CASES = ["", "a", "aa", "abc", "aaaa", "abba", "racecar", "é日本日é"] + random_texts(2) + random_texts(3, "abc")
+
+
+class PalindromeTest(unittest.TestCase):
+    def test_matches_brute_force(self):
+        for s in CASES:
+            with self.subTest(s=s):
+                expected = brute_palindromes(s)
+                self.assertEqual(count_palindromes(s), len(expected))
+                self.assertEqual(sorted(palindrome_spans(s)), expected)
+
+
+class EertreeTest(unittest.TestCase):
+    def test_matches_brute_force(self):
+        for s in CASES:
+            with self.subTest(s=s):
+                counts = Counter(s[i:j] for i, j in brute_palindromes(s))
+                tree = Eertree(s)
+                self.assertEqual(tree.distinct_count(), len(counts))
+                self.assertEqual(tree.total_count(), count_palindromes(s))
+                self.assertEqual(dict(tree.most_common()), dict(counts))
+                self.assertEqual(len(tree.longest()), max(map(len, counts), default=0))
+                self.assertIn(tree.longest(), counts or {"": 0})
+                for palindrome, occurrences in counts.items():
+                    self.assertEqual(tree.frequency(palindrome), occurrences)
+                self.assertEqual(tree.frequency("ab"), 0)
+                self.assertEqual(tree.frequency("zz"), 0)
+
+    def test_incremental(self):
+        """Extending a piece at a time, reading counts in between, ends where building at once does"""
+        for s in random_texts(4, "abc", 10, 200):
+            tree = Eertree()
+            for start in range(0, len(s), 17):
+                tree.extend(s[start:start + 17])
+                self.assertEqual(tree.total_count(), count_palindromes(s[:start + 17]))
+            self.assertEqual(tree.most_common(), Eertree(s).most_common())
+
+    def test_top(self):
+        tree = Eertree("abababa")
+        self.assertEqual(tree.most_common(2), [("a", 4), ("b", 3)])
+
+
+class PalindromeSpansTest(unittest.TestCase):
+    def test_matches_brute_force(self):
+        for s in CASES:
+            with self.subTest(s=s):
+                expected = brute_palindromes(s)
+                spans = PalindromeSpans(s)
+                self.assertEqual(len(spans), len(expected))
+                self.assertEqual(sorted(spans[:]), expected)
+
+    def test_index(self):
+        spans = PalindromeSpans("abaaba")
+        self.assertEqual(spans[-1], spans[len(spans) - 1])
+        self.assertEqual(spans[2:5], spans[:][2:5])
+        with self.assertRaises(IndexError):
+            spans[len(spans)]
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+"""Tests for the number parsers shared by the views, the command line and the external sort"""
+import io
+import os
+import random
+import tempfile
+import unittest
+
+from algorithms import read_numbers, parse_numbers, parse_file, ParseError
+
+
+class ReadNumbersTest(unittest.TestCase):
+    def test_block_boundaries(self):
+        """Every block size splits some number across two reads"""
+        rng = random.Random(1)
+        values = [rng.randint(-10 ** 12, 10 ** 12) for _ in range(300)]
+        text = ",".join(map(str, values)).encode()
+        for block_size in (1, 2, 3, 7, 64, 1 << 20):
+            with self.subTest(block_size=block_size):
+                self.assertEqual(list(read_numbers(io.BytesIO(text), block_size)), values)
+
+    def test_separators(self):
+        text = b" 1,2\n3 \t4,\n5,"
+        self.assertEqual(list(read_numbers(io.BytesIO(text), 2)), [1, 2, 3, 4, 5])
+        self.assertEqual(list(read_numbers(io.BytesIO(b""))), [])
+        with self.assertRaises(ValueError):
+            list(read_numbers(io.BytesIO(b"1,x,3")))
+
+
+class ParseNumbersTest(unittest.TestCase):
+    def test_parses(self):
+        self.assertEqual(parse_numbers("1, 2,3\n-4 5"), [1, 2, 3, -4, 5])
+        self.assertEqual(parse_numbers(""), [])
+        values = parse_numbers("1,2.5,-3e2")
+        self.assertEqual(values, [1.0, 2.5, -300.0])
+        self.assertTrue(all(type(value) is float for value in values))
+        """Integers past float precision stay exact"""
+        self.assertEqual(parse_numbers(str(2 ** 80 + 1)), [2 ** 80 + 1])
+
+    def test_error_position(self):
+        cases = (("1,2,x,4", "x", 4), ("1, 2.5, abc", "abc", 8), ("1,nan", "nan", 2), ("3,-inf,1", "-inf", 2))
+        for text, token, position in cases:
+            with self.subTest(text=text), self.assertRaises(ParseError) as raised:
+                parse_numbers(text)
+            self.assertEqual((raised.exception.token, raised.exception.position), (token, position))
+            self.assertIn(f"character {position + 1}", str(raised.exception))
+        with self.assertRaises(ParseError) as raised:
+            parse_numbers("1,2.5", allow_float=False)
+        self.assertEqual(raised.exception.token, "2.5")
+        self.assertIsInstance(raised.exception, ValueError)
+
+    def test_parse_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "values.txt")
+            with open(path, "w") as file:
+                file.write("3,1,\n2\n")
+            self.assertEqual(parse_file(path), [3, 1, 2])
+
+
+if __name__ == "__main__":
+    unittest.main()
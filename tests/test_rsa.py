@@ -0,0 +1,73 @@
+"""Tests for the RSA engine and the prime generator behind its keys"""
+import unittest
+
+from algorithms import RSAEngine, small_primes, is_probable_prime, PrimeGenerator
+
+class RSAEngineTest(unittest.TestCase):
+    """Two Mersenne primes make a 92 bit modulus, so messages span many blocks"""
+    KEYS = ((61, 53), (991, 997), (2 ** 31 - 1, 2 ** 61 - 1))
+
+    def test_blocks_round_trip(self):
+        for p, q in self.KEYS:
+            engine = RSAEngine(p, q)
+            with self.subTest(n=engine.n):
+                self.assertEqual(engine.e * engine.d % engine.r, 1)
+                for m in (0, 1, 2, engine.n // 2, engine.n - 1):
+                    self.assertEqual(engine.decrypt_block(engine.encrypt_block(m)), m)
+
+    def test_bytes_round_trip(self):
+        for p, q in self.KEYS[1:]:
+            engine = RSAEngine(p, q)
+            for data in (b"", b"a", b"\x00\x80\x00", bytes(range(256)) * 3):
+                with self.subTest(n=engine.n, length=len(data)):
+                    self.assertEqual(engine.decrypt_bytes(engine.encrypt_bytes(data)), data)
+
+    def test_stream_chunks(self):
+        """Chunks that end part way through a block give the same ciphertext as one call"""
+        engine = RSAEngine(2 ** 31 - 1, 2 ** 61 - 1)
+        data = bytes(range(256)) * 4
+        ciphertext = b"".join(engine.encrypt_stream(data[i:i + 7] for i in range(0, len(data), 7)))
+        self.assertEqual(ciphertext, engine.encrypt_bytes(data))
+        pieces = (ciphertext[i:i + 5] for i in range(0, len(ciphertext), 5))
+        self.assertEqual(b"".join(engine.decrypt_stream(pieces)), data)
+
+    def test_rejects_bad_input(self):
+        with self.assertRaises(ValueError):
+            RSAEngine(61, 61)
+        engine = RSAEngine(991, 997)
+        with self.assertRaises(ValueError):
+            engine.decrypt_bytes(engine.encrypt_bytes(b"abc")[:-1])
+
+
+class PrimeTest(unittest.TestCase):
+    def test_matches_sieve(self):
+        self.assertEqual([n for n in range(20_000) if is_probable_prime(n)], small_primes(20_000))
+
+    def test_large_numbers(self):
+        for exponent in (61, 89, 107, 127, 521):
+            self.assertTrue(is_probable_prime(2 ** exponent - 1))
+        for exponent in (67, 101, 257):
+            self.assertFalse(is_probable_prime(2 ** exponent - 1))
+        self.assertFalse(is_probable_prime((2 ** 61 - 1) * (2 ** 89 - 1)))
+
+    def test_pseudoprimes(self):
+        """Carmichael numbers fool the Fermat test, 3215031751 is a strong pseudoprime to bases 2, 3, 5 and 7"""
+        for n in (561, 41041, 825265, 321197185, 3215031751):
+            self.assertFalse(is_probable_prime(n))
+
+    def test_generator(self):
+        generator = PrimeGenerator()
+        for bits in (16, 64, 256):
+            prime = generator.generate(bits)
+            self.assertEqual(prime.bit_length(), bits)
+            self.assertTrue(is_probable_prime(prime))
+        p, q = generator.generate_pair(512)
+        self.assertNotEqual(p, q)
+        self.assertEqual((p * q).bit_length(), 512)
+        self.assertEqual(PrimeGenerator(workers=2).generate(128).bit_length(), 128)
+        with self.assertRaises(ValueError):
+            generator.generate(8)
+
+
+if __name__ == "__main__":
+    unittest.main()
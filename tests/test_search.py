@@ -0,0 +1,93 @@
+"""Tests for the batched search index against a linear scan, on both the NumPy and bisect paths"""
+import os
+import random
+import tempfile
+import unittest
+from unittest import mock
+
+import algorithms
+from algorithms import SearchIndex, parse_queries
+import workshop
+from support import backends
+
+
+def linear_nearest(values, query):
+    """The closest value, the smaller on a tie"""
+    return min(sorted(values), key=lambda value: abs(value - query))
+
+
+class SearchTest(unittest.TestCase):
+    def check_against_scan(self, values, queries):
+        index = SearchIndex(values[:len(values) // 2])
+        index.append(values[len(values) // 2:])
+        self.assertEqual(len(index), len(values))
+        self.assertEqual(index.contains(queries), [q in values for q in queries])
+        self.assertEqual(index.first_index(queries), [values.index(q) if q in values else None for q in queries])
+        self.assertEqual(index.last_index(queries),
+                         [len(values) - 1 - values[::-1].index(q) if q in values else None for q in queries])
+        self.assertEqual(index.rank(queries), [sum(v < q for v in values) for q in queries])
+        self.assertEqual(index.count_range(queries, [q + 5 for q in queries]),
+                         [sum(q <= v <= q + 5 for v in values) for q in queries])
+        self.assertEqual(index.nearest(queries), [linear_nearest(values, q) for q in queries])
+
+    def test_matches_linear_scan(self):
+        rng = random.Random(4)
+        cases = (([rng.randint(-20, 20) for _ in range(60)], list(range(-25, 26))),
+                 ([rng.randint(-2 ** 62, 2 ** 62) for _ in range(200)] + [2 ** 63 - 1, -2 ** 63],
+                  [0, 2 ** 62, 2 ** 63 - 1]),
+                 ([2 ** 70, -2 ** 70, 5], [2 ** 70 - 1, 0, 6]),
+                 ([0.5, 2.5, 2.5], [0, 2.5, 1.5, 3]))
+        for np in backends():
+            for values, queries in cases:
+                with self.subTest(numpy=np is not None, n=len(values)), mock.patch.object(algorithms, "np", np):
+                    self.check_against_scan(values, queries)
+
+    def test_nearest_keeps_key_types(self):
+        """Ints come back as ints when the keys or queries mix ints and floats"""
+        for np in backends():
+            with self.subTest(numpy=np is not None), mock.patch.object(algorithms, "np", np):
+                for values, queries, expected in (([1, 2.5, 4], [1, 3, 5], [1, 2.5, 4]),
+                                                  ([1, 3, 2 ** 53 + 1], [2.5, 2 ** 53 + 1, 9e15], [3, 2 ** 53 + 1, 2 ** 53 + 1]),
+                                                  ([1.5, 3.0], [1, 2.5], [1.5, 3.0])):
+                    nearest = SearchIndex(values).nearest(queries)
+                    self.assertEqual(nearest, expected)
+                    self.assertEqual(list(map(type, nearest)), list(map(type, expected)))
+
+    def test_appends(self):
+        """Small appends are inserted one by one, large ones merged"""
+        rng = random.Random(5)
+        index = SearchIndex()
+        values = []
+        for size in (0, 1, 10, 100, 1000, 3):
+            batch = [rng.randint(0, 500) for _ in range(size)]
+            index.append(batch)
+            values += batch
+            self.assertEqual(index.keys, sorted(values))
+        self.assertEqual(index.first_index([values[0]]), [0])
+        self.assertEqual(SearchIndex().nearest([1, 2]), [None, None])
+        self.assertEqual(SearchIndex([7]).nearest([1, 20]), [7, 7])
+
+    def test_query_file(self):
+        lines = ["# header", "contains 3", "", "range 1 5", "nearest 4", "first 9  # comment", "rank 2.5"]
+        self.assertEqual(SearchIndex([5, 3, 9]).answer(parse_queries(lines)), [True, 2, 3, 2, 0])
+        for line in ("find 3", "range 1", "rank x", "rank nan"):
+            with self.subTest(line=line), self.assertRaises(ValueError):
+                parse_queries([line])
+
+    def test_command_line(self):
+        with tempfile.TemporaryDirectory() as directory:
+            paths = [os.path.join(directory, name) for name in ("values", "queries", "output")]
+            for path, text in zip(paths, ("5,3,9,3", "contains 4\nlast 3\nrange 3 5\n")):
+                with open(path, "w") as file:
+                    file.write(text)
+            workshop.main(["search", "--input", paths[0], "--queries", paths[1], "--output", paths[2]])
+            with open(paths[2]) as file:
+                self.assertEqual(file.read(), "False\n3\n3\n")
+
+    def test_errors_name_the_file_line(self):
+        with self.assertRaisesRegex(ValueError, "Line 4"):
+            parse_queries(["# header", "", "rank 1", "rank x"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+"""Tests for the batch shuffle engine and the Monte-Carlo simulation, on both the NumPy and pure Python paths"""
+import threading
+import unittest
+from unittest import mock
+
+import algorithms
+from algorithms import (ShuffleEngine, DECK_SIZE, card_name, format_deck, HAND_CATEGORIES, classify_hand,
+                        simulate_shuffles)
+from support import backends
+
+"""Process workers import algorithms afresh, so they follow the installed module and not a patch"""
+INSTALLED_NUMPY = algorithms.np
+
+
+def as_lists(batch):
+    return [list(map(int, deck)) for deck in batch]
+
+
+class ShuffleEngineTest(unittest.TestCase):
+    def test_decks_are_permutations(self):
+        for np in backends():
+            with self.subTest(numpy=np is not None), mock.patch.object(algorithms, "np", np):
+                batch = as_lists(ShuffleEngine(1).shuffle_batch(200))
+                self.assertEqual(len(batch), 200)
+                for deck in batch:
+                    self.assertEqual(sorted(deck), list(range(DECK_SIZE)))
+                self.assertEqual(sorted(map(int, ShuffleEngine(1).shuffle())), list(range(DECK_SIZE)))
+
+    def test_reproducible(self):
+        for np in backends():
+            with self.subTest(numpy=np is not None), mock.patch.object(algorithms, "np", np):
+                self.assertEqual(as_lists(ShuffleEngine(7).shuffle_batch(20)),
+                                 as_lists(ShuffleEngine(7).shuffle_batch(20)))
+                self.assertNotEqual(as_lists(ShuffleEngine(7).shuffle_batch(20)),
+                                    as_lists(ShuffleEngine(8).shuffle_batch(20)))
+
+    def test_top_card_is_uniform(self):
+        """5200 decks put each card on top 100 times on average, 60 is over four standard deviations below"""
+        for np in backends():
+            with self.subTest(numpy=np is not None), mock.patch.object(algorithms, "np", np):
+                tops = [0] * DECK_SIZE
+                for deck in ShuffleEngine(3).shuffle_batch(5200):
+                    tops[deck[0]] += 1
+                self.assertGreater(min(tops), 60)
+                self.assertLess(max(tops), 140)
+
+    def test_card_names(self):
+        self.assertEqual(card_name(0), "2 H")
+        self.assertEqual(card_name(DECK_SIZE - 1), "Ace S")
+        self.assertEqual(list(format_deck([12, 13])), ["Ace H", "2 D"])
+
+
+class SimulationTest(unittest.TestCase):
+    """Cards are suit * 13 + rank with rank 0 the two and 12 the ace"""
+    HANDS = {
+        (8, 9, 10, 11, 12): "Straight flush",
+        (0, 13, 26, 39, 5): "Four of a kind",
+        (0, 13, 26, 1, 14): "Full house",
+        (0, 2, 4, 6, 9): "Flush",
+        (12, 13, 1, 2, 3): "Straight",
+        (0, 13, 26, 1, 5): "Three of a kind",
+        (0, 13, 1, 14, 5): "Two pair",
+        (0, 13, 1, 2, 5): "Pair",
+        (0, 2, 4, 6, 22): "High card",
+    }
+
+    def test_classify_hand(self):
+        for hand, name in self.HANDS.items():
+            self.assertEqual(HAND_CATEGORIES[classify_hand(hand)], name)
+        if algorithms.np is not None:
+            hands = algorithms.np.array(list(self.HANDS))
+            self.assertEqual([HAND_CATEGORIES[i] for i in algorithms._classify_hands_np(hands)],
+                             list(self.HANDS.values()))
+
+    def test_reproducible_across_workers(self):
+        for np in backends():
+            with self.subTest(numpy=np is not None), mock.patch.object(algorithms, "np", np):
+                serial = simulate_shuffles(3000, seed=5, workers=1, batch_size=500)
+                self.assertEqual(serial.shuffles, 3000)
+                self.assertEqual(sum(serial.hands), 3000)
+                for position in range(DECK_SIZE):
+                    column = [serial.positions[card * DECK_SIZE + position] for card in range(DECK_SIZE)]
+                    self.assertEqual(sum(column), 3000)
+                self.assertAlmostEqual(sum(serial.hand_frequencies().values()), 1.0)
+                if np is not INSTALLED_NUMPY:
+                    continue
+                parallel = simulate_shuffles(3000, seed=5, workers=2, batch_size=500)
+                self.assertEqual(parallel.positions, serial.positions)
+                self.assertEqual(parallel.hands, serial.hands)
+
+    def test_progress_and_cancel(self):
+        calls = []
+        simulate_shuffles(250, seed=1, workers=1, batch_size=100,
+                          progress=lambda done, total: calls.append((done, total)))
+        self.assertEqual(calls, [(100, 250), (200, 250), (250, 250)])
+        cancel = threading.Event()
+        cancel.set()
+        result = simulate_shuffles(250, seed=1, workers=1, batch_size=100, cancel=cancel)
+        self.assertTrue(result.cancelled)
+        self.assertEqual(result.shuffles, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,137 @@
+"""Tests for the sort engines, merge sorts and the external sorter against sorted"""
+import os
+import random
+import tempfile
+import unittest
+from array import array
+from multiprocessing import shared_memory
+from unittest import mock
+
+import algorithms
+from algorithms import SORT_ENGINES, sort_values, merge_sort, parallel_merge_sort, ExternalSorter
+
+
+def random_values(n, low=-1000, high=1000, seed=0):
+    rng = random.Random(seed)
+    return [rng.randint(low, high) for _ in range(n)]
+
+
+CASES = ([], [1], [2, 1], [5, 5, 5], list(range(50)), list(range(50, 0, -1)), random_values(300),
+         random_values(300, 0, 3, seed=1))
+
+
+class SortEngineTest(unittest.TestCase):
+    def test_engines_match_sorted(self):
+        for name in SORT_ENGINES:
+            for values in CASES:
+                for reverse in (False, True):
+                    with self.subTest(engine=name, n=len(values), reverse=reverse):
+                        self.assertEqual(SORT_ENGINES[name](list(values), reverse=reverse),
+                                         sorted(values, reverse=reverse))
+
+    def test_auto_engine(self):
+        for values in CASES + (random_values(5000, 0, 100), random_values(5000, -2 ** 40, 2 ** 40)):
+            result, used = sort_values(values)
+            self.assertEqual(result, sorted(values))
+            self.assertIn(used, SORT_ENGINES)
+        self.assertEqual(sort_values(random_values(5000, 0, 100))[1], "radix")
+
+    def test_mixed_types(self):
+        """A float the sample misses still sorts"""
+        values = random_values(5000, 0, 100) + [2.5]
+        self.assertEqual(sort_values(values)[0], sorted(values))
+
+
+class MergeSortTest(unittest.TestCase):
+    def test_matches_sorted(self):
+        for values in CASES:
+            self.assertEqual(merge_sort(values), sorted(values))
+            self.assertEqual(merge_sort(values, reverse=True), sorted(values, reverse=True))
+
+    def test_stable(self):
+        """Equal keys keep their input order in both directions"""
+        pairs = [Keyed(value, i) for i, value in enumerate(random_values(500, 0, 5))]
+        self.assertEqual([pair.order for pair in merge_sort(pairs)],
+                         [pair.order for pair in sorted(pairs, key=lambda pair: pair.key)])
+        self.assertEqual([pair.order for pair in merge_sort(pairs, reverse=True)],
+                         [pair.order for pair in sorted(pairs, key=lambda pair: pair.key, reverse=True)])
+
+    def test_counts_comparisons(self):
+        stats = {}
+        merge_sort(list(range(1000)), stats=stats)
+        self.assertEqual(stats["comparisons"], 999)
+
+
+class Keyed:
+    """Compares on key only, order records the input position"""
+    def __init__(self, key, order):
+        self.key = key
+        self.order = order
+
+    def __lt__(self, other):
+        return self.key < other.key
+
+
+class ParallelMergeSortTest(unittest.TestCase):
+    def test_matches_sorted(self):
+        values = random_values(5000, -2 ** 62, 2 ** 62)
+        self.assertEqual(parallel_merge_sort(values, workers=2, threshold=100), sorted(values))
+        self.assertEqual(parallel_merge_sort(values, True, workers=3, threshold=100), sorted(values, reverse=True))
+
+    def test_falls_back(self):
+        """Values outside int64 cannot go in the shared buffer"""
+        values = random_values(500, -2 ** 70, 2 ** 70)
+        self.assertEqual(parallel_merge_sort(values, workers=2, threshold=100), sorted(values))
+        self.assertEqual(parallel_merge_sort([3, 1, 2], workers=2), [1, 2, 3])
+
+    def test_failures_release_the_buffer(self):
+        """A failed sort raises its own error, not a BufferError from closing the shared memory"""
+        with mock.patch.object(algorithms.heapq, "merge", side_effect=MemoryError):
+            with self.assertRaises(MemoryError):
+                parallel_merge_sort(random_values(500), workers=2, threshold=100)
+
+        shm = shared_memory.SharedMemory(create=True, size=8 * 4)
+        self.addCleanup(shm.unlink)
+        self.addCleanup(shm.close)
+        shm.buf[:32] = array("q", [4, 3, 2, 1]).tobytes()
+        algorithms._sort_shared_chunk(shm.name, 1, 3, False)
+        self.assertEqual(array("q", bytes(shm.buf[:32])).tolist(), [4, 2, 3, 1])
+        with mock.patch.object(algorithms, "merge_sort", side_effect=MemoryError):
+            with self.assertRaises(MemoryError):
+                algorithms._sort_shared_chunk(shm.name, 0, 4, False)
+
+
+class ExternalSortTest(unittest.TestCase):
+    def external_sort(self, values, reverse=False, **options):
+        with tempfile.TemporaryDirectory() as directory:
+            input_path, output_path = os.path.join(directory, "input"), os.path.join(directory, "output")
+            with open(input_path, "w") as file:
+                file.write(",".join(map(str, values)))
+            count = ExternalSorter(temp_dir=directory, **options).sort_file(input_path, output_path, reverse)
+            self.assertEqual(count, len(values))
+            """The run files are gone once the sort returns"""
+            self.assertEqual(sorted(os.listdir(directory)), ["input", "output"])
+            with open(output_path) as file:
+                text = file.read().strip()
+        return [int(token) for token in text.split(",")] if text else []
+
+    def test_single_merge(self):
+        values = random_values(1000)
+        self.assertEqual(self.external_sort(values), sorted(values))
+        self.assertEqual(self.external_sort([]), [])
+
+    def test_many_runs(self):
+        """Ten runs of 200 values, merged in one pass"""
+        values = random_values(2000)
+        self.assertEqual(self.external_sort(values, memory_limit=12800), sorted(values))
+        self.assertEqual(self.external_sort(values, True, memory_limit=12800), sorted(values, reverse=True))
+
+    def test_merge_passes(self):
+        """More runs than fan_in forces intermediate merge passes"""
+        values = random_values(2000)
+        self.assertEqual(self.external_sort(values, memory_limit=6400, fan_in=2), sorted(values))
+        self.assertEqual(self.external_sort(values, True, memory_limit=6400, fan_in=3), sorted(values, reverse=True))
+
+
+if __name__ == "__main__":
+    unittest.main()
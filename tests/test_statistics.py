@@ -0,0 +1,157 @@
+"""Tests for the exact statistics against the original sorting path, and for the streaming sketches"""
+import io
+import random
+import unittest
+from bisect import bisect_left, bisect_right
+from unittest import mock
+
+import algorithms
+from algorithms import summary_statistics, StreamingStatistics, read_numbers
+from support import backends
+
+
+def random_values(n, low=-1000, high=1000, seed=0):
+    rng = random.Random(seed)
+    return [rng.randint(low, high) for _ in range(n)]
+
+
+def old_statistics(values):
+    """The original SearchStatistics path, a full sort and interpolated percentiles"""
+    data = sorted(values)
+    counts = {}
+    for num in data:
+        counts[num] = counts.get(num, 0) + 1
+    max_count = max(counts.values())
+    modes = [k for k, v in counts.items() if v == max_count]
+
+    def percentile(p):
+        index = p * (len(data) - 1)
+        lower = int(index)
+        if lower + 1 >= len(data):
+            return data[lower]
+        weight = index - lower
+        return data[lower] * (1 - weight) + data[lower + 1] * weight
+
+    return {
+        "smallest": data[0],
+        "largest": data[-1],
+        "mode": modes if len(modes) < len(data) else "No unique mode",
+        "percentiles": {p: percentile(p) for p in (0.25, 0.5, 0.75)},
+    }
+
+
+class StatisticsTest(unittest.TestCase):
+    CASES = ([5], [1, 2], [3, 3], list(range(10)), random_values(501), random_values(1000, 0, 20, seed=3),
+             [0.5, 2.25, 0.5, -1.0])
+
+    def test_matches_old_path(self):
+        for np in backends():
+            for values in self.CASES:
+                with self.subTest(numpy=np is not None, n=len(values)), mock.patch.object(algorithms, "np", np):
+                    stats, expected = summary_statistics(values), old_statistics(values)
+                    self.assertEqual(stats["smallest"], expected["smallest"])
+                    self.assertEqual(stats["largest"], expected["largest"])
+                    self.assertEqual(stats["mode"], expected["mode"])
+                    for p, value in expected["percentiles"].items():
+                        self.assertAlmostEqual(stats["percentiles"][p], value)
+
+    def test_big_integers(self):
+        """Values past int64 take the Python path whether NumPy is installed or not"""
+        values = [2 ** 70 + v for v in random_values(100)]
+        stats, expected = summary_statistics(values), old_statistics(values)
+        self.assertEqual(stats["smallest"], expected["smallest"])
+        self.assertEqual(stats["largest"], expected["largest"])
+
+    def test_same_results_with_numpy(self):
+        """Values int64 or float64 cannot hold exactly give the pure Python results, types included"""
+        cases = ([1, 2.5, 3, 3], [2 ** 63, -5, 7, 7], [2 ** 63, 1, 2], [2 ** 53 + 1, 0.5, 2 ** 53 + 1], [True, 2, 2],
+                 random_values(200, -2 ** 63, 2 ** 63 - 1) + [2 ** 63])
+        for values in cases:
+            with self.subTest(values=values[:4]):
+                results = []
+                for np in backends():
+                    with mock.patch.object(algorithms, "np", np):
+                        results.append(repr(summary_statistics(values, (0, 0.3, 0.5, 1))))
+                self.assertEqual(len(set(results)), 1)
+        for np in backends():
+            with mock.patch.object(algorithms, "np", np):
+                stats = summary_statistics([2 ** 53 + 1, 0.5, 2 ** 53 + 1])
+                self.assertEqual((stats["largest"], stats["mode"]), (2 ** 53 + 1, [2 ** 53 + 1]))
+                self.assertIs(type(summary_statistics([1, 2.5, 3])["smallest"]), int)
+
+    def test_empty_input(self):
+        with self.assertRaises(ValueError):
+            summary_statistics([])
+
+
+class StreamingStatisticsTest(unittest.TestCase):
+    def assert_close_rank(self, data, value, p, error):
+        """value's rank in the sorted data is within error * n of the exact percentile's"""
+        n = len(data)
+        target = p * (n - 1)
+        self.assertLessEqual(bisect_left(data, value) - error * n, target)
+        self.assertGreaterEqual(bisect_right(data, value) + error * n, target)
+
+    def test_quantiles_within_error(self):
+        values = random_values(50_000, 0, 10 ** 6, seed=5)
+        stream = StreamingStatistics(quantile_error=0.01, seed=1)
+        stream.update(iter(values), chunk_size=7000)
+        stats = stream.summary((0.01, 0.25, 0.5, 0.75, 0.99))
+        self.assertEqual(stats["smallest"], min(values))
+        self.assertEqual(stats["largest"], max(values))
+        data = sorted(values)
+        for p, value in stats["percentiles"].items():
+            self.assert_close_rank(data, value, p, 0.02)
+        self.assertLess(stream.retained(), 5000)
+
+    def test_heavy_hitter_mode(self):
+        values = random_values(20_000, 0, 10 ** 6, seed=6) + [42] * 500
+        random.Random(7).shuffle(values)
+        stream = StreamingStatistics()
+        stream.update(values)
+        self.assertEqual(stream.summary()["mode"], [42])
+
+    def test_merge(self):
+        values = random_values(20_000, 0, 10 ** 6, seed=8)
+        left, right = StreamingStatistics(seed=1), StreamingStatistics(seed=2)
+        left.update(values[:5000])
+        right.update(values[5000:])
+        left.merge(right)
+        stats = left.summary()
+        self.assertEqual((stats["smallest"], stats["largest"]), (min(values), max(values)))
+        data = sorted(values)
+        for p, value in stats["percentiles"].items():
+            self.assert_close_rank(data, value, p, 0.02)
+
+    def test_empty_stream(self):
+        with self.assertRaises(ValueError):
+            StreamingStatistics().summary()
+
+    def test_mode_rule(self):
+        """No unique mode when every value is a mode, as summary_statistics reports"""
+        stream = StreamingStatistics(frequency_error=0.01)
+        stream.update(range(5000))
+        self.assertEqual(stream.summary()["mode"], "No unique mode")
+        stream = StreamingStatistics()
+        stream.update(range(10))
+        self.assertEqual(stream.summary()["mode"], summary_statistics(list(range(10)))["mode"])
+        stream.update([3, 3, 7, 7])
+        self.assertEqual(stream.summary()["mode"], [3, 7])
+
+    def test_float_stream(self):
+        """Integers first and a float in a later block, as in a latency log"""
+        text = b"1,2,3,4,5,6,7,8,9,10,2.5,0.25"
+        values = list(read_numbers(io.BytesIO(text), block_size=8, allow_float=True))
+        self.assertEqual(values, [1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 2.5, 0.25])
+        with self.assertRaises(ValueError):
+            list(read_numbers(io.BytesIO(text), block_size=8))
+        with self.assertRaises(ValueError):
+            list(read_numbers(io.BytesIO(b"1.5,nan"), allow_float=True))
+        for text in (b"1.5,nan", b"inf", b"2,-inf"):
+            with self.subTest(text=text), self.assertRaises(ValueError):
+                list(read_numbers(io.BytesIO(text), convert=float))
+        self.assertEqual(list(read_numbers(io.BytesIO(b"1,2.5"), convert=float)), [1.0, 2.5])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+"""Tests for the command line, run in process against files in a temporary directory"""
+import contextlib
+import io
+import math
+import os
+import subprocess
+import sys
+import tempfile
+import types
+import unittest
+from unittest import mock
+
+import algorithms
+import workshop
+
+
+class WorkshopTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def path(self, name, content=None):
+        path = os.path.join(self.directory, name)
+        if content is not None:
+            with open(path, "wb" if isinstance(content, bytes) else "w") as file:
+                file.write(content)
+        return path
+
+    def run_command(self, *argv, text=None):
+        """Runs one command with text as --input when given, returns what it wrote to --output"""
+        argv = list(argv) + ["--output", self.path("output")]
+        if text is not None:
+            argv += ["--input", self.path("input", text)]
+        workshop.main(argv)
+        with open(self.path("output")) as file:
+            return file.read()
+
+    def test_sort(self):
+        text = "5, 3,-2\n9 1,3"
+        for algo in workshop.SORT_ALGOS:
+            with self.subTest(algo=algo):
+                self.assertEqual(self.run_command("sort", "--algo", algo, text=text), "-2,1,3,3,5,9\n")
+        self.assertEqual(self.run_command("sort", "--reverse", text=text), "9,5,3,3,1,-2\n")
+
+    def test_stats(self):
+        output = self.run_command("stats", "--percentiles", "0.5", text="4,1,3,3,2")
+        self.assertEqual(output, "smallest: 1\nlargest: 4\nmode: [3]\np50: 3.0\n")
+        output = self.run_command("stats", "--stream", text=",".join(map(str, range(1, 1001))))
+        self.assertIn("smallest: 1\nlargest: 1000\n", output)
+
+    def test_palindromes(self):
+        self.assertEqual(self.run_command("palindromes", text="abba\n"), "6\n")
+        self.assertEqual(sorted(self.run_command("palindromes", "--list", text="aba").split()),
+                         ["a", "a", "aba", "b"])
+        self.assertEqual(self.run_command("palindromes", "--distinct", "--top", "1", text="aba"),
+                         "distinct: 3\nlongest: aba\n2 a\n")
+
+    def test_numbers(self):
+        self.assertEqual(self.run_command("fibonacci", "100"), "354224848179261915075\n")
+        self.assertEqual(self.run_command("fibonacci", "100", "--mod", "1000"), "75\n")
+        self.assertEqual(self.run_command("factorial", "20"), f"{math.factorial(20)}\n")
+        self.assertEqual(self.run_command("factorial", "5000", "--digits"), f"{len(str(math.factorial(5000)))}\n")
+        self.assertEqual(self.run_command("factorial", "10", "--mod", "7"), "0\n")
+        """Past the 4300 digit limit on int to str conversion"""
+        self.assertEqual(len(self.run_command("factorial", "2000").strip()), 5736)
+
+    def test_no_digit_limit(self):
+        """Python before 3.11 has no int to str digit limit to lift"""
+        with mock.patch.object(algorithms, "sys", types.SimpleNamespace()):
+            self.assertEqual(self.run_command("factorial", "20"), f"{math.factorial(20)}\n")
+
+    def test_shuffle(self):
+        decks = self.run_command("shuffle", "--count", "3", "--seed", "4").splitlines()
+        self.assertEqual(len(decks), 3)
+        self.assertEqual(len(set(decks[0].split(", "))), 52)
+        self.assertEqual(decks, self.run_command("shuffle", "--count", "3", "--seed", "4").splitlines())
+
+    def test_rsa(self):
+        key = self.path("key")
+        workshop.main(["rsa", "keygen", "--bits", "256", "--output", key])
+        message = bytes(range(256)) * 10
+        plain, cipher, decrypted = self.path("plain", message), self.path("cipher"), self.path("decrypted")
+        workshop.main(["rsa", "encrypt", "--key", key, "--input", plain, "--output", cipher])
+        workshop.main(["rsa", "decrypt", "--key", key, "--input", cipher, "--output", decrypted])
+        with open(decrypted, "rb") as file:
+            self.assertEqual(file.read(), message)
+
+    def test_errors(self):
+        """Bad input exits with status 1 and a message naming the command"""
+        stderr = io.StringIO()
+        with contextlib.redirect_stderr(stderr), self.assertRaises(SystemExit) as exit:
+            self.run_command("sort", text="1,2,x")
+        self.assertEqual(exit.exception.code, 1)
+        self.assertIn("sort: error:", stderr.getvalue())
+        with contextlib.redirect_stderr(io.StringIO()), self.assertRaises(SystemExit):
+            workshop.main(["rsa", "encrypt"])
+
+    def test_no_tkinter(self):
+        code = "import sys, workshop; sys.exit('tkinter' in sys.modules)"
+        directory = os.path.dirname(os.path.abspath(workshop.__file__))
+        self.assertEqual(subprocess.run([sys.executable, "-c", code], cwd=directory).returncode, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
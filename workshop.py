@@ -0,0 +1,240 @@
+"""Command line for the algorithm engines, runs without a display or tkinter:
+python -m workshop <command> --help. Input defaults to stdin and output to stdout"""
+import argparse
+import os
+from itertools import islice
+
+from algorithms import (ALGORITHMS, RSAEngine, PrimeGenerator, fibonacci, lift_digit_limit, SORT_ENGINES, sort_values, merge_sort,
+                        parallel_merge_sort, ExternalSorter, read_numbers, ShuffleEngine, format_deck,
+                        FactorialEngine, summary_statistics, StreamingStatistics, count_palindromes,
+                        palindrome_spans, Eertree, convert_to_dataset, is_dataset, Dataset, SearchIndex, SEARCH_QUERIES,
+                        parse_queries)
+
+SORT_ALGOS = ["auto"] + list(SORT_ENGINES) + ["merge", "parallel-merge", "external"]
+
+
+def write_numbers(values, out, batch=100_000):
+    """Comma separated like the GUI and ExternalSorter, written a batch at a time"""
+    values = iter(values)
+    first = True
+    while True:
+        chunk = list(islice(values, batch))
+        if not chunk:
+            break
+        out.write(("" if first else ",") + ",".join(map(str, chunk)))
+        first = False
+    out.write("\n")
+
+
+def read_key(file):
+    """Reads the name=value lines written by rsa keygen"""
+    key = {}
+    for line in file:
+        name, _, value = line.partition("=")
+        if value.strip():
+            key[name.strip()] = int(value)
+    return RSAEngine(key["p"], key["q"], key.get("e", 65537))
+
+
+def open_dataset(file):
+    """The Dataset a --input file holds, or None for text and pipes"""
+    path = file.name
+    if isinstance(path, str) and os.path.isfile(path) and is_dataset(path):
+        return Dataset(path)
+    return None
+
+
+def read_values(file, allow_float=False):
+    """A dataset is memory mapped, anything else is parsed as comma separated text"""
+    dataset = open_dataset(file)
+    return dataset if dataset is not None else list(read_numbers(file, allow_float=allow_float))
+
+
+def run_sort(args):
+    if args.algo == "external":
+        """Only the current chunk is held in memory, so the input can be larger than RAM"""
+        if open_dataset(args.input) is not None:
+            raise ValueError("external sorts text input, a dataset is already memory mapped so use another --algo")
+        sorter = ExternalSorter(memory_limit=args.memory * 1024 * 1024)
+        sorter.sort_stream(args.input, args.output, args.reverse)
+        args.output.write("\n")
+        return
+    values = read_values(args.input)
+    if args.algo == "merge":
+        result = merge_sort(values, args.reverse)
+    elif args.algo == "parallel-merge":
+        result = parallel_merge_sort(values, args.reverse, workers=args.workers)
+    else:
+        result, used = sort_values(values, args.algo, args.reverse)
+    write_numbers(result, args.output)
+
+
+def run_stats(args):
+    percentiles = [float(p) for p in args.percentiles.split(",")]
+    if args.stream:
+        stream = StreamingStatistics(quantile_error=args.error, frequency_error=args.error / 10)
+        dataset = open_dataset(args.input)
+        stream.update(dataset if dataset is not None else read_numbers(args.input, allow_float=True))
+        stats = stream.summary(percentiles)
+    else:
+        stats = summary_statistics(read_values(args.input, allow_float=True), percentiles)
+    print(f"smallest: {stats['smallest']}", file=args.output)
+    print(f"largest: {stats['largest']}", file=args.output)
+    print(f"mode: {stats['mode']}", file=args.output)
+    for p, value in stats["percentiles"].items():
+        print(f"p{p * 100:g}: {value}", file=args.output)
+
+
+def run_search(args):
+    """One answer per line in query order. True/False for contains, a position or None
+    for first and last, a count for rank and range, a value for nearest"""
+    index = SearchIndex(read_values(args.input))
+    answers = index.answer(parse_queries(args.queries))
+    args.output.write("".join(f"{answer}\n" for answer in answers))
+
+
+def run_palindromes(args):
+    s = args.input.read().strip()
+    if args.distinct:
+        tree = Eertree(s)
+        print(f"distinct: {tree.distinct_count()}", file=args.output)
+        print(f"longest: {tree.longest()}", file=args.output)
+        for palindrome, occurrences in tree.most_common(args.top):
+            print(f"{occurrences} {palindrome}", file=args.output)
+        return
+    if args.list:
+        """Streamed one per line, never all held at once"""
+        for start, end in palindrome_spans(s):
+            args.output.write(s[start:end] + "\n")
+        return
+    print(count_palindromes(s), file=args.output)
+
+
+def run_rsa(args):
+    if args.action == "keygen":
+        p, q = PrimeGenerator(workers=args.workers).generate_pair(args.bits)
+        engine = RSAEngine(p, q)
+        for name in ("p", "q", "n", "e", "d"):
+            args.output.write(f"{name}={getattr(engine, name)}\n".encode())
+        return
+    engine = read_key(args.key)
+    chunks = iter(lambda: args.input.read(1 << 16), b"")
+    stream = engine.encrypt_stream(chunks) if args.action == "encrypt" else engine.decrypt_stream(chunks)
+    for block in stream:
+        args.output.write(block)
+
+
+def run_dataset(args):
+    """Converts with file paths rather than streams, the header is rewritten once the count is known"""
+    count = convert_to_dataset(args.text, args.dataset)
+    print(f"{count} values written to {args.dataset}")
+
+
+def run_fibonacci(args):
+    print(fibonacci(args.n, args.mod), file=args.output)
+
+
+def run_factorial(args):
+    engine = FactorialEngine()
+    if args.digits:
+        print(engine.digit_count(args.n), file=args.output)
+    elif args.mod:
+        print(engine.factorial_mod(args.n, args.mod), file=args.output)
+    else:
+        print(engine.factorial(args.n), file=args.output)
+
+
+def run_shuffle(args):
+    engine = ShuffleEngine(args.seed)
+    for deck in engine.shuffle_batch(args.count):
+        print(", ".join(format_deck(deck)), file=args.output)
+
+
+COMMANDS = {
+    "sort": run_sort,
+    "stats": run_stats,
+    "search": run_search,
+    "palindromes": run_palindromes,
+    "rsa": run_rsa,
+    "fibonacci": run_fibonacci,
+    "factorial": run_factorial,
+    "shuffle": run_shuffle,
+    "dataset": run_dataset,
+}
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m workshop", description="Algorithm Workshop command line")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    def command(name, help_text, input_mode=None, output_mode="w"):
+        """Every command writes to --output, most also read --input, "-" meaning stdin/stdout"""
+        sub = commands.add_parser(name, help=f"{help_text} ({ALGORITHMS[name][0]})" if name in ALGORITHMS else help_text)
+        if input_mode:
+            sub.add_argument("--input", type=argparse.FileType(input_mode), default="-")
+        sub.add_argument("--output", type=argparse.FileType(output_mode), default="-")
+        return sub
+
+    sub = command("sort", "sort comma or whitespace separated integers, or a dataset", "rb")
+    sub.add_argument("--algo", choices=SORT_ALGOS, default="auto")
+    sub.add_argument("--reverse", action="store_true")
+    sub.add_argument("--workers", type=int, help="processes for parallel-merge")
+    sub.add_argument("--memory", type=int, default=64, help="MB of values held at once by external")
+
+    sub = command("stats", "smallest, largest, mode and percentiles", "rb")
+    sub.add_argument("--percentiles", default="0.25,0.5,0.75")
+    sub.add_argument("--stream", action="store_true", help="approximate, in constant memory")
+    sub.add_argument("--error", type=float, default=0.01, help="rank error bound for --stream")
+
+    sub = command("search", "answer batched lookups against indexed integers", "rb")
+    sub.add_argument("--queries", type=argparse.FileType("r"), required=True,
+                     help=f"one query per line: {', '.join(SEARCH_QUERIES)} and a number, range takes two")
+
+    sub = command("palindromes", "count palindromic substrings", "r")
+    sub.add_argument("--list", action="store_true", help="print every palindrome, one per line")
+    sub.add_argument("--distinct", action="store_true", help="distinct palindromes by frequency")
+    sub.add_argument("--top", type=int, default=10, help="distinct palindromes to print")
+
+    sub = command("rsa", "generate keys, encrypt or decrypt", "rb", "wb")
+    sub.add_argument("action", choices=["keygen", "encrypt", "decrypt"])
+    sub.add_argument("--bits", type=int, default=2048)
+    sub.add_argument("--workers", type=int, default=1)
+    sub.add_argument("--key", type=argparse.FileType("r"), help="file written by rsa keygen")
+
+    sub = command("fibonacci", "nth Fibonacci number")
+    sub.add_argument("n", type=int)
+    sub.add_argument("--mod", type=int)
+
+    sub = command("factorial", "n!, its digit count or n! mod m")
+    sub.add_argument("n", type=int)
+    group = sub.add_mutually_exclusive_group()
+    group.add_argument("--digits", action="store_true")
+    group.add_argument("--mod", type=int)
+
+    sub = command("shuffle", "shuffled decks, one per line")
+    sub.add_argument("--count", type=int, default=1)
+    sub.add_argument("--seed", type=int)
+
+    sub = commands.add_parser("dataset", help="convert a comma separated text file to a memory mapped dataset")
+    sub.add_argument("text")
+    sub.add_argument("dataset")
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command == "rsa" and args.action != "keygen" and args.key is None:
+        parser.error(f"rsa {args.action} needs --key")
+    lift_digit_limit()
+    try:
+        COMMANDS[args.command](args)
+    except ValueError as error:
+        parser.exit(1, f"{parser.prog} {args.command}: error: {error}\n")
+    finally:
+        if hasattr(args, "output"):
+            args.output.flush()
+
+
+if __name__ == "__main__":
+    main()